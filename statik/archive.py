@@ -0,0 +1,100 @@
+# -*- coding:utf-8 -*-
+
+from collections import OrderedDict
+from datetime import date
+
+import logging
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'ARCHIVE_PERIODS',
+    'StatikArchiveBucket',
+    'build_archive',
+]
+
+# the supported archive periods, from coarsest to finest
+ARCHIVE_PERIODS = ['year', 'month', 'day']
+
+
+class StatikArchiveBucket(object):
+    """All of the items falling within a single year, month or day of a date-based archive."""
+
+    def __init__(self, period, key, items, page=None):
+        """Constructor.
+
+        Args:
+            period: One of "year", "month" or "day".
+            key: A tuple containing the year, month and day (as relevant to the period) of
+                this bucket.
+            items: A list of all of the items in this bucket.
+            page: If paginated, the page of this bucket's items to be rendered.
+        """
+        self.period = period
+        self.key = key
+        self.year = key[0]
+        self.month = key[1] if len(key) > 1 else None
+        self.day = key[2] if len(key) > 2 else None
+        self.date = date(self.year, self.month or 1, self.day or 1)
+        self.items = items
+        self.count = len(items)
+        self.page = page
+
+    def with_page(self, page):
+        return StatikArchiveBucket(self.period, self.key, self.items, page=page)
+
+    def __iter__(self):
+        return iter(self.page if self.page is not None else self.items)
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return "StatikArchiveBucket(period=%s, key=%s, count=%d, page=%s)" % (
+            self.period, self.key, self.count, self.page
+        )
+
+    def __str__(self):
+        """Returns this bucket's path, e.g. "2017", "2017/06" or "2017/06/30"."""
+        return "/".join(["%04d" % self.key[0]] + ["%02d" % part for part in self.key[1:]])
+
+
+def build_archive(items, date_field, period='month', order='desc'):
+    """Buckets the given items by the value of their given date field, in a single pass.
+
+    Args:
+        items: An iterable of items (e.g. model instances or a query).
+        date_field: The name of the date/time field by which to bucket the items. Items whose
+            date/time is empty are skipped.
+        period: One of "year", "month" or "day", or a list of these if buckets for multiple
+            periods are required (e.g. for year and month archive pages).
+        order: Either "desc" (most recent first) or "asc". Applies to both the buckets and the
+            items within each bucket.
+
+    Returns:
+        A list of StatikArchiveBucket objects. Where multiple periods were requested, all of the
+        buckets for the first period come first, followed by those of the next, etc.
+    """
+    periods = [period] if isinstance(period, str) else list(period)
+    for _period in periods:
+        if _period not in ARCHIVE_PERIODS:
+            raise ValueError("Unsupported archive period: %s" % _period)
+    if order not in {'asc', 'desc'}:
+        raise ValueError("Unsupported archive order: %s" % order)
+
+    date_field = date_field.replace('-', '_')
+    dated_items = []
+    for item in items:
+        value = getattr(item, date_field)
+        if value is not None:
+            dated_items.append((value, (value.year, value.month, value.day), item))
+    dated_items.sort(key=lambda dated_item: dated_item[0], reverse=(order == 'desc'))
+
+    buckets = []
+    for _period in periods:
+        key_length = ARCHIVE_PERIODS.index(_period) + 1
+        grouped = OrderedDict()
+        for _, key, item in dated_items:
+            grouped.setdefault(key[:key_length], []).append(item)
+        buckets.extend([StatikArchiveBucket(_period, key, _items) for key, _items in grouped.items()])
+        logger.debug("Bucketed %d item(s) into %d %s archive(s)", len(dated_items), len(grouped), _period)
+    return buckets
@@ -84,6 +84,14 @@ def main():
         help="Run Statik in safe mode (which disallows unsafe query execution)"
     )
 
+    group_generate.add_argument(
+        '--compile-templates',
+        action='store_true',
+        help="Precompiles the project's (and its theme's) Jinja2 templates into Python modules in the " +
+            "project's cache path and exits. Subsequent builds load these instead of compiling the " +
+            "templates, unless a template's source is newer than its compiled module."
+    )
+
     group_server = parser.add_argument_group('built-in server')
     group_server.add_argument(
         '-w', '--watch',
@@ -196,6 +204,12 @@ def main():
             generate_quickstart(project_path)
         elif args.autogen:
             autogen(project_path)
+        elif args.compile_templates:
+            StatikProject(
+                config_file_path,
+                safe_mode=args.safe_mode,
+                error_context=error_context
+            ).compile_templates()
         else:
             if args.host and '--host=localhost' in sys.argv[1:]:
                 logger.warning("Ignoring --host argument because --watch is not specified")
@@ -7,7 +7,7 @@ import yaml
 from markdown import Markdown
 
 from .markdown_exts import MarkdownYamlMetaExtension, MarkdownLoremIpsumExtension, \
-        MarkdownPermalinkExtension
+        MarkdownPermalinkExtension, split_yaml_front_matter
 from .utils import dict_strip, extract_filename
 from .errors import StatikErrorContext, MissingParameterError, InternalError, StatikError
 from .markdown_config import MarkdownConfig
@@ -53,14 +53,18 @@ class YamlLoadable(object):
 
 class ContentLoadable(object):
     """Can provide functionality like the YamlLoadable class, but also supports
-    loading content and metadata from a Markdown file.
+    loading content and metadata from a Markdown file. If a load filter is supplied and it
+    excludes the loaded metadata, the Markdown content is never converted and the "excluded"
+    flag is set.
     """
     def __init__(self, filename=None, file_type=None, from_string=None, from_dict=None,
-            name=None, markdown_config=None, encoding='utf-8', error_context=None):
+            name=None, markdown_config=None, encoding='utf-8', error_context=None,
+            load_filter=None):
         self.vars = None
         self.content = None
         self.file_content = None
         self.file_type = file_type
+        self.excluded = False
         self.error_context = error_context or StatikErrorContext()
         self.error_context.update(filename=filename)
 
@@ -121,14 +125,26 @@ class ContentLoadable(object):
                     context=self.error_context
                 )
 
+            # when filtering, the front matter of Markdown files is split off (and parsed) up front,
+            # and is then reused for the Markdown conversion of instances that aren't excluded
+            front_matter, content = None, self.file_content
+            if self.file_type == 'markdown' and load_filter:
+                front_matter, content_lines = split_yaml_front_matter(self.file_content.split('\n'))
+                front_matter = front_matter if front_matter is not None else dict()
+                content = '\n'.join(content_lines)
+
             # if it's a YAML file
             if self.file_type == 'yaml':
                 self.vars = yaml.safe_load(self.file_content) if self.file_content else {}
                 if not isinstance(self.vars, dict):
                     self.vars = {}
+            elif load_filter and load_filter.excludes(front_matter):
+                # skip the (expensive) Markdown conversion for excluded instances
+                self.excluded = True
+                self.vars = dict()
             else:
                 markdown_ext = [
-                    MarkdownYamlMetaExtension(),
+                    MarkdownYamlMetaExtension(meta=front_matter),
                     MarkdownLoremIpsumExtension(error_context=self.error_context)
                 ]
                 if self.markdown_config.enable_permalinks:
@@ -145,8 +161,12 @@ class ContentLoadable(object):
                     extensions=markdown_ext,
                     extension_configs=self.markdown_config.extension_config
                 )
-                self.content = md.convert(self.file_content)
-                self.vars = md.meta
+                self.content = md.convert(content)
+                self.vars = md.meta if front_matter is None else front_matter
+
+        # YAML and dictionary-based instances are only filtered once their variables are loaded
+        if load_filter and self.content is None and not self.excluded:
+            self.excluded = load_filter.excludes(self.vars)
 
         if isinstance(self.vars, dict):
             self.vars = dict_strip(self.vars)
@@ -7,6 +7,8 @@ from .common import YamlLoadable
 from .utils import underscore_var_names
 from .markdown_config import MarkdownConfig
 from .external_database import ExternalDatabase
+from .search_index import StatikStaticSearchIndex
+from .sitemap import StatikSitemap
 from .templating import DEFAULT_TEMPLATE_PROVIDERS
 
 import logging
@@ -27,6 +29,8 @@ class StatikConfig(YamlLoadable):
         self.base_path = self.vars.get('base-path', '/')
         self.encoding = self.vars.get('encoding', 'utf-8')
         self.theme = self.vars.get('theme', None)
+        # relative to the project folder
+        self.cache_path = self.vars.get('cache-path', '.statik-cache')
         self.markdown_config = MarkdownConfig(self.vars.get('markdown', dict()))
 
         self.external_database = None
@@ -41,6 +45,59 @@ class StatikConfig(YamlLoadable):
             if 'dest' in self.vars['assets'] and isinstance(self.vars['assets']['dest'], str):
                 self.assets_dest_path = self.vars['assets']['dest']
 
+        # project-wide load filters (e.g. for build variants), indexed by model name
+        self.exclude_if = self.vars.get('exclude-if', dict())
+        if not isinstance(self.exclude_if, dict):
+            raise ProjectConfigurationError(
+                message="Load filters (\"exclude-if\") must be a map of model names to predicates.",
+                context=self.error_context
+            )
+
+        # named aggregate queries to be computed once after loading, and stored as tables
+        self.materialize = self.vars.get('materialize', dict())
+        if not isinstance(self.materialize, dict):
+            raise ProjectConfigurationError(
+                message="Materialized queries (\"materialize\") must be a map of table names to queries.",
+                context=self.error_context
+            )
+
+        # derived field computation options
+        derived_fields_config = self.vars.get('derived-fields', dict())
+        if not isinstance(derived_fields_config, dict):
+            raise ProjectConfigurationError(
+                message="Derived field configuration (\"derived-fields\") must be a key/value pair map.",
+                context=self.error_context
+            )
+        self.derived_workers = derived_fields_config.get('workers', None)
+        if self.derived_workers is not None and \
+                (not isinstance(self.derived_workers, int) or self.derived_workers < 1):
+            raise ProjectConfigurationError(
+                message="The number of derived field workers must be a positive integer.",
+                context=self.error_context
+            )
+
+        # client-side (static) search index generation
+        self.static_search = None
+        if 'static-search' in self.vars:
+            self.static_search = StatikStaticSearchIndex(
+                self.vars['static-search'],
+                error_context=self.error_context
+            )
+
+        # sitemap generation (from the URLs of all rendered pages)
+        self.sitemap = None
+        if 'sitemap' in self.vars:
+            self.sitemap = StatikSitemap(self.vars['sitemap'], error_context=self.error_context)
+
+        # rendering-related options
+        render_config = self.vars.get('render', dict())
+        if not isinstance(render_config, dict):
+            raise ProjectConfigurationError(
+                message="Rendering configuration must be a key/value pair map.",
+                context=self.error_context
+            )
+        self.render_records = render_config.get('records', False) in {True, "true", "1", 1}
+
         self.context_static = {}
         self.context_dynamic = {}
 
@@ -83,17 +140,25 @@ class StatikConfig(YamlLoadable):
         logging.debug("%s", self)
 
     def __repr__(self):
-        return ("StatikConfig(project_name=%s, base_path=%s, encoding=%s, theme=%s, " +
+        return ("StatikConfig(project_name=%s, base_path=%s, encoding=%s, theme=%s, cache_path=%s, " +
                 "template_providers=%s, assets_src_path=%s, assets_dest_path=%s, " +
-                "context_static=%s, context_dynamic=%s, deploy=%s)") % (
+                "context_static=%s, context_dynamic=%s, exclude_if=%s, materialize=%s, " +
+                "derived_workers=%s, static_search=%s, sitemap=%s, render_records=%s, deploy=%s)") % (
                     self.project_name,
                     self.base_path,
                     self.encoding,
                     self.theme,
+                    self.cache_path,
                     self.template_providers,
                     self.assets_src_path,
                     self.assets_dest_path,
                     self.context_static,
                     self.context_dynamic,
+                    self.exclude_if,
+                    self.materialize,
+                    self.derived_workers,
+                    self.static_search,
+                    self.sitemap,
+                    self.render_records,
                     self.deploy,
                 )
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
-from copy import deepcopy, copy
+from collections import ChainMap
+from copy import deepcopy
 
 from statik.utils import underscore_var_names
 
@@ -8,10 +9,43 @@ import logging
 logger = logging.getLogger(__name__)
 
 __all__ = [
-    "StatikContext"
+    "StatikContext",
+    "StatikContextLayer",
+    "layer_context",
+    "context_layers",
 ]
 
 
+class StatikContextLayer(dict):
+    """A layer of template context that is built once at its own scope (e.g. the project's
+    context, or a view's static context) and shared, without copying, by every page rendered
+    within that scope. Layers must not be modified once built."""
+    pass
+
+
+def context_layers(context):
+    """Returns the layers making up the given (optionally layered) context as a flat list of
+    dictionaries, in order of precedence (i.e. the first layer's variables take precedence over
+    those of all subsequent layers)."""
+    if not isinstance(context, ChainMap):
+        return [context]
+    layers = []
+    for layer in context.maps:
+        layers.extend(context_layers(layer))
+    return layers
+
+
+def layer_context(*layers):
+    """Stacks the given context layers (in order of precedence) into a single template context,
+    without copying any of them. None layers are skipped. Any variables subsequently set on the
+    resulting context are set on a new top layer, leaving the given layers untouched."""
+    result = [dict()]
+    for layer in layers:
+        if layer is not None:
+            result.extend([l for l in context_layers(layer) if l])
+    return ChainMap(*result)
+
+
 class StatikContext(object):
     """For representing context in projects and views."""
 
@@ -22,10 +56,10 @@ class StatikContext(object):
             dynamic=None,
             for_each=None
         ):
-        self.initial = initial or dict()
-        self.static = underscore_var_names(
+        self.initial = StatikContextLayer(initial or dict())
+        self.static = StatikContextLayer(underscore_var_names(
             deepcopy(static or dict())
-        )
+        ))
         self.dynamic = underscore_var_names(
             deepcopy(dynamic or dict())
         )
@@ -62,14 +96,17 @@ class StatikContext(object):
         return result
 
     def build(self, db=None, safe_mode=False, for_each_inst=None, extra=None):
-        """Builds a dictionary that can be used as context for template rendering."""
-        result = copy(self.initial)
-        result.update(self.static)
-        if self.dynamic:
-            result.update(self.build_dynamic(db, extra=extra, safe_mode=safe_mode))
+        """Builds a (layered) mapping that can be used as context for template rendering. The
+        initial and static layers are shared by all of the contexts built from this instance, and
+        the extra context (e.g. the project's context) is stacked on top without being copied."""
+        for_each = None
         if self.for_each and for_each_inst:
-            result.update(self.build_for_each(db, safe_mode=safe_mode, extra=extra))
-        if isinstance(extra, dict):
-            result.update(extra)
-        return result
+            for_each = self.build_for_each(db, safe_mode=safe_mode, extra=extra)
+        return layer_context(
+            extra if isinstance(extra, (dict, ChainMap)) else None,
+            for_each,
+            self.build_dynamic(db, extra=extra, safe_mode=safe_mode) if self.dynamic else None,
+            self.static,
+            self.initial
+        )
 
@@ -3,10 +3,12 @@
 from io import open
 
 import os.path
+import json
 import yaml
 
 from sqlalchemy import String, Integer, Column, Table, ForeignKey, \
-    Boolean, DateTime, Text, create_engine
+    Boolean, DateTime, Date, Text, Float, create_engine, event, text, select, inspect
+from sqlalchemy.sql import table as sql_table, column as sql_column
 from sqlalchemy.orm import sessionmaker, relationship, backref
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm.query import Query
@@ -23,6 +25,11 @@ from statik.errors import *
 from statik.utils import *
 from statik.config import MarkdownConfig
 from statik.pagination import *
+from statik.records import StatikRecordStore
+from statik.derived import compute_derived_values
+from statik.archive import build_archive
+from statik.taxonomy import get_term_columns
+from statik.related import compute_related, get_related_table_name
 
 # utility imports for SQLAlchemy code execution
 from datetime import datetime, date, timedelta, time
@@ -64,7 +71,8 @@ def clear_tracked_globals():
 class StatikDatabase(object):
 
     def __init__(self, data_path, models, encoding=None, markdown_config=None,
-            error_context=None):
+            error_context=None, records=False, materialize=None, safe_mode=False,
+            derived_workers=None):
         """Constructor.
 
         Args:
@@ -74,19 +82,37 @@ class StatikDatabase(object):
                       default to the system-preferred default encoding.
             error_context: An optional StatikErrorContext instance for keeping track of
                 the files to which any exceptions are relevant.
+            records: Whether or not query results must be converted to lightweight,
+                read-only record objects prior to rendering them in templates.
+            materialize: An optional dictionary of named aggregate queries, whose results are to
+                be computed once after loading all model data and stored as tables that can be
+                queried just like models.
+            safe_mode: Whether or not to only allow MLAlchemy-style queries to be materialized.
+            derived_workers: The number of worker processes to use when computing models'
+                derived fields. If not specified, derived fields are computed in this process.
         """
         self.encoding = encoding
         self.tables = dict()
         self.data_path = data_path
         self.models = models
         self.markdown_config = markdown_config
+        self.derived_workers = derived_workers
         self.error_context = error_context or StatikErrorContext()
         self.engine = create_engine('sqlite:///:memory:')
         self.Base = declarative_base()
         self.session = sessionmaker(bind=self.engine)()
         set_global('session', self.session)
+        set_global('search', self.search)
+        set_global('match', self.match)
+        set_global('archive', build_archive)
+        # compiled exec() queries and MLAlchemy queries, indexed by their source
+        self.compiled_queries = dict()
+        self.mlalchemy_queries = dict()
         self.find_backrefs()
         self.create_db(models)
+        self.create_materialized_tables(materialize or dict(), safe_mode=safe_mode)
+        self.records = StatikRecordStore(self.Base) if records else None
+        self.begin_render_session()
 
     def find_backrefs(self):
         for model_name, model in self.models.items():
@@ -121,6 +147,9 @@ class StatikDatabase(object):
                 orig_exc=exc
             )
         self.load_all_model_data(models)
+        self.compute_derived_fields(models)
+        self.compute_related_instances(models)
+        self.create_search_indexes(models)
 
     def load_all_model_data(self, models):
         # we load the data now based on the sorted order of our tables, so
@@ -241,8 +270,13 @@ class StatikDatabase(object):
             model=model,
             session=self.session,
             encoding=self.encoding,
-            markdown_config=self.markdown_config
+            markdown_config=self.markdown_config,
+            load_filter=model.load_filter
         )
+        if entry.excluded:
+            logger.debug("Excluding instance %s.%s at load time", model.name, item['pk'])
+            return
+
         # duplicate primary key!
         if entry.field_values['pk'] in seen_entries:
             raise DuplicateModelInstanceError(
@@ -283,6 +317,7 @@ class StatikDatabase(object):
         entry_files = list_files(path, ['yml', 'yaml', 'md'])
         entry_files = [f for f in entry_files if not(f.endswith("_all.yml"))]
         seen_entries = set()
+        excluded_count = 0
         logger.debug("Loading %d instance(s) for model: %s", len(entry_files), model.name)
         for entry_file in entry_files:
             entry = StatikDatabaseInstance(
@@ -291,8 +326,13 @@ class StatikDatabase(object):
                 session=self.session,
                 encoding=self.encoding,
                 markdown_config=self.markdown_config,
-                error_context=self.error_context
+                error_context=self.error_context,
+                load_filter=model.load_filter
             )
+            if entry.excluded:
+                excluded_count += 1
+                continue
+
             # duplicate primary key!
             if entry.field_values['pk'] in seen_entries:
                 raise DuplicateModelInstanceError(
@@ -321,9 +361,250 @@ class StatikDatabase(object):
                     context=self.error_context
                 )
 
+        if excluded_count:
+            logger.debug("Excluded %d instance(s) of model %s at load time", excluded_count, model.name)
         self.error_context.clear()
 
-    def query(self, query, additional_locals=None, safe_mode=False):
+    def compute_derived_fields(self, models):
+        """Computes the values of all models' derived fields in bulk, once all of the model data
+        has been loaded, and stores them alongside the instances' other fields."""
+        for model_name, model in models.items():
+            if not model.derived_fields:
+                continue
+
+            Model = self.tables[model_name]
+            source_fields = ['pk'] + sorted(set([
+                source_field_name
+                for derivation in model.derived_fields.values()
+                for source_field_name in derivation.field_names
+                if source_field_name != 'pk'
+            ]))
+            rows = [
+                dict(zip(source_fields, row))
+                for row in self.session.query(*[getattr(Model, field_name) for field_name in source_fields])
+            ]
+            updates = [{'pk': row['pk']} for row in rows]
+
+            for field_name, derivation in model.derived_fields.items():
+                logger.debug("Computing derived field %s.%s for %d instance(s)", model_name, field_name, len(rows))
+                try:
+                    values = compute_derived_values(derivation, rows, workers=self.derived_workers)
+                except Exception as exc:
+                    raise ModelError(
+                        model_name,
+                        message="failed to compute derived field \"%s\" from %s." % (field_name, derivation.expr),
+                        orig_exc=exc,
+                        context=self.error_context
+                    )
+                for update, value in zip(updates, values):
+                    update[field_name] = value
+
+            self.session.bulk_update_mappings(Model, updates)
+            self.session.commit()
+
+    def compute_related_instances(self, models):
+        """Computes the most closely related instances of each instance for all models with
+        "related" configured, from the terms (e.g. tags) they have in common, and stores them in
+        the models' related instance tables."""
+        for model_name, model in models.items():
+            if not model.related_via:
+                continue
+
+            Model = self.tables[model_name]
+            item_terms = dict()
+            for field_name in model.related_via:
+                selectable, item_column, term_column = get_term_columns(Model, field_name)
+                links = self.session.query(item_column, term_column).select_from(selectable).filter(
+                    term_column.isnot(None)
+                )
+                for item_pk, term_pk in links:
+                    item_terms.setdefault(item_pk, set()).add((field_name, term_pk))
+
+            related = compute_related(
+                item_terms,
+                model.related_limit,
+                max_term_frequency=model.related_max_term_frequency
+            )
+            rows = [
+                {'item_pk': item_pk, 'related_pk': related_pk, 'rank': rank, 'score': score}
+                for item_pk, scores in related.items()
+                for rank, (related_pk, score) in enumerate(scores)
+            ]
+            if rows:
+                self.engine.execute(self.Base.metadata.tables[get_related_table_name(model_name)].insert(), rows)
+            logger.debug("Stored %d related instance link(s) for model %s", len(rows), model_name)
+
+    def create_search_indexes(self, models):
+        """Creates and populates an SQLite FTS5 virtual table for each model with a "search-index"
+        configured, mirroring the plain text (HTML stripped) of the configured fields."""
+        for model_name, model in models.items():
+            if not model.search_fields:
+                continue
+
+            fts_table = get_search_index_table_name(model_name)
+            logger.debug("Creating full-text search index %s for fields: %s", fts_table, model.search_fields)
+            try:
+                self.engine.execute('CREATE VIRTUAL TABLE "%s" USING fts5(pk UNINDEXED, %s)' % (
+                    fts_table,
+                    ", ".join(['"%s"' % field_name for field_name in model.search_fields])
+                ))
+            except Exception as exc:
+                raise ModelError(
+                    model_name,
+                    message="failed to create full-text search index (is SQLite's FTS5 extension available?).",
+                    orig_exc=exc,
+                    context=self.error_context
+                )
+
+            Model = self.tables[model_name]
+            rows = self.session.query(
+                Model.pk,
+                *[getattr(Model, field_name) for field_name in model.search_fields]
+            ).all()
+            if rows:
+                self.engine.execute(
+                    'INSERT INTO "%s" (pk, %s) VALUES (?, %s)' % (
+                        fts_table,
+                        ", ".join(['"%s"' % field_name for field_name in model.search_fields]),
+                        ", ".join(['?' for _ in model.search_fields])
+                    ),
+                    [
+                        tuple([row[0]] + [strip_html(value) for value in row[1:]])
+                        for row in rows
+                    ]
+                )
+            logger.debug("Indexed %d instance(s) of model %s for full-text search", len(rows), model_name)
+
+    def get_search_index_table(self, Model):
+        model_name = Model if isinstance(Model, str) else Model.__name__
+        if model_name not in self.models or not self.models[model_name].search_fields:
+            raise ModelError(
+                model_name,
+                message="no \"search-index\" has been configured for this model.",
+                context=self.error_context
+            )
+        return get_search_index_table_name(model_name)
+
+    def match(self, Model, terms):
+        """Returns a filter clause that only matches instances of the given model whose search
+        index matches the given FTS5 query, e.g.:
+
+            session.query(Post).filter(match(Post, 'python AND sqlite')).all()
+        """
+        fts_table = self.get_search_index_table(Model)
+        return Model.pk.in_(
+            select([sql_column('pk')]).select_from(sql_table(fts_table)).where(
+                text('"%s" MATCH :terms' % fts_table).bindparams(terms=terms)
+            )
+        )
+
+    def search(self, Model, terms, limit=None):
+        """Returns a list of the instances of the given model matching the given FTS5 query,
+        ordered by relevance (most relevant first), e.g.:
+
+            search(Post, 'python', limit=10)
+        """
+        fts_table = self.get_search_index_table(Model)
+        statement = 'SELECT "{model}".* FROM "{model}" JOIN "{fts}" ON "{model}".pk = "{fts}".pk ' \
+            'WHERE "{fts}" MATCH :terms ORDER BY "{fts}".rank'.format(
+                model=Model.__tablename__,
+                fts=fts_table
+            )
+        if limit is not None:
+            statement += ' LIMIT %d' % int(limit)
+        return self.session.query(Model).from_statement(text(statement)).params(terms=terms).all()
+
+    def create_materialized_tables(self, materialize, safe_mode=False):
+        """Executes each of the given named queries once, storing its results in a new table
+        of the same name. Each result row becomes an instance of that table's model, with one
+        column per result column (column types are inferred from the results). If the results
+        have no "pk" column, rows are numbered from 1 in the order in which they were returned."""
+        for table_name, query in materialize.items():
+            if table_name in self.tables or table_name in self.Base.metadata.tables or \
+                    not table_name.isidentifier():
+                raise ModelError(
+                    table_name,
+                    message="materialized tables must have unique names that are valid identifiers.",
+                    context=self.error_context
+                )
+
+            logger.debug("Materializing query for table %s: %s", table_name, query)
+            result = self.query(query, safe_mode=safe_mode)
+            column_names = None
+            if isinstance(result, Query):
+                column_names = [desc['name'] for desc in result.column_descriptions]
+                result = result.all()
+            rows = [self.get_materialized_row(table_name, row) for row in result]
+            if column_names is None:
+                column_names = list(rows[0].keys()) if rows else []
+
+            self.tables[table_name] = Model = materialized_model_factory(
+                self.Base,
+                table_name,
+                column_names,
+                rows
+            )
+            try:
+                Model.__table__.create(self.engine)
+                if 'pk' not in column_names:
+                    for i, row in enumerate(rows):
+                        row['pk'] = i + 1
+                self.session.bulk_insert_mappings(Model, rows)
+                self.session.commit()
+            except Exception as exc:
+                raise ModelError(
+                    table_name,
+                    message="failed to store materialized query results.",
+                    orig_exc=exc,
+                    context=self.error_context
+                )
+            logger.debug("Materialized %d row(s) into table %s", len(rows), table_name)
+
+    def get_materialized_row(self, table_name, row):
+        if isinstance(row, dict):
+            return dict(row)
+        if hasattr(row, '_asdict'):
+            return row._asdict()
+        if isinstance(row, self.Base):
+            return dict([(attr.key, getattr(row, attr.key)) for attr in inspect(row).mapper.column_attrs])
+        raise ModelError(
+            table_name,
+            message="materialized queries must return rows with named columns (got %s)." % type(row).__name__,
+            context=self.error_context
+        )
+
+    def begin_render_session(self):
+        """Replaces the session used for loading data with a read-only session for rendering.
+        The render session never autoflushes, and any attempt to add, flush or otherwise write
+        data through it raises a ReadOnlyDatabaseError, as does setting any of the fields (or
+        modifying any of the relationships) of model instances from here on."""
+        self.session.commit()
+        self.session.close()
+
+        self.session = sessionmaker(
+            bind=self.engine,
+            autoflush=False,
+            expire_on_commit=False
+        )()
+        event.listen(self.session, 'before_attach', self.raise_read_only)
+        event.listen(self.session, 'before_flush', self.raise_read_only)
+        # fail on attribute writes themselves, rather than only when (auto)flushing them, so
+        # that templates can't silently change the instances seen by subsequently rendered views
+        for Model in self.tables.values():
+            for attr in inspect(Model).attrs:
+                for event_name in ['set', 'append', 'remove'] if getattr(attr, 'uselist', False) else ['set']:
+                    event.listen(getattr(Model, attr.key), event_name, self.raise_read_only)
+        # guard against direct writes (e.g. bulk updates) at the database level too
+        self.engine.execute("PRAGMA query_only = ON")
+
+        set_global('session', self.session)
+        self.mlalchemy_queries = dict()
+        logger.debug("Switched to read-only render session")
+
+    def raise_read_only(self, *args, **kwargs):
+        raise ReadOnlyDatabaseError(context=self.error_context)
+
+    def query(self, query, additional_locals=None, safe_mode=False, yield_per=None):
         """Executes the given SQLAlchemy query string.
 
         Args:
@@ -333,6 +614,10 @@ class StatikDatabase(object):
             safe_mode: Boolean value indicating whether or not to execute queries in safe mode
                 only. If True, this only allows MLAlchemy-style queries. If False, this allows
                 both exec() and MLAlchemy-style queries. Default: False.
+            yield_per: If specified, query results are streamed from the database in batches of
+                this size instead of being loaded all at once. Only applies to MLAlchemy queries
+                and to exec() queries that evaluate to SQLAlchemy Query objects (i.e. without a
+                trailing ".all()").
 
         Returns:
             The result of executing the query.
@@ -346,24 +631,45 @@ class StatikDatabase(object):
 
         if isinstance(query, dict):
             logger.debug("Executing query in safe mode (MLAlchemy)")
-            return mlalchemy.parse_query(query).to_sqlalchemy(self.session, self.tables).all()
+            query_key = json.dumps(query, sort_keys=True, default=str)
+            if query_key not in self.mlalchemy_queries:
+                self.mlalchemy_queries[query_key] = mlalchemy.parse_query(query).to_sqlalchemy(
+                    self.session,
+                    self.tables
+                )
+            if yield_per:
+                return self.mlalchemy_queries[query_key].yield_per(yield_per)
+            return self.mlalchemy_queries[query_key].all()
         else:
             logger.debug("Executing unsafe query (Python exec())")
             if additional_locals is not None:
                 for k, v in additional_locals.items():
                     locals()[k] = v
 
-            exec(
-                compile(
+            if query not in self.compiled_queries:
+                self.compiled_queries[query] = compile(
                     'result = %s' % query.strip(),
                     '<string>',
                     'exec'
-                ),
+                )
+            exec(
+                self.compiled_queries[query],
                 globals(),
                 locals()
             )
+            if yield_per and isinstance(locals()['result'], Query):
+                return locals()['result'].yield_per(yield_per)
             return locals()['result']
 
+    def release(self, inst):
+        """Removes the given instance from the current session (and its record, along with the
+        records of the instances related to it, from the record store, if any), so that they can
+        be garbage collected once it has been rendered."""
+        if inst in self.session:
+            self.session.expunge(inst)
+        if self.records is not None:
+            self.records.discard(inst)
+
     def shutdown(self):
         """Shuts down the database engine."""
         close_all_sessions()
@@ -386,6 +692,11 @@ class StatikDatabaseInstance(ContentLoadable):
             raise MissingParameterError("session", context=self.error_context)
         self.session = session
 
+        # excluded instances will never be inserted, so there's no need to process their fields
+        if self.excluded:
+            self.field_values = {'pk': self.name}
+            return
+
         # convert the vars to their underscored representation
         self.field_values = underscore_var_names(self.vars)
         self.field_values['pk'] = self.name
@@ -477,6 +788,10 @@ class StatikDatabaseInstance(ContentLoadable):
         if self.model.content_field is not None:
             self.field_values[self.model.content_field] = self.content
 
+        # derived fields are computed in bulk once all of the data has been loaded
+        for field_name in self.model.derived_fields:
+            self.field_values.pop(field_name, None)
+
         logger.debug('%s', self)
 
     def __repr__(self):
@@ -494,12 +809,59 @@ class StatikDatabaseInstance(ContentLoadable):
         return repr(self)
 
 
+def get_search_index_table_name(model_name):
+    return '%s_fts' % model_name
+
+
+def get_materialized_column_type(values):
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            return Boolean
+        if isinstance(value, int):
+            return Integer
+        if isinstance(value, float):
+            return Float
+        if isinstance(value, datetime):
+            return DateTime
+        if isinstance(value, date):
+            return Date
+        return String
+    return String
+
+
+def materialized_model_factory(Base, table_name, column_names, rows):
+    logger.debug("Generating materialized model: %s", table_name)
+    model_fields = {
+        '__tablename__': table_name,
+        'pk': Column(Integer, primary_key=True)
+    }
+    for column_name in column_names:
+        column_type = get_materialized_column_type([row[column_name] for row in rows])
+        model_fields[column_name] = Column(column_name, column_type, primary_key=(column_name == 'pk'))
+
+    Model = type(
+        str(table_name),
+        (Base,),
+        model_fields
+    )
+
+    logger.debug("Materialized model %s fields = %s", table_name, model_fields)
+
+    # add the model class reference to the global scope
+    set_global(table_name, Model)
+    return Model
+
+
 def db_model_factory(Base, model, all_models):
 
     def get_or_create_association_table(model1_name, model2_name):
         _association_table_name = calculate_association_table_name(model1_name, model2_name)
         logger.debug("Creating/getting ManyToMany relationship table: %s", _association_table_name)
-        if _association_table_name in globals():
+        # only reuse association tables from the same (i.e. the current database's) metadata
+        if _association_table_name in globals() and \
+                getattr(globals()[_association_table_name], 'metadata', None) is Base.metadata:
             return globals()[_association_table_name]
 
         # create an association table
@@ -600,6 +962,25 @@ def db_model_factory(Base, model, all_models):
                 field.name
             )
 
+    # related instances are computed after loading, and stored in their own table
+    if model.related_via:
+        related_table = Table(
+            get_related_table_name(model.name),
+            Base.metadata,
+            Column('item_pk', String, ForeignKey('%s.pk' % model.name), index=True),
+            Column('related_pk', String, ForeignKey('%s.pk' % model.name)),
+            Column('rank', Integer),
+            Column('score', Float)
+        )
+        model_fields[model.related_field] = relationship(
+            model.name,
+            secondary=related_table,
+            primaryjoin=(model_fields['pk'] == related_table.c.item_pk),
+            secondaryjoin=(model_fields['pk'] == related_table.c.related_pk),
+            order_by=related_table.c.rank,
+            viewonly=True
+        )
+
     Model = type(
         str(model.name),
         (Base,),
@@ -0,0 +1,179 @@
+# -*- coding:utf-8 -*-
+
+import re
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import yaml
+from slugify import slugify
+
+from statik.utils import strip_html
+
+import logging
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'DerivedFieldFunctionStore',
+    'StatikFieldDerivation',
+    'register',
+    'compute_derived_values',
+]
+
+DERIVATION_REGEX = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*\((.*)\)\s*$")
+FIELD_NAME_REGEX = re.compile(r"^[A-Za-z_][A-Za-z0-9_\-]*$")
+
+# the number of instances per batch sent to each worker process
+DERIVED_BATCH_SIZE = 250
+
+
+class DerivedFieldFunctionStore(object):
+    """
+        To register a function for computing derived model fields:
+            from statik.derived import register
+
+            @register.function
+            def shout(text):
+                return text.upper()
+
+        Such a function can then be used in a model's configuration, e.g.:
+            title-shouted: String <- shout(title)
+    """
+
+    def __init__(self):
+        self.functions = dict()
+
+    def register_function(self, name, fn):
+        self.functions[name] = fn
+
+    def function(self, *args, **kwargs):
+        _self = self
+        name = kwargs.pop('name', None)
+        if name is not None:
+            def decorator(fn):
+                logger.debug("Registering derived field function: %s", name)
+                _self.register_function(name, fn)
+                return fn
+            return decorator
+
+        fn = args[0]
+        name = getattr(fn, '_decorated_function', fn).__name__
+        logger.debug("Registering derived field function: %s", name)
+        self.register_function(name, fn)
+        return fn
+
+    def get(self, name):
+        if name not in self.functions:
+            raise ValueError("Unrecognized derived field function: %s" % name)
+        return self.functions[name]
+
+
+store = DerivedFieldFunctionStore()
+register = store  # for clarity when using decorators
+
+
+class StatikFieldDerivation(object):
+    """A derived field's definition, e.g. "reading_time(content)" or "excerpt(content, 30)".
+    The arguments are parsed as a YAML flow sequence, so quoted arguments may contain commas.
+    Unquoted identifiers are treated as the names of the model's fields, and all other
+    arguments as YAML literals."""
+
+    def __init__(self, expr):
+        self.expr = expr.strip()
+        m = DERIVATION_REGEX.match(self.expr)
+        if m is None:
+            raise ValueError("Invalid derived field definition: %s" % self.expr)
+
+        self.function_name = m.group(1)
+        # a list of (is_field_name, value) tuples
+        self.args = []
+        args_str = m.group(2).strip()
+        # YAML allows (and ignores) a trailing comma in flow sequences
+        if args_str.endswith(','):
+            raise ValueError("Empty argument in derived field definition: %s" % self.expr)
+        try:
+            # the nodes tell us which of the arguments were unquoted
+            nodes = yaml.compose('[%s]' % args_str).value
+            values = yaml.safe_load('[%s]' % args_str)
+        except yaml.YAMLError as exc:
+            raise ValueError("Invalid arguments in derived field definition: %s (%s)" % (self.expr, exc))
+
+        for node, value in zip(nodes, values):
+            if isinstance(node, yaml.ScalarNode) and node.style is None and \
+                    FIELD_NAME_REGEX.match(node.value) and node.value not in {'true', 'false', 'null'}:
+                self.args.append((True, node.value.replace('-', '_')))
+            else:
+                self.args.append((False, value))
+
+    @property
+    def field_names(self):
+        return [value for is_field_name, value in self.args if is_field_name]
+
+    def compute(self, values):
+        """Computes the value of this derived field from the given dictionary of the source
+        instance's field values."""
+        return store.get(self.function_name)(*[
+            values.get(value) if is_field_name else value
+            for is_field_name, value in self.args
+        ])
+
+    def __repr__(self):
+        return "StatikFieldDerivation(%s)" % self.expr
+
+    def __str__(self):
+        return repr(self)
+
+
+def compute_derived_batch(derivation, rows):
+    return [derivation.compute(row) for row in rows]
+
+
+def compute_derived_values(derivation, rows, workers=None):
+    """Computes the values of the given derived field for all of the given rows (dictionaries of
+    field values), returning a list of the results in the same order as the rows.
+
+    If more than one worker is requested, batches of rows are computed in parallel in forked
+    worker processes, which inherit all registered functions from this process. Where forking
+    is not supported, or where there is only a single batch of rows, the computation happens
+    in the current process.
+    """
+    # make sure the function exists before we do anything else
+    store.get(derivation.function_name)
+
+    if not workers or workers < 2 or len(rows) <= DERIVED_BATCH_SIZE or \
+            'fork' not in multiprocessing.get_all_start_methods():
+        return compute_derived_batch(derivation, rows)
+
+    batches = [rows[i:i+DERIVED_BATCH_SIZE] for i in range(0, len(rows), DERIVED_BATCH_SIZE)]
+    logger.debug("Computing %s in %d batch(es) across %d worker(s)", derivation, len(batches), workers)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as executor:
+        results = executor.map(compute_derived_batch, [derivation] * len(batches), batches)
+        return [value for batch in results for value in batch]
+
+
+@register.function
+def word_count(text):
+    return len(strip_html(text).split())
+
+
+@register.function
+def reading_time(text, words_per_minute=200):
+    """Estimated reading time of the given text/HTML, in minutes (rounded up)."""
+    words = word_count(text)
+    return int(math.ceil(words / float(words_per_minute))) if words else 0
+
+
+@register.function
+def excerpt(text, max_words=50, suffix='...'):
+    words = strip_html(text).split()
+    if len(words) <= max_words:
+        return " ".join(words)
+    return " ".join(words[:max_words]) + suffix
+
+
+@register.function(name="slug")
+def slug_function(text):
+    return slugify(text) if text else ""
+
+
+register.register_function('strip_html', strip_html)
@@ -20,6 +20,7 @@ __all__ = [
     'InvalidModelCollectionDataError',
     'NoViewsError',
     'SafetyViolationError',
+    'ReadOnlyDatabaseError',
     'MissingTemplateError',
     'NoSupportedTemplateProvidersError',
     'MissingViewFieldError',
@@ -240,6 +241,10 @@ class SafetyViolationError(ViewError):
     error_message = "Queries in safe mode must be MLAlchemy-style queries."
 
 
+class ReadOnlyDatabaseError(ViewError):
+    error_message = "The database is read-only while rendering views."
+
+
 class MissingTemplateError(TemplateError):
     def __init__(self, name=None, path=None, kind=None, **kwargs):
         super(MissingTemplateError, self).__init__(**kwargs)
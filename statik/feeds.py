@@ -0,0 +1,344 @@
+# -*- coding:utf-8 -*-
+
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from xml.sax.saxutils import escape, quoteattr
+
+from sqlalchemy import inspect
+from sqlalchemy.orm.query import Query
+
+from statik.errors import InvalidViewFieldTypeError, MissingViewFieldError, StatikErrorContext
+from statik.utils import add_url_path_component, format_w3c_datetime
+from statik.sequence import parse_sequence_order, order_instances
+from statik.context import layer_context
+
+import logging
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'FEED_FORMATS',
+    'StatikFeed',
+]
+
+# the supported feed formats, mapped to their default output file extensions
+FEED_FORMATS = {
+    'atom': '.xml',
+    'rss': '.xml',
+    'json': '.json',
+}
+
+DEFAULT_FEED_LIMIT = 20
+
+ATOM_XMLNS = 'http://www.w3.org/2005/Atom'
+RSS_CONTENT_XMLNS = 'http://purl.org/rss/1.0/modules/content/'
+RSS_DC_XMLNS = 'http://purl.org/dc/elements/1.1/'
+JSON_FEED_VERSION = 'https://jsonfeed.org/version/1.1'
+
+# the fields of each entry that can be mapped to model fields, and their defaults
+FEED_ENTRY_FIELDS = {
+    'title': 'title',
+    'date': None,
+    'updated': None,
+    'summary': None,
+    'content': None,
+    'author': None,
+}
+
+
+def get_field_value(inst, field_path):
+    """Looks up the value of the given (optionally dotted, e.g. "author.name") field of the
+    given instance."""
+    value = inst
+    for field_name in field_path.split('.'):
+        if value is None:
+            return None
+        value = getattr(value, field_name.replace('-', '_'))
+    return value
+
+
+def format_rfc822_datetime(value):
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value)
+
+
+def xml_element(name, value):
+    return '<%s>%s</%s>' % (name, escape("%s" % value), name) if value is not None else ''
+
+
+class StatikFeedEntry(object):
+    """The values of a single feed entry, extracted from a model instance."""
+
+    def __init__(self, url, values):
+        self.url = url
+        self.title = values['title']
+        self.date = values['date']
+        self.updated = values['updated'] if values['updated'] is not None else values['date']
+        self.summary = values['summary']
+        self.content = values['content']
+        self.author = values['author']
+
+
+class StatikFeed(object):
+    """Natively generates Atom, RSS or JSON feeds from model instances, without having to render
+    a template over all of the feed's entries."""
+
+    def __init__(self, config, template_engine, view_name=None, error_context=None):
+        self.view_name = view_name
+        self.error_context = error_context or StatikErrorContext()
+        if not isinstance(config, dict):
+            raise InvalidViewFieldTypeError(
+                "feed",
+                "a key/value pair map",
+                view_name=view_name,
+                context=self.error_context
+            )
+        self.format = config.get('format', 'atom')
+        if self.format not in FEED_FORMATS:
+            raise InvalidViewFieldTypeError(
+                "feed.format",
+                "one of %s" % ", ".join(sorted(FEED_FORMATS.keys())),
+                view_name=view_name,
+                context=self.error_context
+            )
+        for field_name in ['title', 'site-url']:
+            if not isinstance(config.get(field_name, None), str):
+                raise MissingViewFieldError(
+                    "feed.%s" % field_name,
+                    view_name=view_name,
+                    context=self.error_context
+                )
+        self.site_url = config['site-url'].rstrip('/')
+        # the title can contain template variables (e.g. the taxonomy term of per-term feeds)
+        self.title = template_engine.create_template(config['title'])
+        # only required for feeds whose paths are simple (i.e. not one feed per taxonomy term
+        # or archive bucket)
+        self.query = config.get('query', None)
+
+        self.limit = config.get('limit', DEFAULT_FEED_LIMIT)
+        if self.limit is not None and (not isinstance(self.limit, int) or self.limit < 1):
+            raise InvalidViewFieldTypeError(
+                "feed.limit",
+                "a positive integer",
+                view_name=view_name,
+                context=self.error_context
+            )
+        self.order_by = None
+        if config.get('order-by', None) is not None:
+            try:
+                self.order_by = parse_sequence_order(config['order-by'])
+            except ValueError as exc:
+                raise InvalidViewFieldTypeError(
+                    "feed.order-by",
+                    "a field name or a list of field names",
+                    view_name=view_name,
+                    orig_exc=exc,
+                    context=self.error_context
+                )
+
+        entry_config = config.get('entry', None)
+        if not isinstance(entry_config, dict) or not isinstance(entry_config.get('link', None), str):
+            raise MissingViewFieldError(
+                "feed.entry.link",
+                view_name=view_name,
+                context=self.error_context
+            )
+        # the entry's link is a template, e.g. "{% url 'post', entry %}"
+        self.entry_link = template_engine.create_template(entry_config['link'])
+        self.entry_fields = dict([
+            (field_name, entry_config.get(field_name, default))
+            for field_name, default in FEED_ENTRY_FIELDS.items()
+        ])
+
+    def __repr__(self):
+        return "StatikFeed(format=%s, query=%s, order_by=%s, limit=%s)" % (
+            self.format, self.query, self.order_by, self.limit
+        )
+
+    def __str__(self):
+        return repr(self)
+
+    def get_query_ordering(self, query):
+        """Converts this feed's ordering into SQLAlchemy ordering clauses for the given query,
+        or returns None if the query's ordering can't be applied in the database (e.g. when
+        ordering by fields that aren't columns of the query's model)."""
+        descriptions = query.column_descriptions
+        if len(descriptions) != 1 or descriptions[0]['entity'] is None:
+            return None
+        Model = descriptions[0]['entity']
+        column_names = set([attr.key for attr in inspect(Model).column_attrs])
+        clauses = []
+        for field_name, descending in self.order_by:
+            if field_name not in column_names:
+                return None
+            column = getattr(Model, field_name)
+            # instances with empty values are always ordered last, as when ordering in memory
+            clauses.extend([column.is_(None), column.desc() if descending else column.asc()])
+        return clauses
+
+    def select_entries(self, items):
+        """Orders and limits the given items as configured for this feed. Queries are ordered
+        and limited in the database, and all other items in memory."""
+        if isinstance(items, Query):
+            ordering = self.get_query_ordering(items) if self.order_by is not None else []
+            if ordering is not None:
+                if ordering:
+                    # the feed's ordering replaces any ordering of the query itself
+                    items = items.order_by(None).order_by(*ordering)
+                if self.limit is not None:
+                    items = items.limit(self.limit)
+                return items.all()
+
+        if self.order_by is not None:
+            items = order_instances(items, self.order_by)
+        else:
+            items = list(items)
+        return items[:self.limit] if self.limit is not None else items
+
+    def absolute_url(self, url):
+        return url if '://' in url else self.site_url + url
+
+    def get_entry(self, inst, context):
+        return StatikFeedEntry(
+            self.absolute_url(self.entry_link.render(layer_context({'entry': inst}, context)).strip()),
+            dict([
+                (field_name, get_field_value(inst, field_path) if field_path else None)
+                for field_name, field_path in self.entry_fields.items()
+            ])
+        )
+
+    def get_entry_updated(self, inst):
+        """Looks up when the given instance's entry was last updated, without having to
+        extract (or serialize) the rest of the entry."""
+        for field_name in ['updated', 'date']:
+            field_path = self.entry_fields[field_name]
+            value = get_field_value(inst, field_path) if field_path else None
+            if value is not None:
+                return value
+        return None
+
+    def serialize_entry(self, inst, context, cache=None):
+        """Serializes the given instance as an entry of this feed's format. If a cache is given,
+        serialized entries are cached by model and primary key, so entries appearing in multiple
+        feeds (e.g. the per-term feeds of every one of a post's tags) are only serialized once."""
+        if cache is None:
+            return getattr(self, 'serialize_%s_entry' % self.format)(self.get_entry(inst, context))
+        key = (self.format, inst.__class__.__name__, getattr(inst, 'pk', id(inst)))
+        if key not in cache:
+            cache[key] = getattr(self, 'serialize_%s_entry' % self.format)(self.get_entry(inst, context))
+        return cache[key]
+
+    def generate(self, entries, feed_path, context, cache=None):
+        """Generates the feed, one chunk at a time. Entries are only serialized as they're
+        generated, so the whole feed is never held in memory at once.
+
+        Args:
+            entries: The model instances to be included in the feed, in order.
+            feed_path: The feed's own URL path (relative to the project's base path).
+            context: The context with which to render the feed's title and entries' links.
+            cache: An optional dictionary in which to cache serialized entries.
+        """
+        # the feed's own last update comes first, so it's worked out in a (cheap) first pass
+        updated = [entry_updated for entry_updated in map(self.get_entry_updated, entries)
+                   if entry_updated is not None]
+        updated = max(updated) if updated else None
+        feed_url = self.site_url + add_url_path_component(context.get('base_path', '/'), feed_path)
+        home_url = self.site_url + context.get('base_path', '/')
+        title = self.title.render(context).strip()
+        logger.debug("Generating %s feed \"%s\" with %d entries", self.format, title, len(entries))
+
+        if self.format == 'atom':
+            yield '<?xml version="1.0" encoding="utf-8"?>\n'
+            yield '<feed xmlns="%s">' % ATOM_XMLNS
+            yield xml_element('title', title)
+            yield '<id>%s</id><link href=%s/><link rel="self" href=%s/>' % (
+                escape(feed_url), quoteattr(home_url), quoteattr(feed_url)
+            )
+            # omitted if none of the entries are dated, so that builds are reproducible
+            if updated is not None:
+                yield xml_element('updated', format_w3c_datetime(updated))
+            yield '\n'
+        elif self.format == 'rss':
+            yield '<?xml version="1.0" encoding="utf-8"?>\n'
+            yield '<rss version="2.0" xmlns:content="%s" xmlns:dc="%s"><channel>' % (
+                RSS_CONTENT_XMLNS, RSS_DC_XMLNS
+            )
+            yield xml_element('title', title)
+            yield xml_element('link', home_url)
+            yield xml_element('description', title)
+            if updated is not None:
+                yield xml_element('lastBuildDate', format_rfc822_datetime(updated))
+            yield '\n'
+        else:
+            header = json.dumps({
+                'version': JSON_FEED_VERSION,
+                'title': title,
+                'home_page_url': home_url,
+                'feed_url': feed_url,
+            }, ensure_ascii=False)
+            # leave the object open for the items
+            yield header[:-1] + ', "items": ['
+
+        for i, inst in enumerate(entries):
+            if self.format == 'json' and i > 0:
+                yield ', '
+            yield self.serialize_entry(inst, context, cache)
+
+        if self.format == 'atom':
+            yield '</feed>\n'
+        elif self.format == 'rss':
+            yield '</channel></rss>\n'
+        else:
+            yield ']}\n'
+
+    @staticmethod
+    def serialize_atom_entry(entry):
+        return ''.join([
+            '<entry>',
+            xml_element('title', entry.title),
+            '<link href=%s/>' % quoteattr(entry.url),
+            xml_element('id', entry.url),
+            xml_element('updated', format_w3c_datetime(entry.updated) if entry.updated is not None else None),
+            xml_element('published', format_w3c_datetime(entry.date) if entry.date is not None else None),
+            '<author>%s</author>' % xml_element('name', entry.author) if entry.author is not None else '',
+            '<summary type="html">%s</summary>' % escape(entry.summary) if entry.summary is not None else '',
+            '<content type="html">%s</content>' % escape(entry.content) if entry.content is not None else '',
+            '</entry>\n',
+        ])
+
+    @staticmethod
+    def serialize_rss_entry(entry):
+        return ''.join([
+            '<item>',
+            xml_element('title', entry.title),
+            xml_element('link', entry.url),
+            '<guid isPermaLink="true">%s</guid>' % escape(entry.url),
+            xml_element('pubDate', format_rfc822_datetime(entry.date) if entry.date is not None else None),
+            # RSS's own <author> element must be an e-mail address, so names are given as
+            # Dublin Core creators instead
+            xml_element('dc:creator', entry.author),
+            xml_element('description', entry.summary if entry.summary is not None else entry.content),
+            '<content:encoded>%s</content:encoded>' % escape(entry.content) if entry.content is not None else '',
+            '</item>\n',
+        ])
+
+    @staticmethod
+    def serialize_json_entry(entry):
+        item = {
+            'id': entry.url,
+            'url': entry.url,
+        }
+        for key, value in [('title', entry.title), ('summary', entry.summary),
+                           ('content_html', entry.content)]:
+            if value is not None:
+                item[key] = "%s" % value
+        if entry.date is not None:
+            item['date_published'] = format_w3c_datetime(entry.date)
+        if entry.updated is not None:
+            item['date_modified'] = format_w3c_datetime(entry.updated)
+        if entry.author is not None:
+            item['authors'] = [{'name': "%s" % entry.author}]
+        return json.dumps(item, ensure_ascii=False, sort_keys=True)
@@ -3,6 +3,7 @@
 from copy import copy
 
 from statik.errors import *
+from statik.derived import StatikFieldDerivation
 
 __all__ = [
     'StatikModelField',
@@ -24,6 +25,8 @@ class StatikModelField(object):
     def __init__(self, name, field_type, **kwargs):
         self.name = name
         self.field_type = field_type
+        # how this field's value is computed from the model's other fields, if it's derived
+        self.derivation = kwargs.pop('derivation', None)
         # additional field parameters
         self.params = kwargs
 
@@ -95,14 +98,41 @@ def construct_field(model_name, field_name, field_type, all_models, **kwargs):
         field_type: A string indicator as to which field type must be built.
         all_models: A list containing the names of all of the models, which
             will help us when building foreign key lookups.
+
+    Derived fields are declared by way of a function applied to the model's other
+    fields, e.g. "Integer <- reading_time(content)".
     """
+    error_context = kwargs.pop('error_context', StatikErrorContext())
+    derivation_parts = field_type.split('<-')
+    field_type = derivation_parts[0]
+    derivation = None
+    if len(derivation_parts) > 1:
+        try:
+            derivation = StatikFieldDerivation(derivation_parts[1])
+        except ValueError as exc:
+            raise ModelError(
+                model_name,
+                message="invalid derived field definition for field \"%s\"." % field_name,
+                orig_exc=exc,
+                context=error_context
+            )
+
     field_type_parts = field_type.split('->')
     _field_type = field_type_parts[0].strip().split('[]')[0].strip()
     back_populates = field_type_parts[1].strip() if len(field_type_parts) > 1 else None
-    error_context = kwargs.pop('error_context', StatikErrorContext())
     _kwargs = copy(kwargs)
     _kwargs['back_populates'] = back_populates
 
+    if derivation is not None:
+        if _field_type not in FIELD_TYPES or _field_type == 'Content':
+            raise InvalidFieldTypeError(
+                model_name,
+                field_name,
+                "a String, Text, Integer, Boolean or DateTime field to be derived",
+                context=error_context
+            )
+        _kwargs['derivation'] = derivation
+
     if _field_type not in FIELD_TYPES and _field_type not in all_models:
         raise InvalidFieldTypeError(
             model_name,
@@ -0,0 +1,238 @@
+# -*- coding:utf-8 -*-
+
+from io import open
+import os
+import os.path
+import hashlib
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from jinja2 import nodes, TemplateNotFound, Undefined
+from sqlalchemy import inspect
+from sqlalchemy.exc import NoInspectionAvailable
+
+from statik.utils import ensure_path_exists
+from statik.pagination import Page
+from statik.taxonomy import StatikTaxonomyTerm
+from statik.archive import StatikArchiveBucket
+
+import logging
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'StatikFragmentCache',
+    'get_fingerprint',
+    'find_referenced_templates',
+]
+
+# the extension of persisted fragments' files
+FRAGMENT_FILE_EXT = '.fragment'
+SCALAR_TYPES = (str, bytes, int, float, bool, Decimal, date, datetime, time, type(None))
+# the kinds of Jinja2 nodes that pull in the source of other templates
+TEMPLATE_REFERENCE_NODES = (nodes.Include, nodes.Import, nodes.FromImport, nodes.Extends)
+
+
+def get_column_names(value):
+    """Returns the names of the columns of the given model instance (or record), or None if the
+    value isn't a model instance."""
+    column_names = getattr(value.__class__, 'column_names', None)
+    if column_names is not None:
+        return column_names
+    try:
+        return [attr.key for attr in inspect(value).mapper.column_attrs]
+    except (NoInspectionAvailable, AttributeError):
+        return None
+
+
+def update_fingerprint(h, value):
+    if isinstance(value, Undefined):
+        h.update(b'Undefined;')
+        return
+
+    if isinstance(value, SCALAR_TYPES):
+        h.update(("%s:%r;" % (value.__class__.__name__, value)).encode('utf-8'))
+        return
+
+    if isinstance(value, dict):
+        h.update(b'{')
+        for key in sorted(value.keys(), key=repr):
+            update_fingerprint(h, key)
+            update_fingerprint(h, value[key])
+        h.update(b'}')
+        return
+
+    column_names = get_column_names(value)
+    if column_names is not None:
+        # model instances and their records are identified by their columns' values (and not
+        # their relationships, which may be cyclic)
+        h.update(("%s(" % (getattr(value, 'model_name', None) or value.__class__.__name__)).encode('utf-8'))
+        for column_name in column_names:
+            update_fingerprint(h, getattr(value, column_name))
+        h.update(b')')
+        return
+
+    # only concrete collections are fingerprinted by their items (so as not to exhaust generators
+    # or execute queries)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        h.update(("%s[" % value.__class__.__name__).encode('utf-8'))
+        items = sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value
+        for item in items:
+            update_fingerprint(h, item)
+        h.update(b']')
+        return
+
+    # pages, taxonomy terms and archive buckets are fingerprinted by their (listed) items
+    if isinstance(value, (Page, StatikTaxonomyTerm, StatikArchiveBucket)):
+        h.update(("%s(%s" % (value.__class__.__name__, value)).encode('utf-8'))
+        if isinstance(value, (StatikTaxonomyTerm, StatikArchiveBucket)) and value.page is not None:
+            value = value.page
+        if isinstance(value.items, (list, tuple)):
+            update_fingerprint(h, value.items)
+        h.update(b')')
+        return
+
+    # the string representations of other values (e.g. the SQL of queries, or reprs containing
+    # memory addresses) don't reliably change when (and only when) their contents do
+    raise TypeError("Cannot fingerprint values of type %s" % value.__class__.__name__)
+
+
+def find_referenced_templates(node):
+    """Returns the expressions naming all of the templates included, imported or extended
+    within the given Jinja2 node (or list of nodes)."""
+    result = []
+    for child in (node if isinstance(node, list) else [node]):
+        if isinstance(child, TEMPLATE_REFERENCE_NODES):
+            result.append(child.template)
+        result.extend([ref.template for ref in child.find_all(TEMPLATE_REFERENCE_NODES)])
+    return result
+
+
+def get_fingerprint(*values):
+    """Computes a fingerprint of the given values, which only changes when their contents do. Model
+    instances are fingerprinted by the values of their columns, so the fingerprints of data loaded
+    from the same files are the same across builds.
+
+    Raises:
+        TypeError: If any of the values (or their items) can't be fingerprinted.
+    """
+    h = hashlib.sha1()
+    for value in values:
+        update_fingerprint(h, value)
+    return h.hexdigest()
+
+
+class StatikFragmentCache(object):
+    """Caches rendered template fragments (e.g. headers, footers and navigation menus that are
+    identical on every page) for the duration of a build and, optionally, on disk across builds."""
+
+    def __init__(self, path=None):
+        """Constructor.
+
+        Args:
+            path: If specified, the folder in which to persist fragments across builds.
+        """
+        self.path = path
+        if self.path is not None:
+            ensure_path_exists(self.path)
+        self.fragments = dict()
+        # checksums of template sources (along with those of the templates they reference),
+        # indexed by template name
+        self.template_checksums = dict()
+        # the keys of all of the fragments used during this build
+        self.used = set()
+        # the template fingerprints of fragments whose dependencies can't be fingerprinted (and
+        # which are therefore never cached)
+        self.uncacheable = set()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return "StatikFragmentCache(path=%s, fragments=%d)" % (self.path, len(self.fragments))
+
+    def __str__(self):
+        return repr(self)
+
+    def get_key(self, template_fingerprint, key, deps):
+        return get_fingerprint(template_fingerprint, key, deps)
+
+    def get_template_checksum(self, env, name, visited=None):
+        """Computes a checksum of the source of the template with the given name, as well as
+        the sources of any templates that it (statically) includes, imports or extends."""
+        if isinstance(name, (list, tuple)):
+            return get_fingerprint([self.get_template_checksum(env, n, visited) for n in name])
+        name = getattr(name, 'name', name)
+        if not isinstance(name, str) or env.loader is None:
+            return None
+        if name in self.template_checksums:
+            return self.template_checksums[name]
+
+        visited = visited or set()
+        if name in visited:
+            return None
+        visited.add(name)
+        try:
+            source, _, _ = env.loader.get_source(env, name)
+        except TemplateNotFound:
+            checksum = None
+        else:
+            referenced = [
+                ref.value for ref in find_referenced_templates(env.parse(source))
+                if isinstance(ref, nodes.Const)
+            ]
+            checksum = get_fingerprint(
+                source,
+                [self.get_template_checksum(env, ref, visited) for ref in referenced]
+            )
+        self.template_checksums[name] = checksum
+        return checksum
+
+    def get_filename(self, key):
+        return os.path.join(self.path, "%s%s" % (key, FRAGMENT_FILE_EXT))
+
+    def get(self, key, render):
+        """Returns the cached fragment with the given key, rendering it with the given callable
+        (and caching it) if necessary."""
+        self.used.add(key)
+        if key in self.fragments:
+            self.hits += 1
+            return self.fragments[key]
+
+        if self.path is not None and os.path.isfile(self.get_filename(key)):
+            with open(self.get_filename(key), 'rt', encoding='utf-8') as f:
+                self.fragments[key] = f.read()
+            self.hits += 1
+            return self.fragments[key]
+
+        self.misses += 1
+        fragment = self.fragments[key] = render()
+        if self.path is not None:
+            with open(self.get_filename(key), 'wt', encoding='utf-8') as f:
+                f.write(fragment)
+        return fragment
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return (float(self.hits) / total) if total else 0.0
+
+    def close(self):
+        """Logs this build's cache statistics, and removes any persisted fragments that weren't
+        used during this build (i.e. those that have since been invalidated)."""
+        if self.hits or self.misses:
+            logger.info(
+                "Fragment cache: %d hit(s), %d miss(es) (%.1f%% hit rate)",
+                self.hits,
+                self.misses,
+                self.hit_rate * 100.0
+            )
+        if self.path is None or not os.path.isdir(self.path):
+            return 0
+        removed = 0
+        for filename in os.listdir(self.path):
+            key, ext = os.path.splitext(filename)
+            if ext == FRAGMENT_FILE_EXT and key not in self.used:
+                os.unlink(os.path.join(self.path, filename))
+                removed += 1
+        if removed:
+            logger.debug("Removed %d stale fragment(s) from: %s", removed, self.path)
+        return removed
@@ -1,10 +1,13 @@
 # -*- coding:utf-8 -*-
 
+from copy import deepcopy
+
 from jinja2 import nodes
 from jinja2.ext import Extension
 from jinja2.exceptions import TemplateSyntaxError
 
 from statik.utils import add_url_path_component
+from statik.fragments import get_fingerprint, find_referenced_templates
 from statik import templatetags
 
 import lipsum
@@ -16,7 +19,8 @@ __all__ = [
     'StatikUrlExtension',
     'StatikAssetExtension',
     'StatikTemplateTagsExtension',
-    'StatikLoremIpsumExtension'
+    'StatikLoremIpsumExtension',
+    'StatikFragmentCacheExtension',
 ]
 
 
@@ -91,6 +95,66 @@ class StatikAssetExtension(Extension):
         )
 
 
+class StatikFragmentCacheExtension(Extension):
+    """Provides the `{% cache key, deps... %}...{% endcache %}` extension, which only renders the
+    enclosed fragment once for each combination of its key, the data on which it depends and its
+    own source, e.g.:
+
+        {% cache "nav", categories %}...{% endcache %}
+    """
+
+    tags = {'cache'}
+
+    def __init__(self, environment):
+        super(StatikFragmentCacheExtension, self).__init__(environment)
+
+        environment.extend(
+            statik_fragment_cache=None
+        )
+
+    def _cache(self, template_fingerprint, key, deps, templates, caller):
+        cache = self.environment.statik_fragment_cache
+        if cache is None:
+            return caller()
+        # changes to any included/imported templates must also invalidate the fragment
+        template_fingerprint = get_fingerprint(
+            template_fingerprint,
+            [cache.get_template_checksum(self.environment, name) for name in templates]
+        )
+        try:
+            fragment_key = cache.get_key(template_fingerprint, key, deps)
+        except TypeError as exc:
+            # rather render the fragment every time than risk reusing a stale one
+            if template_fingerprint not in cache.uncacheable:
+                cache.uncacheable.add(template_fingerprint)
+                logger.warning("Not caching template fragment \"%s\": %s", key, exc)
+            return caller()
+        return cache.get(fragment_key, caller)
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+
+        # get the first parameter: the fragment's key
+        args = [parser.parse_expression()]
+        # all subsequent parameters are the data on which the fragment depends
+        deps = []
+        while parser.stream.skip_if('comma'):
+            deps.append(parser.parse_expression())
+        args.append(nodes.List(deps))
+
+        body = parser.parse_statements(['name:endcache'], drop_needle=True)
+        # changes to the fragment's own source must invalidate it
+        args.insert(0, nodes.Const(get_fingerprint(parser.name, repr(body))))
+        # as must changes to the templates it includes/imports, whose names are only known when
+        # rendering
+        args.append(nodes.List([deepcopy(ref) for ref in find_referenced_templates(body)]))
+
+        return nodes.CallBlock(
+            self.call_method('_cache', args),
+            [], [], body
+        ).set_lineno(lineno)
+
+
 class StatikLoremIpsumExtension(Extension):
     """Allows users to generate "Lorem Ipsum" text/filler for their templates. This extension only supports
     generating words and sentences. It can generate a single paragraph of Lorem Ipsum text if no parameters
@@ -20,15 +20,21 @@ __all__ = [
     'MarkdownYamlMetaPreprocessor',
     'MarkdownPermalinkProcessor',
     'MarkdownLoremIpsumExtension',
-    'MarkdownLoremIpsumProcessor'
+    'MarkdownLoremIpsumProcessor',
+    'split_yaml_front_matter',
 ]
 
 
 class MarkdownYamlMetaExtension(Extension):
 
+    def __init__(self, *args, **kwargs):
+        # front matter that has already been split off from the content (and parsed), if any
+        self.meta = kwargs.pop('meta', None)
+        super(MarkdownYamlMetaExtension, self).__init__(*args, **kwargs)
+
     def extendMarkdown(self, md):
         md.preprocessors.register(
-            MarkdownYamlMetaPreprocessor(md),
+            MarkdownYamlMetaPreprocessor(md, meta=self.meta),
             'yaml-meta',
             40
         )
@@ -69,35 +75,56 @@ class MarkdownLoremIpsumExtension(Extension):
         )
 
 
-class MarkdownYamlMetaPreprocessor(Preprocessor):
-
-    def run(self, lines):
-        result = []
-        self.md.meta = {}
-
-        if len(lines) > 1:
-            yaml_lines = []
-            if lines[0].strip() == '---':
-                collecting_yaml = True
-                start_line = 1
-            else:
-                collecting_yaml = False
-                start_line = 0
-
-            for line in lines[start_line:]:
-                if collecting_yaml:
-                    if line.strip() == '---':
-                        collecting_yaml = False
-                    else:
-                        yaml_lines.append(line)
+def split_yaml_front_matter(lines):
+    """Splits the given list of lines into the YAML front matter (parsed as a dictionary) and the
+    remaining lines of content.
+
+    Args:
+        lines: A list of strings, one per line of the original content.
+
+    Returns:
+        A 2-tuple containing the parsed front matter and the remaining lines of content.
+    """
+    result = []
+    meta = {}
+
+    if len(lines) > 1:
+        yaml_lines = []
+        if lines[0].strip() == '---':
+            collecting_yaml = True
+            start_line = 1
+        else:
+            collecting_yaml = False
+            start_line = 0
+
+        for line in lines[start_line:]:
+            if collecting_yaml:
+                if line.strip() == '---':
+                    collecting_yaml = False
                 else:
-                    result.append(line)
+                    yaml_lines.append(line)
+            else:
+                result.append(line)
 
-            if len(yaml_lines) > 0:
-                self.md.meta = yaml.safe_load(
-                    '\n'.join(yaml_lines)
-                )
+        if len(yaml_lines) > 0:
+            meta = yaml.safe_load(
+                '\n'.join(yaml_lines)
+            )
 
+    return meta, result
+
+
+class MarkdownYamlMetaPreprocessor(Preprocessor):
+
+    def __init__(self, *args, **kwargs):
+        self.meta = kwargs.pop('meta', None)
+        super(MarkdownYamlMetaPreprocessor, self).__init__(*args, **kwargs)
+
+    def run(self, lines):
+        if self.meta is not None:
+            self.md.meta = self.meta
+            return lines
+        self.md.meta, result = split_yaml_front_matter(lines)
         return result
 
 
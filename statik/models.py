@@ -2,16 +2,32 @@
 
 from statik.common import YamlLoadable
 from statik.fields import *
+from statik.fields import FIELD_TYPES
 from statik.utils import extract_filename
 from statik.errors import *
+from statik.predicates import StatikLoadFilter
 
 import logging
 logger = logging.getLogger(__name__)
 
 __all__ = [
-    'StatikModel'
+    'StatikModel',
+    'MODEL_OPTIONS',
 ]
 
+# reserved keys in model configuration files that aren't field definitions
+MODEL_OPTIONS = {
+    'exclude-if',
+    'search-index',
+    'related',
+}
+
+# the default maximum number of related instances to compute per instance
+DEFAULT_RELATED_LIMIT = 5
+
+# field types that can be included in a model's full-text search index
+SEARCHABLE_FIELD_TYPES = {'String', 'Text', 'Content'}
+
 
 class StatikModel(YamlLoadable):
     """Represents a single model in our Statik project."""
@@ -40,9 +56,17 @@ class StatikModel(YamlLoadable):
         self.additional_rels = dict()
         # all of the foreign models to which this model refers
         self.foreign_models = set()
+        # derived fields' definitions, indexed by field name
+        self.derived_fields = dict()
+
+        # predicates determining which instances must be excluded at load time
+        self.load_filter = StatikLoadFilter()
+        self.add_load_filter_predicates(self.vars.get('exclude-if', None))
 
         # build up all of our fields from the model configuration
         for field_name, field_type in self.vars.items():
+            if field_name in MODEL_OPTIONS:
+                continue
             if field_type == 'Content':
                 if self.content_field is not None:
                     raise ModelError(
@@ -65,8 +89,109 @@ class StatikModel(YamlLoadable):
             if isinstance(new_field, StatikForeignKeyField) or \
                     isinstance(new_field, StatikManyToManyField):
                 self.foreign_models.add(new_field.field_type)
+            if new_field.derivation is not None:
+                self.derived_fields[new_field_name] = new_field.derivation
             logger.debug("Built field: %s.%s of type %s", self.name, field_name, new_field)
 
+        # derived fields can only be computed from this model's simple (non-relational) fields
+        for field_name, derivation in self.derived_fields.items():
+            for source_field_name in derivation.field_names:
+                if source_field_name == 'pk':
+                    continue
+                if source_field_name not in self.fields or \
+                        source_field_name in self.derived_fields or \
+                        self.fields[source_field_name].field_type not in FIELD_TYPES:
+                    raise ModelError(
+                        self.name,
+                        message="derived field \"%s\" can only be computed from this model's " % field_name +
+                            "non-derived String, Text, Content, Integer, Boolean or DateTime fields " +
+                            "(got \"%s\")." % source_field_name,
+                        context=self.error_context
+                    )
+
+        # fields to be mirrored in a full-text search index for this model
+        self.search_fields = self.vars.get('search-index', None) or []
+        if isinstance(self.search_fields, str):
+            self.search_fields = [self.search_fields]
+        if not isinstance(self.search_fields, list):
+            raise ModelError(
+                self.name,
+                message="\"search-index\" must be a list of field names.",
+                context=self.error_context
+            )
+        self.search_fields = [field_name.replace('-', '_') for field_name in self.search_fields]
+        for field_name in self.search_fields:
+            if field_name not in self.fields or \
+                    self.fields[field_name].field_type not in SEARCHABLE_FIELD_TYPES:
+                raise InvalidFieldTypeError(
+                    self.name,
+                    field_name,
+                    "a String, Text or Content field to be included in the search index",
+                    context=self.error_context
+                )
+
+        # related instances, computed from the terms (e.g. tags) that instances have in common
+        self.related_via, self.related_limit, self.related_field = [], DEFAULT_RELATED_LIMIT, 'related'
+        self.related_max_term_frequency = None
+        related_config = self.vars.get('related', None)
+        if related_config is not None:
+            if isinstance(related_config, (str, list)):
+                related_config = {'via': related_config}
+            if not isinstance(related_config, dict):
+                raise ModelError(
+                    self.name,
+                    message="\"related\" must be a field name, a list of field names or a key/value pair map.",
+                    context=self.error_context
+                )
+            self.related_via = related_config.get('via', None) or []
+            if isinstance(self.related_via, str):
+                self.related_via = [self.related_via]
+            self.related_limit = related_config.get('limit', DEFAULT_RELATED_LIMIT)
+            self.related_field = related_config.get('field', 'related').replace('-', '_')
+            if not isinstance(self.related_via, list) or not self.related_via or \
+                    not isinstance(self.related_limit, int) or self.related_limit < 1:
+                raise ModelError(
+                    self.name,
+                    message="\"related\" requires one or more fields (\"via\") and a positive \"limit\".",
+                    context=self.error_context
+                )
+            self.related_max_term_frequency = related_config.get('max-term-frequency', None)
+            if self.related_max_term_frequency is not None and \
+                    (not isinstance(self.related_max_term_frequency, int) or self.related_max_term_frequency < 2):
+                raise ModelError(
+                    self.name,
+                    message="\"related\" requires \"max-term-frequency\" to be an integer greater than 1.",
+                    context=self.error_context
+                )
+            if self.related_field in self.fields or self.related_field == 'pk':
+                raise ModelError(
+                    self.name,
+                    message="related instances' field name \"%s\" clashes with an existing field." % self.related_field,
+                    context=self.error_context
+                )
+            self.related_via = [field_name.replace('-', '_') for field_name in self.related_via]
+            for field_name in self.related_via:
+                if not isinstance(self.fields.get(field_name, None), (StatikManyToManyField, StatikForeignKeyField)):
+                    raise InvalidFieldTypeError(
+                        self.name,
+                        field_name,
+                        "a many-to-many or foreign key field from which to compute related instances",
+                        context=self.error_context
+                    )
+
+    def add_load_filter_predicates(self, predicates):
+        """Adds the given "exclude-if" predicate (or list of predicates) to this model's load
+        filter."""
+        try:
+            self.load_filter.extend(predicates)
+        except ValueError as exc:
+            raise ModelError(
+                self.name,
+                message="invalid \"exclude-if\" configuration.",
+                orig_exc=exc,
+                context=self.error_context
+            )
+
     def find_additional_rels(self, all_models):
         """Attempts to scan for additional relationship fields for this model based on all of the other models'
         structures and relationships.
@@ -0,0 +1,203 @@
+# -*- coding:utf-8 -*-
+
+import re
+
+import pystache
+# the compiler relies on pystache's (private) parse tree classes, which are only accessed through
+# this module so that a pystache upgrade can't break importing Statik (see
+# mustache_compiler_supported)
+from pystache import parser as pystache_parser
+from pystache.context import ContextStack
+from pystache.renderengine import RenderEngine
+
+import logging
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'StatikMustacheRenderer',
+    'compile_mustache_template',
+    'mustache_compiler_supported',
+]
+
+# a template and context exercising every kind of node the compiler handles, used to check that
+# compiled templates render exactly as pystache itself renders them
+COMPATIBILITY_CHECK_TEMPLATE = "{{a}} {{{a}}} {{&a}}{{! comment }}{{#b}}{{c}},{{/b}}{{^d}}-{{/d}}" \
+                               "{{#e}}{{a}}{{/e}}{{=<% %>=}}<%a%>\n  <%>p%>"
+COMPATIBILITY_CHECK_PARTIALS = {'p': "{{a}}\n{{#b}}{{c}}{{/b}}\n"}
+COMPATIBILITY_CHECK_CONTEXT = {'a': "<&>", 'b': [{'c': 1}, {'c': 2}], 'd': [], 'e': lambda s: s + "!"}
+
+_compiler_supported = None
+
+
+def check_mustache_compiler():
+    """Checks whether the installed version of pystache has all of the internals that
+    compile_mustache_template and StatikMustacheRenderer rely on, and whether compiled templates
+    render exactly as pystache renders them."""
+    for obj, attr in [
+            (pystache_parser, '_CommentNode'), (pystache_parser, '_ChangeNode'), (pystache_parser, '_EscapeNode'),
+            (pystache_parser, '_LiteralNode'), (pystache_parser, '_PartialNode'), (pystache_parser, '_InvertedNode'),
+            (pystache_parser, '_SectionNode'), (pystache_parser, 'NON_BLANK_RE'),
+            (RenderEngine, '_render_value'), (pystache.Renderer, '_make_render_engine'),
+            (pystache.Renderer, '_render_final')]:
+        if not hasattr(obj, attr):
+            logger.debug("%s.%s is missing from pystache", obj.__name__, attr)
+            return False
+
+    try:
+        parsed = pystache.parse(COMPATIBILITY_CHECK_TEMPLATE)
+        expected = pystache.Renderer(partials=COMPATIBILITY_CHECK_PARTIALS).render(parsed, COMPATIBILITY_CHECK_CONTEXT)
+        renderer = StatikMustacheRenderer(partials=COMPATIBILITY_CHECK_PARTIALS)
+        actual = compile_mustache_template(parsed)(
+            renderer.make_compiled_render_engine(),
+            ContextStack.create(COMPATIBILITY_CHECK_CONTEXT)
+        )
+    except Exception as exc:
+        logger.debug("Failed to render compiled Mustache template: %s", exc)
+        return False
+    return actual == expected
+
+
+def mustache_compiler_supported():
+    """Returns whether Mustache templates can be compiled (see compile_mustache_template) with
+    the installed version of pystache. This is only checked once: if it isn't supported, templates
+    must be rendered through pystache's public API instead."""
+    global _compiler_supported
+    if _compiler_supported is None:
+        _compiler_supported = check_mustache_compiler()
+        if not _compiler_supported:
+            logger.warning(
+                "Mustache templates can't be compiled with pystache %s, and will be rendered more slowly",
+                getattr(pystache, '__version__', 'unknown')
+            )
+    return _compiler_supported
+
+
+def compile_mustache_template(parsed_template):
+    """Compiles the given pystache ParsedTemplate into a Python function accepting a render engine
+    and a context stack, and returning the rendered string. The function renders exactly what
+    pystache's own node-by-node rendering would, but without having to walk the parse tree and
+    dispatch on each node's type on every render."""
+    parts = []
+    for node in parsed_template._parse_tree:
+        if type(node) is str:
+            # merge adjacent literal text
+            if parts and type(parts[-1]) is str:
+                parts[-1] += node
+            else:
+                parts.append(node)
+        elif isinstance(node, (pystache_parser._CommentNode, pystache_parser._ChangeNode)):
+            continue
+        else:
+            parts.append(compile_mustache_node(node))
+
+    if not parts:
+        return lambda engine, stack: ''
+    if len(parts) == 1:
+        if type(parts[0]) is str:
+            s = parts[0]
+            return lambda engine, stack: s
+        return parts[0]
+
+    parts = tuple(parts)
+
+    def render(engine, stack):
+        return ''.join([part if type(part) is str else part(engine, stack) for part in parts])
+
+    return render
+
+
+def compile_mustache_node(node):
+    key = getattr(node, 'key', None)
+
+    if isinstance(node, pystache_parser._EscapeNode):
+        return lambda engine, stack: engine.escape(engine.fetch_string(stack, key))
+
+    if isinstance(node, pystache_parser._LiteralNode):
+        return lambda engine, stack: engine.literal(engine.fetch_string(stack, key))
+
+    if isinstance(node, pystache_parser._PartialNode):
+        indent = node.indent
+        return lambda engine, stack: engine.render_partial(key, indent, stack)
+
+    if isinstance(node, pystache_parser._InvertedNode):
+        render_section = compile_mustache_template(node.parsed_section)
+
+        def render_inverted(engine, stack):
+            # lambdas are considered to be truthy for inverted sections, as per the spec
+            if engine.resolve_context(stack, key):
+                return ''
+            return render_section(engine, stack)
+
+        return render_inverted
+
+    if isinstance(node, pystache_parser._SectionNode):
+        render_section = compile_mustache_template(node.parsed)
+        delimiters = node.delimiters
+        section_source = node.template[node.index_begin:node.index_end]
+
+        def render_section_node(engine, stack):
+            parts = []
+            for value in engine.fetch_section_data(stack, key):
+                if callable(value):
+                    # lambdas receive the section's unprocessed source, as per the spec
+                    parts.append(engine._render_value(value(section_source), stack, delimiters=delimiters))
+                    continue
+                stack.push(value)
+                parts.append(render_section(engine, stack))
+                stack.pop()
+            return ''.join(parts)
+
+        return render_section_node
+
+    # fall back to pystache's own rendering for any nodes we don't know about
+    return node.render
+
+
+class StatikMustacheRenderEngine(RenderEngine):
+    """A pystache render engine that renders partials from compiled (and cached) templates."""
+
+    def __init__(self, **kwargs):
+        super(StatikMustacheRenderEngine, self).__init__(**kwargs)
+        # (partial name, indentation) -> compiled partial
+        self.partials = dict()
+
+    def render_partial(self, name, indent, stack):
+        key = (name, indent)
+        if key not in self.partials:
+            logger.debug("Compiling Mustache partial: %s", name)
+            template = self.resolve_partial(name)
+            # indent before parsing, exactly as pystache does
+            template = re.sub(pystache_parser.NON_BLANK_RE, indent + r'\1', template)
+            self.partials[key] = compile_mustache_template(pystache.parse(template))
+        return self.partials[key](self, stack)
+
+
+class StatikMustacheRenderer(pystache.Renderer):
+    """A pystache renderer that reuses a single render engine (and therefore its compiled partials)
+    across all renders."""
+
+    def __init__(self, **kwargs):
+        super(StatikMustacheRenderer, self).__init__(**kwargs)
+        self._engine = None
+
+    def _make_render_engine(self):
+        if not mustache_compiler_supported():
+            return super(StatikMustacheRenderer, self)._make_render_engine()
+        return self.make_compiled_render_engine()
+
+    def make_compiled_render_engine(self):
+        """Returns the render engine used to render compiled templates (and their partials)."""
+        if self._engine is None:
+            self._engine = StatikMustacheRenderEngine(
+                literal=self._to_unicode_hard,
+                escape=self._escape_to_unicode,
+                resolve_context=self._make_resolve_context(),
+                resolve_partial=self._make_resolve_partial(),
+                to_str=self.str_coerce
+            )
+        return self._engine
+
+    def render_compiled(self, render_fn, *context, **kwargs):
+        """Renders the given compiled template (see compile_mustache_template) with the given
+        context. Only supported if mustache_compiler_supported() returns True."""
+        return self._render_final(render_fn, *context, **kwargs)
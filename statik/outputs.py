@@ -0,0 +1,120 @@
+# -*- coding:utf-8 -*-
+
+from collections import OrderedDict
+
+from statik.pagination import Page
+from statik.taxonomy import StatikTaxonomyTerm
+from statik.archive import StatikArchiveBucket
+
+import logging
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'StatikOutputIndex',
+    'StreamedOutput',
+]
+
+
+class StreamedOutput(object):
+    """An output file whose contents are generated in chunks only when written (or when
+    converted to a string), rather than being held in memory as a single string."""
+
+    def __init__(self, generate, *args, **kwargs):
+        """Constructor.
+
+        Args:
+            generate: A callable returning an iterable of the output's (string) chunks. Any
+                additional arguments are passed through to this callable.
+        """
+        self.generate = generate
+        self.args = args
+        self.kwargs = kwargs
+
+    def __iter__(self):
+        return iter(self.generate(*self.args, **self.kwargs))
+
+    def write(self, f):
+        """Writes this output's chunks to the given file-like object, one at a time."""
+        for chunk in self:
+            f.write(chunk)
+
+    def __deepcopy__(self, memo):
+        # the output's only generated once it's written, so there's nothing to copy
+        return self
+
+    def __repr__(self):
+        return "StreamedOutput(generate=%s)" % getattr(self.generate, '__name__', self.generate)
+
+    def __str__(self):
+        return "".join(self)
+
+
+class StatikOutputIndex(object):
+    """Records the URL of every page rendered during a build (along with the view that rendered
+    it and, optionally, its last modification date/time), so that things like sitemaps can be
+    generated without having to query the database or render templates again."""
+
+    def __init__(self, lastmod_fields=None):
+        """Constructor.
+
+        Args:
+            lastmod_fields: An optional dictionary mapping model names to the names of the
+                DateTime fields containing their instances' last modification dates/times.
+        """
+        self.lastmod_fields = dict([
+            (model_name, field_name.replace('-', '_'))
+            for model_name, field_name in (lastmod_fields or dict()).items()
+        ])
+        # (view name, last modification date/time), indexed by URL
+        self.entries = OrderedDict()
+
+    def __repr__(self):
+        return "StatikOutputIndex(entries=%d)" % len(self.entries)
+
+    def __str__(self):
+        return repr(self)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, view_name, url, inst=None):
+        """Records the given URL as having been rendered by the given view, optionally for the
+        given instance (model instance, page, taxonomy term or archive bucket), from which the
+        URL's last modification date/time is obtained. Where multiple views render to the same
+        URL, the latest last modification date/time is kept."""
+        lastmod = self.get_lastmod(inst)
+        if url in self.entries:
+            prev_lastmod = self.entries[url][1]
+            if prev_lastmod is not None and (lastmod is None or prev_lastmod > lastmod):
+                lastmod = prev_lastmod
+        self.entries[url] = (view_name, lastmod)
+
+    def get_lastmod(self, inst):
+        """Works out the last modification date/time of the given instance. For pages, taxonomy
+        terms and archive buckets, this is the latest of their items' modification dates/times."""
+        if inst is None:
+            return None
+        if isinstance(inst, (StatikTaxonomyTerm, StatikArchiveBucket)):
+            items = inst.page.items if inst.page is not None else inst.items
+        elif isinstance(inst, Page):
+            items = inst.items
+        else:
+            items = [inst]
+
+        lastmod = None
+        for item in items:
+            # records (see StatikRecordStore) are looked up by the names of their models
+            model_name = getattr(item, 'model_name', None) or item.__class__.__name__
+            field_name = self.lastmod_fields.get(model_name, None)
+            value = getattr(item, field_name, None) if field_name is not None else None
+            if value is not None and (lastmod is None or value > lastmod):
+                lastmod = value
+        return lastmod
+
+    def urls(self, exclude_views=None):
+        """Yields (url, lastmod) tuples for all of the recorded URLs, in the order in which they
+        were rendered, skipping those rendered by any of the given views."""
+        exclude_views = set(exclude_views or [])
+        for url, (view_name, lastmod) in self.entries.items():
+            if view_name not in exclude_views:
+                yield url, lastmod
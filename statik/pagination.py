@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import math
+from itertools import islice
 
 __all__ = [
     "paginate"
@@ -91,18 +92,26 @@ class PaginatorIterator:
 class Paginator(object):
     """Paginator class for encapsulating a collection of paged items."""
 
-    def __init__(self, db_query, items_per_page, offset=0, start_page=1):
+    def __init__(self, db_query, items_per_page, offset=0, start_page=1, stream=False):
         """Constructor.
 
         Args:
-            db_query: The database query to execute.
+            db_query: The database query to execute (or a list of its results).
+            stream: If True, pages can only be iterated through sequentially, as they are read
+                from the query. Otherwise individual pages can also be fetched by page number.
         """
         self.db_query = db_query
         self.items_per_page = items_per_page
         self.offset = offset
         self.start_page = start_page
+        self.stream = stream
 
-        self.total_items = db_query.count() - offset
+        # queries are only counted up front: their results are fetched as pages are accessed
+        self.items = db_query if isinstance(db_query, (list, tuple)) else None
+        self.total_items = max(
+            (len(self.items) if self.items is not None else db_query.count()) - offset,
+            0
+        )
         self.total_pages = int(math.ceil(float(self.total_items) / float(items_per_page)))
         self.last_page = self.start_page + self.total_pages - 1
         self.page_range = range(self.start_page, self.last_page + 1)
@@ -113,22 +122,31 @@ class Paginator(object):
     def __getitem__(self, page):
         if page < self.start_page or page > self.last_page:
             raise IndexError("Invalid page number: %d" % page)
-        return Page(
-            self,
-            page,
-            self.db_query.offset(
-                self.offset + ((page-self.start_page) * self.items_per_page)
-            ).limit(self.items_per_page).all()
-        )
+        if self.stream:
+            raise TypeError("Streamed pages can only be accessed sequentially")
+        start = self.offset + ((page-self.start_page) * self.items_per_page)
+        if self.items is not None:
+            return Page(self, page, self.items[start:start + self.items_per_page])
+        return Page(self, page, self.db_query.offset(start).limit(self.items_per_page).all())
 
     def __len__(self):
         return self.total_pages
 
     def __iter__(self):
+        # walking through all of a query's pages only needs to execute the query once
+        if self.items is None:
+            return self.iter_stream()
         return PaginatorIterator(self, start_page=self.start_page)
 
+    def iter_stream(self):
+        """Yields each page in turn, reading their items sequentially from a single execution of
+        the query."""
+        items = islice(self.db_query, self.offset, None)
+        for page in self.page_range:
+            yield Page(self, page, list(islice(items, self.items_per_page)))
+
 
-def paginate(db_query, items_per_page, offset=0, start_page=1):
+def paginate(db_query, items_per_page, offset=0, start_page=1, stream=False):
     """Instantiates a Paginator instance for database queries.
 
     Args:
@@ -136,5 +154,7 @@ def paginate(db_query, items_per_page, offset=0, start_page=1):
         items_per_page: The desired number of items per page.
         offset: The number of items to skip when paginating.
         start_page: The number of the first page when reporting on page numbers.
+        stream: Whether to only allow pages to be read sequentially from the query (instead of
+            also allowing individual pages to be fetched by page number).
     """
-    return Paginator(db_query, items_per_page, offset=offset, start_page=start_page)
+    return Paginator(db_query, items_per_page, offset=offset, start_page=start_page, stream=stream)
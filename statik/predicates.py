@@ -0,0 +1,141 @@
+# -*- coding:utf-8 -*-
+
+import re
+import operator
+from datetime import datetime, date, timezone
+
+import yaml
+from dateutil.parser import parse as dateutil_parse
+
+import logging
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'StatikPredicate',
+    'StatikLoadFilter',
+]
+
+PREDICATE_OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<=': operator.le,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '>': operator.gt,
+}
+
+PREDICATE_CLAUSE_REGEX = re.compile(
+    r"^\s*(?P<field>[A-Za-z_][\w\-]*)\s*(?P<op>==|!=|<=|>=|<|>)\s*(?P<value>.+?)\s*$"
+)
+PREDICATE_AND_REGEX = re.compile(r"\s+and\s+")
+
+
+def coerce_comparable(value, other):
+    """Attempts to coerce the given value (from an instance's front matter) into something that
+    can be compared to the other (literal) value."""
+    if isinstance(other, (datetime, date)) and isinstance(value, str):
+        try:
+            value = dateutil_parse(value)
+        except (ValueError, OverflowError):
+            return value
+
+    # dates and date/times can't be compared directly
+    if isinstance(other, datetime) and isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    elif isinstance(value, datetime) and isinstance(other, date) and not isinstance(other, datetime):
+        value = value.date()
+
+    # naive and timezone-aware date/times can't be compared directly either
+    if isinstance(value, datetime) and isinstance(other, datetime):
+        if value.tzinfo is None and other.tzinfo is not None:
+            value = value.replace(tzinfo=other.tzinfo)
+        elif value.tzinfo is not None and other.tzinfo is None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return value
+
+
+class StatikPredicate(object):
+    """A single predicate, consisting of one or more "field op value" clauses that must all
+    hold true, e.g. "draft == true" or "published > now and featured == false". The special
+    value "now" refers to the current date/time."""
+
+    def __init__(self, expr):
+        if not isinstance(expr, str) or not expr.strip():
+            raise ValueError("Predicates must be non-empty strings, but got: %s" % expr)
+        self.expr = expr.strip()
+        self.clauses = []
+        for clause in PREDICATE_AND_REGEX.split(self.expr):
+            m = PREDICATE_CLAUSE_REGEX.match(clause)
+            if m is None:
+                raise ValueError("Invalid predicate clause: \"%s\"" % clause)
+            raw_value = m.group('value')
+            value = None if raw_value == 'now' else yaml.safe_load(raw_value)
+            self.clauses.append((
+                m.group('field').replace('-', '_'),
+                m.group('op'),
+                raw_value == 'now',
+                value,
+            ))
+
+    def __repr__(self):
+        return "StatikPredicate(expr=%s)" % self.expr
+
+    def __str__(self):
+        return repr(self)
+
+    def matches(self, values):
+        """Checks whether or not the given (underscored) dictionary of field values satisfies all
+        of this predicate's clauses."""
+        for field, op, is_now, other in self.clauses:
+            value = values.get(field, None)
+            if is_now:
+                other = datetime.now(timezone.utc)
+            value = coerce_comparable(value, other)
+            try:
+                if not PREDICATE_OPERATORS[op](value, other):
+                    return False
+            except TypeError:
+                # incomparable values (e.g. a missing field) never match
+                return False
+        return True
+
+
+class StatikLoadFilter(object):
+    """A collection of predicates to be evaluated against model instances' raw data (e.g. front
+    matter) at load time. If any one of the predicates matches, the instance is excluded from
+    the database before its content is converted or inserted."""
+
+    def __init__(self, predicates=None):
+        self.predicates = []
+        self.extend(predicates)
+
+    def __repr__(self):
+        return "StatikLoadFilter(predicates=%s)" % self.predicates
+
+    def __str__(self):
+        return repr(self)
+
+    def __bool__(self):
+        return len(self.predicates) > 0
+
+    def extend(self, predicates):
+        """Adds the given predicate string (or list of predicate strings) to this filter."""
+        if predicates is None:
+            return
+        if isinstance(predicates, str):
+            predicates = [predicates]
+        if not isinstance(predicates, list):
+            raise ValueError("Predicates must be a string or a list of strings")
+        self.predicates.extend([StatikPredicate(predicate) for predicate in predicates])
+
+    def excludes(self, values):
+        """Returns True if the given raw instance values match any of this filter's predicates."""
+        if not isinstance(values, dict):
+            return False
+        _values = dict([(k.replace('-', '_'), v) for k, v in values.items()])
+        for predicate in self.predicates:
+            if predicate.matches(_values):
+                logger.debug("Instance excluded by load filter: %s", predicate)
+                return True
+        return False
@@ -8,15 +8,16 @@ from copy import copy
 
 from .config import StatikConfig
 from .utils import get_project_config_file, list_files, extract_filename, deep_merge_dict, \
-        copy_tree
+        copy_tree, import_python_modules_by_path, dict_from_path
 from .errors import StatikErrorContext, MissingProjectConfig, InternalError, NoViewsError, \
         StatikError, MissingProjectFolderError, ProjectConfigurationError, ViewError
 from .models import StatikModel
 from .views import StatikView
 from .database import StatikDatabase
 from .templating import StatikTemplateEngine
-from .context import StatikContext
+from .context import StatikContext, StatikContextLayer
 from .deploy import new_deployment_method_instance
+from .outputs import StatikOutputIndex, StreamedOutput
 
 import statik.filters
 import statik.tags
@@ -36,6 +37,7 @@ class StatikProject(object):
     TEMPLATES_DIR = "templates"
     DATA_DIR = "data"
     TEMPLATETAGS_DIR = "templatetags"
+    DERIVED_DIR = "derived"
     THEMES_DIR = "themes"
     ASSETS_DIR = "assets"
     CONFIG_FILE = "config.yml"
@@ -56,6 +58,9 @@ class StatikProject(object):
             self.config = None
 
         self.safe_mode = kwargs.pop('safe_mode', False)
+        # overrides the configured cache path (relative to the project's path) if specified
+        self.cache_path = kwargs.pop('cache_path', None)
+        self.in_memory = False
 
         self.path, self.config_file_path = get_project_config_file(path, StatikProject.CONFIG_FILE)
         if (self.path is None or self.config_file_path is None) and self.config is None:
@@ -68,6 +73,7 @@ class StatikProject(object):
         self.views = {}
         self.db = None
         self.project_context = None
+        self.output_index = None
 
     def generate(self, output_path=None, in_memory=False, deploy_method=None):
         """Executes the Statik project generator.
@@ -85,6 +91,7 @@ class StatikProject(object):
             generated in the output path.
         """
         result = dict() if in_memory else 0
+        self.in_memory = in_memory
         logger.info("Generating Statik build...")
         try:
             if output_path is None and not in_memory:
@@ -126,19 +133,42 @@ class StatikProject(object):
             self.project_context = self.load_project_context()
 
             in_memory_result = self.process_views()
+            search_index_files = self.build_static_search_index()
 
             if in_memory:
-                result = in_memory_result
+                result = self.resolve_streamed_outputs(in_memory_result)
+                if search_index_files is not None:
+                    result = deep_merge_dict(
+                        result,
+                        dict_from_path(self.config.static_search.path, final_value=search_index_files)
+                    )
+                if self.config.sitemap is not None:
+                    result = deep_merge_dict(
+                        result,
+                        self.config.sitemap.build(self.output_index, base_path=self.config.base_path)
+                    )
             else:
                 # dump the in-memory output to files
                 file_count = self.dump_in_memory_result(in_memory_result, output_path)
                 logger.info('Wrote %d output file(s) to folder: %s', file_count, output_path)
+                if search_index_files is not None:
+                    # only rewrite the search index files whose contents have changed
+                    self.config.static_search.write(
+                        search_index_files,
+                        output_path,
+                        encoding=self.config.encoding
+                    )
+                if self.config.sitemap is not None:
+                    # stream the sitemap(s) directly to disk
+                    self.config.sitemap.write(self.output_index, output_path, base_path=self.config.base_path)
                 # copy any assets across, recursively
                 self.copy_assets(output_path)
                 result = file_count
                 if deployer is not None:
                     deployer.execute(output_path)
 
+            # all output (including streamed output) has now been rendered
+            self.template_engine.close()
             logger.info("Success!")
 
         except StatikError as exc:
@@ -170,12 +200,48 @@ class StatikProject(object):
 
         return result
 
+    def get_cache_path(self):
+        """Returns the full path to the folder in which this project's build caches are kept."""
+        if self.cache_path is not None:
+            return self.cache_path
+        return os.path.join(self.path, self.config.cache_path)
+
+    def compile_templates(self):
+        """Precompiles this project's (and its theme's) Jinja2 templates, so that subsequent
+        builds can load them without having to compile their source.
+
+        Returns:
+            The number of templates compiled.
+        """
+        try:
+            self.error_context.update(filename=self.config_file_path)
+            self.config = self.config or StatikConfig(self.config_file_path)
+            self.error_context.clear()
+            self.template_engine = StatikTemplateEngine(self)
+            if 'jinja2' not in self.template_engine.supported_providers:
+                raise ProjectConfigurationError(
+                    message="Only Jinja2 templates can be precompiled, but the Jinja2 template provider is not enabled.",
+                    context=self.error_context
+                )
+            return self.template_engine.compile_templates()
+
+        except StatikError as exc:
+            logger.debug(traceback.format_exc())
+            logger.error(exc.render())
+            raise exc
+
     def load_models(self):
         models_path = os.path.join(self.path, StatikProject.MODELS_DIR)
         logger.debug("Loading models from: %s", models_path)
         if not os.path.isdir(models_path):
             raise MissingProjectFolderError(StatikProject.MODELS_DIR)
 
+        # load any project-specific derived field functions; they register themselves
+        derived_path = os.path.join(self.path, StatikProject.DERIVED_DIR)
+        if os.path.isdir(derived_path):
+            logger.debug("Loading derived field functions from: %s", derived_path)
+            import_python_modules_by_path(derived_path)
+
         model_files = list_files(models_path, ['yml', 'yaml'])
         logger.debug("Found %d model(s) in project", len(model_files))
         # get all of the models' names
@@ -191,6 +257,15 @@ class StatikProject(object):
                 error_context=self.error_context
             )
 
+        # apply any project-wide load filters to their respective models
+        for model_name, predicates in self.config.exclude_if.items():
+            if model_name not in models:
+                raise ProjectConfigurationError(
+                    message="Load filter (\"exclude-if\") configured for unknown model: %s" % model_name,
+                    context=self.error_context
+                )
+            models[model_name].add_load_filter_predicates(predicates)
+
         return models
 
     def load_views(self):
@@ -227,7 +302,11 @@ class StatikProject(object):
             models,
             self.config.encoding,
             markdown_config=self.config.markdown_config,
-            error_context=self.error_context
+            error_context=self.error_context,
+            records=self.config.render_records,
+            materialize=self.config.materialize,
+            safe_mode=self.safe_mode,
+            derived_workers=self.config.derived_workers
         )
 
     def load_project_context(self):
@@ -244,7 +323,8 @@ class StatikProject(object):
                 dynamic=self.config.context_dynamic
             )
             logger.debug("Built project context: %s", context)
-            return context.build(db=self.db, safe_mode=self.safe_mode)
+            # built once, and shared by all of the project's views' pages
+            return StatikContextLayer(context.build(db=self.db, safe_mode=self.safe_mode))
 
         except StatikError as exc:
             raise exc
@@ -258,6 +338,9 @@ class StatikProject(object):
     def process_views(self):
         """Processes the loaded views to generate the required output data."""
         output = {}
+        # only keep track of all of the rendered pages' URLs if we need them
+        self.output_index = StatikOutputIndex(self.config.sitemap.lastmod_fields) \
+            if self.config.sitemap is not None else None
         logger.debug("Processing %d view(s)...", len(self.views))
         for view_name, view in self.views.items():
             try:
@@ -266,7 +349,8 @@ class StatikProject(object):
                     view.process(
                         self.db,
                         safe_mode=self.safe_mode,
-                        extra_context=self.project_context
+                        extra_context=self.project_context,
+                        output_index=self.output_index
                     )
                 )
             except StatikError as exc:
@@ -282,6 +366,27 @@ class StatikProject(object):
 
         return output
 
+    def build_static_search_index(self):
+        """Builds the project's static search index, if configured.
+
+        Returns:
+            A dictionary mapping the search index's filenames to their contents, or None if no
+            static search index has been configured for this project.
+        """
+        if self.config.static_search is None:
+            return None
+        logger.debug("Building static search index...")
+        return self.config.static_search.build(self.db, self.views, base_path=self.config.base_path)
+
+    def resolve_streamed_outputs(self, result):
+        """Recursively converts any streamed outputs in the given in-memory result into strings."""
+        return dict([
+            (k, self.resolve_streamed_outputs(v) if isinstance(v, dict) else (
+                "%s" % v if isinstance(v, StreamedOutput) else v
+            ))
+            for k, v in result.items()
+        ])
+
     def dump_in_memory_result(self, result, output_path):
         """Recursively dumps the result of our processing into files within the
         given output path.
@@ -308,7 +413,10 @@ class StatikProject(object):
                 logger.debug("Writing output file: %s", filename)
                 # dump the contents of the file
                 with open(filename, 'wt', encoding=self.config.encoding) as f:
-                    f.write(v)
+                    if isinstance(v, StreamedOutput):
+                        v.write(f)
+                    else:
+                        f.write(v)
 
                 file_count += 1
 
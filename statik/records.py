@@ -0,0 +1,176 @@
+# -*- coding:utf-8 -*-
+
+from sqlalchemy import inspect
+
+from statik.pagination import Page
+from statik.taxonomy import StatikTaxonomyTerm
+from statik.archive import StatikArchiveBucket
+from statik.sequence import StatikSequencePosition
+from statik.context import StatikContextLayer, context_layers, layer_context
+
+import logging
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'StatikRecord',
+    'StatikRecordStore',
+]
+
+
+class StatikRecord(object):
+    """Base class for lightweight, read-only copies of model instances for use during template
+    rendering. Subclasses are generated per model, with one slot per column and relationship."""
+
+    __slots__ = ()
+    model_name = None
+
+    def __repr__(self):
+        return "%s(pk=%s)" % (self.__class__.__name__, getattr(self, 'pk', None))
+
+    def __str__(self):
+        return repr(self)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Records for model %s are read-only" % self.model_name)
+
+
+class StatikRecordStore(object):
+    """Materializes SQLAlchemy model instances into StatikRecord objects, with all relationships
+    pre-resolved to other records. Each instance is only ever converted once per build."""
+
+    def __init__(self, Base):
+        """Constructor.
+
+        Args:
+            Base: The declarative base class of the database whose instances will be converted.
+        """
+        self.Base = Base
+        # record class, column names and relationship details, indexed by model class
+        self.record_classes = dict()
+        # converted records, indexed by (model class, primary key)
+        self.records = dict()
+        self.pending = []
+        # the keys of the records created while converting each instance (i.e. those of the
+        # instances reachable through its relationships that hadn't already been converted),
+        # indexed by the key of the converted instance
+        self.graphs = dict()
+        self.created = []
+        # converted shared context layers (along with the originals, so that their IDs can't be
+        # reused), indexed by the IDs of the original layers
+        self.converted_layers = dict()
+
+    def get_record_class(self, model_cls):
+        if model_cls not in self.record_classes:
+            mapper = inspect(model_cls)
+            columns = [attr.key for attr in mapper.column_attrs]
+            rels = [(rel.key, rel.uselist) for rel in mapper.relationships]
+            record_cls = type(
+                str("%sRecord" % model_cls.__name__),
+                (StatikRecord,),
+                {
+                    '__slots__': tuple(columns + [key for key, _ in rels]),
+                    'model_name': model_cls.__name__,
+                    'column_names': tuple(columns),
+                }
+            )
+            logger.debug("Generated record class %s for model %s", record_cls.__name__, model_cls.__name__)
+            self.record_classes[model_cls] = (record_cls, columns, rels)
+        return self.record_classes[model_cls]
+
+    def get(self, inst):
+        """Returns the record corresponding to the given model instance, converting it (and all
+        of the instances to which it is related) if necessary."""
+        record = self.get_or_create(inst)
+        while self.pending:
+            self.resolve_relationships(*self.pending.pop())
+        if self.created:
+            self.graphs[self.created[0]] = self.created
+            self.created = []
+        return record
+
+    def get_or_create(self, inst):
+        key = (inst.__class__, inst.pk)
+        if key not in self.records:
+            record_cls, columns, rels = self.get_record_class(inst.__class__)
+            record = record_cls.__new__(record_cls)
+            for column in columns:
+                object.__setattr__(record, column, getattr(inst, column))
+            self.records[key] = record
+            self.created.append(key)
+            # relationships are resolved afterwards to cater for cyclic references
+            self.pending.append((record, inst, rels))
+        return self.records[key]
+
+    def resolve_relationships(self, record, inst, rels):
+        for key, uselist in rels:
+            value = getattr(inst, key)
+            if uselist:
+                value = [self.get_or_create(related) for related in value]
+            elif value is not None:
+                value = self.get_or_create(value)
+            object.__setattr__(record, key, value)
+
+    def discard(self, inst):
+        """Removes the record for the given model instance (if any) from this store, along with
+        the records of all of the related instances that were converted along with it.
+
+        Returns:
+            The number of records removed.
+        """
+        key = (inst.__class__, inst.pk)
+        removed = 0
+        for related_key in self.graphs.pop(key, [key]):
+            if self.records.pop(related_key, None) is not None:
+                removed += 1
+            self.graphs.pop(related_key, None)
+        return removed
+
+    def convert(self, value):
+        """Converts the given value to records if it is a model instance, a list/tuple of model
+        instances, a page of model instances, a taxonomy term, an archive bucket or a sequence
+        position. All other values are returned as-is."""
+        if isinstance(value, self.Base):
+            return self.get(value)
+        if isinstance(value, (list, tuple)) and any(isinstance(item, self.Base) for item in value):
+            return [self.convert(item) for item in value]
+        if isinstance(value, Page):
+            # a copy, so that anything else holding the page still sees its model instances
+            return Page(value.paginator, value.number, self.convert(value.items))
+        if isinstance(value, StatikTaxonomyTerm):
+            return StatikTaxonomyTerm(
+                self.convert(value.term),
+                self.convert(value.items),
+                page=self.convert(value.page)
+            )
+        if isinstance(value, StatikArchiveBucket):
+            return StatikArchiveBucket(
+                value.period,
+                value.key,
+                self.convert(value.items),
+                page=self.convert(value.page)
+            )
+        if isinstance(value, StatikSequencePosition):
+            return StatikSequencePosition(
+                value.index,
+                value.total,
+                previous=self.convert(value.previous),
+                next=self.convert(value.next)
+            )
+        return value
+
+    def convert_layer(self, layer):
+        return layer.__class__([(key, self.convert(value)) for key, value in layer.items()])
+
+    def convert_context(self, context):
+        """Returns a copy of the given (optionally layered) template context with all model
+        instances converted to records. Shared context layers (e.g. the project's context) are
+        only converted once per build."""
+        layers = []
+        for layer in context_layers(context):
+            if isinstance(layer, StatikContextLayer):
+                if id(layer) not in self.converted_layers:
+                    self.converted_layers[id(layer)] = (layer, self.convert_layer(layer))
+                layers.append(self.converted_layers[id(layer)][1])
+            else:
+                layers.append(self.convert_layer(layer))
+        return layer_context(*layers)
@@ -0,0 +1,76 @@
+# -*- coding:utf-8 -*-
+
+import math
+import heapq
+from collections import defaultdict
+
+import logging
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'compute_related',
+    'get_related_table_name',
+]
+
+
+def get_related_table_name(model_name):
+    return '%s_related' % model_name
+
+
+def compute_related(item_terms, limit, max_term_frequency=None):
+    """Computes the top-k most similar items for every item, based on the terms (e.g. tags)
+    they share.
+
+    This is the row-by-row equivalent of multiplying a sparse item-by-term matrix by its
+    transpose: each item's scores are accumulated from the posting lists of its own terms
+    only, so items that share no terms are never compared. Similarity is the cosine of the
+    items' binary term vectors.
+
+    Comparing the items sharing a term costs the square of the term's document frequency, so
+    optionally, terms shared by more than max_term_frequency items can be pruned (as they'd have
+    the lowest inverse document frequencies, they say the least about how similar two items
+    are). Pruned terms still count towards the lengths of the items' term vectors.
+
+    Args:
+        item_terms: A dictionary mapping each item's primary key to the set of its terms.
+        limit: The maximum number of related items to compute per item.
+        max_term_frequency: The maximum number of items that may share a term for it to be
+            used in comparing items. If None (the default), no terms are pruned.
+
+    Returns:
+        A dictionary mapping each item's primary key to a list of (related_pk, score) tuples,
+        ordered from most to least similar (ties are broken by primary key).
+    """
+    postings = defaultdict(list)
+    for item_pk, terms in item_terms.items():
+        for term in terms:
+            postings[term].append(item_pk)
+
+    if max_term_frequency is not None:
+        pruned = [term for term, item_pks in postings.items() if len(item_pks) > max_term_frequency]
+        for term in pruned:
+            postings[term] = []
+        if pruned:
+            logger.info(
+                "Ignoring %d term(s) shared by more than %d items when computing related items: %s",
+                len(pruned),
+                max_term_frequency,
+                ", ".join(sorted("%s" % term for term in pruned))
+            )
+
+    related = dict()
+    for item_pk, terms in item_terms.items():
+        shared = defaultdict(int)
+        for term in terms:
+            for other_pk in postings[term]:
+                if other_pk != item_pk:
+                    shared[other_pk] += 1
+
+        scores = [
+            (other_pk, count / math.sqrt(len(terms) * len(item_terms[other_pk])))
+            for other_pk, count in shared.items()
+        ]
+        related[item_pk] = heapq.nsmallest(limit, scores, key=lambda score: (-score[1], score[0]))
+
+    logger.debug("Computed related items for %d item(s) across %d term(s)", len(item_terms), len(postings))
+    return related
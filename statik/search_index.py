@@ -0,0 +1,273 @@
+# -*- coding:utf-8 -*-
+
+import os
+import os.path
+import re
+import json
+import hashlib
+from io import open
+from collections import defaultdict
+from urllib.parse import quote
+
+from statik.errors import ProjectConfigurationError, StatikErrorContext
+from statik.utils import strip_html, add_url_path_component, write_file_if_changed
+
+import logging
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'StatikStaticSearchIndex',
+    'tokenize',
+]
+
+TOKEN_REGEX = re.compile(r"\w+", re.UNICODE)
+
+DEFAULT_SEARCH_INDEX_PATH = 'search'
+DEFAULT_SHARD_SIZE = 64 * 1024
+DEFAULT_MIN_TERM_LENGTH = 2
+
+MANIFEST_FILENAME = 'index.json'
+DOCUMENTS_FILENAME = 'documents.json'
+SHARD_FILENAME_PREFIX = 'terms'
+
+# length of the (hexadecimal) document IDs, derived from documents' models and primary keys
+DOCUMENT_ID_LENGTH = 10
+
+
+def tokenize(text, min_term_length=DEFAULT_MIN_TERM_LENGTH):
+    """Splits the given text/HTML (or the string representation of any other value, e.g. of
+    numeric or date fields) into lowercase terms."""
+    if text is None:
+        return []
+    if not isinstance(text, str):
+        text = "%s" % text
+    return [
+        term for term in TOKEN_REGEX.findall(strip_html(text).lower())
+        if len(term) >= min_term_length
+    ]
+
+
+def to_json(obj):
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def get_shard_filename(prefix):
+    if not prefix:
+        return '%s.json' % SHARD_FILENAME_PREFIX
+    return '%s-%s.json' % (SHARD_FILENAME_PREFIX, quote(prefix, safe=''))
+
+
+class StatikStaticSearchIndex(object):
+    """Generates a compact, sharded inverted index (plus a document table) of the configured
+    models' fields, for client-side search of static sites.
+
+    The output consists of:
+        index.json: The manifest, mapping term prefixes to the shard files containing all of
+            the terms starting with that prefix (clients must use the longest prefix matching
+            a term).
+        documents.json: Maps document IDs to documents' URLs and any stored fields.
+        terms*.json: The shards, mapping terms to lists of [document ID, term frequency] pairs.
+
+    Shards are split by successively longer term prefixes until each fits within the shard
+    size budget, and document IDs are derived from documents' models and primary keys, so a
+    changed document only affects the shards containing its terms.
+    """
+
+    def __init__(self, config, error_context=None):
+        self.error_context = error_context or StatikErrorContext()
+        if not isinstance(config, dict):
+            raise ProjectConfigurationError(
+                message="Static search index configuration must be a key/value pair map.",
+                context=self.error_context
+            )
+        self.path = config.get('path', DEFAULT_SEARCH_INDEX_PATH)
+        self.shard_size = config.get('shard-size', DEFAULT_SHARD_SIZE)
+        self.min_term_length = config.get('min-term-length', DEFAULT_MIN_TERM_LENGTH)
+        if not isinstance(self.path, str) or not self.path.strip('/'):
+            raise ProjectConfigurationError(
+                message="Static search index path must be a relative path within the output folder.",
+                context=self.error_context
+            )
+        if not isinstance(self.shard_size, int) or self.shard_size < 1 or \
+                not isinstance(self.min_term_length, int) or self.min_term_length < 1:
+            raise ProjectConfigurationError(
+                message="Static search index shard size and minimum term length must be positive integers.",
+                context=self.error_context
+            )
+
+        models = config.get('models', None)
+        if not isinstance(models, dict) or not models:
+            raise ProjectConfigurationError(
+                message="Static search index configuration requires a map of models to be indexed.",
+                context=self.error_context
+            )
+        # (view name, indexed fields, stored fields), indexed by model name
+        self.models = dict()
+        for model_name, model_config in models.items():
+            if not isinstance(model_config, dict) or not isinstance(model_config.get('view', None), str) or \
+                    not isinstance(model_config.get('fields', None), list):
+                raise ProjectConfigurationError(
+                    message="Static search index configuration for model %s must specify a view and " % model_name +
+                        "a list of fields.",
+                    context=self.error_context
+                )
+            self.models[model_name] = (
+                model_config['view'],
+                [field_name.replace('-', '_') for field_name in model_config['fields']],
+                [field_name.replace('-', '_') for field_name in model_config.get('store', [])],
+            )
+
+    def __repr__(self):
+        return "StatikStaticSearchIndex(path=%s, shard_size=%d, models=%s)" % (
+            self.path, self.shard_size, self.models
+        )
+
+    def __str__(self):
+        return repr(self)
+
+    def build(self, db, views, base_path='/'):
+        """Builds the search index from the given database.
+
+        Args:
+            db: The StatikDatabase instance containing the documents to be indexed.
+            views: The project's views (indexed by name), from which documents' URLs are
+                obtained.
+            base_path: The base path of the project's URLs.
+
+        Returns:
+            A dictionary mapping the index's filenames to their (JSON) contents.
+        """
+        documents = dict()
+        postings = defaultdict(dict)
+
+        for model_name in sorted(self.models.keys()):
+            view_name, fields, stored_fields = self.models[model_name]
+            if model_name not in db.tables:
+                raise ProjectConfigurationError(
+                    message="Static search index configured for unknown model: %s" % model_name,
+                    context=self.error_context
+                )
+            if view_name not in views:
+                raise ProjectConfigurationError(
+                    message="Static search index configured with unknown view: %s" % view_name,
+                    context=self.error_context
+                )
+            Model = db.tables[model_name]
+            for field_name in fields + stored_fields:
+                if not hasattr(Model, field_name):
+                    raise ProjectConfigurationError(
+                        message="Static search index configured with unknown field: %s.%s" % (
+                            model_name, field_name
+                        ),
+                        context=self.error_context
+                    )
+
+            for inst in db.session.query(Model).order_by(Model.pk):
+                doc_id = self.get_document_id(documents, model_name, inst.pk)
+                document = {
+                    'url': add_url_path_component(base_path, views[view_name].reverse_url(inst)),
+                    'model': model_name,
+                }
+                for field_name in stored_fields:
+                    value = getattr(inst, field_name)
+                    document[field_name] = value if value is None or isinstance(value, (int, float, bool)) \
+                        else strip_html("%s" % value)
+                documents[doc_id] = document
+
+                term_freqs = defaultdict(int)
+                for field_name in fields:
+                    for term in tokenize(getattr(inst, field_name), self.min_term_length):
+                        term_freqs[term] += 1
+                for term, freq in term_freqs.items():
+                    postings[term][doc_id] = freq
+
+        shards = self.shard_postings(
+            dict([
+                (term, [[doc_id, freq] for doc_id, freq in sorted(doc_freqs.items())])
+                for term, doc_freqs in postings.items()
+            ])
+        )
+        logger.debug(
+            "Built static search index of %d document(s) and %d term(s) in %d shard(s)",
+            len(documents), len(postings), len(shards)
+        )
+
+        result = dict([(get_shard_filename(prefix), to_json(shard)) for prefix, shard in shards.items()])
+        result[DOCUMENTS_FILENAME] = to_json(documents)
+        result[MANIFEST_FILENAME] = to_json({
+            'documents': DOCUMENTS_FILENAME,
+            'min-term-length': self.min_term_length,
+            'shards': dict([(prefix, get_shard_filename(prefix)) for prefix in shards.keys()]),
+        })
+        return result
+
+    @staticmethod
+    def get_document_id(documents, model_name, pk):
+        digest = hashlib.sha1(("%s:%s" % (model_name, pk)).encode('utf-8')).hexdigest()
+        length = DOCUMENT_ID_LENGTH
+        # extremely unlikely, but just in case
+        while digest[:length] in documents:
+            length += 1
+        return digest[:length]
+
+    def shard_postings(self, postings, prefix=''):
+        """Recursively splits the given postings (all of whose terms start with the given prefix)
+        into shards by term prefix, until each shard fits within the shard size budget (or can't
+        be split any further)."""
+        if len(to_json(postings)) <= self.shard_size:
+            return {prefix: postings} if postings else dict()
+
+        # terms equal to the prefix itself stay in the prefix's own shard
+        groups = defaultdict(dict)
+        for term, term_postings in postings.items():
+            groups[term[:len(prefix) + 1]][term] = term_postings
+        if len(groups) == 1 and prefix in groups:
+            return {prefix: postings}
+
+        shards = dict()
+        for group_prefix, group_postings in groups.items():
+            if group_prefix == prefix:
+                shards[prefix] = group_postings
+            else:
+                shards.update(self.shard_postings(group_postings, prefix=group_prefix))
+        return shards
+
+    def get_written_shards(self, index_path, encoding='utf-8'):
+        """Returns the filenames of the shards listed in the manifest previously written to the
+        given search index folder (if any), so that only those shards (and never other files
+        whose names happen to look like shards) are removed once they're no longer needed."""
+        try:
+            with open(os.path.join(index_path, MANIFEST_FILENAME), 'rt', encoding=encoding) as f:
+                shards = json.load(f).get('shards', dict())
+        except (OSError, ValueError, AttributeError):
+            return set()
+        if not isinstance(shards, dict):
+            return set()
+        return set([os.path.basename(filename) for filename in shards.values() if isinstance(filename, str)])
+
+    def write(self, files, output_path, encoding='utf-8'):
+        """Writes the given search index files (as generated by build()) to the search index
+        folder within the given output path, only rewriting files whose contents have changed
+        and removing shards that are no longer part of the index.
+
+        Returns:
+            The number of files that were (re)written.
+        """
+        index_path = os.path.join(output_path, self.path.strip('/'))
+        written_shards = self.get_written_shards(index_path, encoding=encoding)
+        written = 0
+        for filename, content in files.items():
+            if write_file_if_changed(os.path.join(index_path, filename), content, encoding=encoding):
+                written += 1
+
+        for shard_filename in written_shards - set(files.keys()):
+            shard_path = os.path.join(index_path, shard_filename)
+            if os.path.isfile(shard_path):
+                logger.debug("Removing stale search index shard: %s", shard_path)
+                os.remove(shard_path)
+
+        logger.info(
+            "Wrote %d of %d static search index file(s) to: %s (the rest were unchanged)",
+            written, len(files), index_path
+        )
+        return written
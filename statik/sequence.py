@@ -0,0 +1,100 @@
+# -*- coding:utf-8 -*-
+
+import logging
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'StatikSequencePosition',
+    'parse_sequence_order',
+    'build_sequence',
+    'order_instances',
+]
+
+
+class StatikSequencePosition(object):
+    """An instance's position within an ordered sequence of instances, along with its
+    neighbours, for previous/next navigation."""
+
+    def __init__(self, index, total, previous=None, next=None):
+        self.index = index
+        self.position = index + 1
+        self.total = total
+        self.previous = previous
+        self.next = next
+
+    @property
+    def first(self):
+        return self.index == 0
+
+    @property
+    def last(self):
+        return self.position == self.total
+
+    def __repr__(self):
+        return "StatikSequencePosition(position=%d, total=%d)" % (self.position, self.total)
+
+    def __str__(self):
+        return repr(self)
+
+
+def parse_sequence_order(order_by):
+    """Parses the given ordering (a field name or list/comma-separated string of field names,
+    each optionally prefixed with "-" for descending order) into a list of
+    (field_name, descending) tuples."""
+    if isinstance(order_by, str):
+        order_by = order_by.split(',')
+    if not isinstance(order_by, list) or not order_by:
+        raise ValueError("Sequence ordering must be a field name or a list of field names")
+    result = []
+    for field_name in order_by:
+        if not isinstance(field_name, str) or not field_name.strip().lstrip('-'):
+            raise ValueError("Invalid sequence ordering field: %s" % field_name)
+        field_name = field_name.strip()
+        result.append((field_name.lstrip('-').replace('-', '_'), field_name.startswith('-')))
+    return result
+
+
+def order_instances(instances, order_by):
+    """Orders the given instances in memory.
+
+    Args:
+        instances: An iterable of instances.
+        order_by: A list of (field_name, descending) tuples, as per parse_sequence_order().
+            Instances with empty values for a field are always ordered last for that field.
+
+    Returns:
+        A list of the ordered instances.
+    """
+    ordered = list(instances)
+    # successive stable sorts, from the least to the most significant field
+    for field_name, descending in reversed(order_by):
+        present = [inst for inst in ordered if getattr(inst, field_name) is not None]
+        missing = [inst for inst in ordered if getattr(inst, field_name) is None]
+        present.sort(key=lambda inst: getattr(inst, field_name), reverse=descending)
+        ordered = present + missing
+    return ordered
+
+
+def build_sequence(instances, order_by):
+    """Orders the given instances in a single pass (in memory), and computes each instance's
+    position within the resulting sequence.
+
+    Args:
+        instances: An iterable of instances.
+        order_by: A list of (field_name, descending) tuples, as per parse_sequence_order().
+
+    Returns:
+        A list of (instance, StatikSequencePosition) tuples, in sequence order.
+    """
+    ordered = order_instances(instances, order_by)
+    total = len(ordered)
+    logger.debug("Built sequence of %d instance(s) ordered by %s", total, order_by)
+    return [
+        (inst, StatikSequencePosition(
+            i,
+            total,
+            previous=ordered[i - 1] if i > 0 else None,
+            next=ordered[i + 1] if i < total - 1 else None
+        ))
+        for i, inst in enumerate(ordered)
+    ]
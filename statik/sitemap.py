@@ -0,0 +1,190 @@
+# -*- coding:utf-8 -*-
+
+import os
+import os.path
+from io import StringIO, open
+from urllib.parse import urlparse
+from xml.sax.saxutils import escape
+import xml.etree.ElementTree as ET
+
+from statik.errors import ProjectConfigurationError, StatikErrorContext
+from statik.utils import add_url_path_component, get_url_file_ext, ensure_path_exists, format_w3c_datetime
+
+import logging
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'StatikSitemap',
+]
+
+# as per the sitemap protocol (https://www.sitemaps.org/protocol.html)
+MAX_SITEMAP_URLS = 50000
+
+DEFAULT_SITEMAP_FILENAME = 'sitemap.xml'
+DEFAULT_SITEMAP_EXTENSIONS = ['.html', '.htm']
+
+SITEMAP_XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+class StatikSitemap(object):
+    """Generates sitemap.xml from a build's output index, sharding it into multiple sitemaps
+    (plus a sitemap index) when there are more URLs than a single sitemap may contain."""
+
+    def __init__(self, config, error_context=None):
+        self.error_context = error_context or StatikErrorContext()
+        if not isinstance(config, dict):
+            raise ProjectConfigurationError(
+                message="Sitemap configuration must be a key/value pair map.",
+                context=self.error_context
+            )
+        self.site_url = config.get('site-url', None)
+        if not isinstance(self.site_url, str) or not self.site_url.startswith(('http://', 'https://')):
+            raise ProjectConfigurationError(
+                message="Sitemap configuration requires an absolute \"site-url\" (e.g. https://example.com).",
+                context=self.error_context
+            )
+        self.site_url = self.site_url.rstrip('/')
+        self.filename = config.get('filename', DEFAULT_SITEMAP_FILENAME)
+        self.max_urls = config.get('max-urls', MAX_SITEMAP_URLS)
+        if not isinstance(self.max_urls, int) or not (0 < self.max_urls <= MAX_SITEMAP_URLS):
+            raise ProjectConfigurationError(
+                message="The maximum number of URLs per sitemap must be between 1 and %d." % MAX_SITEMAP_URLS,
+                context=self.error_context
+            )
+        self.extensions = config.get('extensions', DEFAULT_SITEMAP_EXTENSIONS)
+        self.exclude_views = config.get('exclude-views', [])
+        self.lastmod_fields = config.get('lastmod', dict())
+        if not isinstance(self.filename, str) or not self.filename.endswith('.xml') or \
+                not isinstance(self.extensions, list) or not isinstance(self.exclude_views, list) or \
+                not isinstance(self.lastmod_fields, dict):
+            raise ProjectConfigurationError(
+                message="Invalid sitemap configuration: \"filename\" must be an XML filename, " +
+                    "\"extensions\" and \"exclude-views\" must be lists and \"lastmod\" must be a " +
+                    "map of model names to DateTime fields.",
+                context=self.error_context
+            )
+
+    def __repr__(self):
+        return "StatikSitemap(site_url=%s, filename=%s, max_urls=%d, lastmod=%s)" % (
+            self.site_url, self.filename, self.max_urls, self.lastmod_fields
+        )
+
+    def __str__(self):
+        return repr(self)
+
+    def get_shard_filename(self, shard):
+        return "%s-%s.xml" % (self.filename[:-len('.xml')], shard)
+
+    def absolute_url(self, base_path, url):
+        return self.site_url + add_url_path_component(base_path, url)
+
+    def sitemap_urls(self, output_index):
+        """Yields the (url, lastmod) tuples from the given output index which belong in the
+        sitemap (i.e. pretty URLs and those with one of the configured extensions)."""
+        for url, lastmod in output_index.urls(exclude_views=self.exclude_views):
+            if url.endswith('/') or get_url_file_ext(url) in self.extensions:
+                yield url, lastmod
+
+    def generate_shards(self, output_index, base_path='/'):
+        """Yields (filename, lines) tuples for each sitemap to be generated, where lines is a
+        generator of the sitemap's XML lines. If the URLs fit into a single sitemap, only that
+        sitemap is generated, otherwise the last tuple is the sitemap index."""
+        urls = list(self.sitemap_urls(output_index))
+        shard_count = max(1, (len(urls) + self.max_urls - 1) // self.max_urls)
+        logger.debug("Generating %d sitemap(s) containing %d URL(s)", shard_count, len(urls))
+
+        if shard_count == 1:
+            yield self.filename, self.generate_urlset(urls, base_path)
+            return
+
+        shard_lastmods = []
+        for shard in range(shard_count):
+            shard_urls = urls[shard * self.max_urls:(shard + 1) * self.max_urls]
+            lastmods = [lastmod for _, lastmod in shard_urls if lastmod is not None]
+            shard_lastmods.append(max(lastmods) if lastmods else None)
+            yield self.get_shard_filename(shard + 1), self.generate_urlset(shard_urls, base_path)
+
+        yield self.filename, self.generate_index(
+            [(self.get_shard_filename(shard + 1), lastmod) for shard, lastmod in enumerate(shard_lastmods)],
+            base_path
+        )
+
+    def generate_urlset(self, urls, base_path):
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+        yield '<urlset xmlns="%s">\n' % SITEMAP_XMLNS
+        for url, lastmod in urls:
+            if lastmod is None:
+                yield '<url><loc>%s</loc></url>\n' % escape(self.absolute_url(base_path, url))
+            else:
+                yield '<url><loc>%s</loc><lastmod>%s</lastmod></url>\n' % (
+                    escape(self.absolute_url(base_path, url)),
+                    format_w3c_datetime(lastmod)
+                )
+        yield '</urlset>\n'
+
+    def generate_index(self, sitemaps, base_path):
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+        yield '<sitemapindex xmlns="%s">\n' % SITEMAP_XMLNS
+        for filename, lastmod in sitemaps:
+            if lastmod is None:
+                yield '<sitemap><loc>%s</loc></sitemap>\n' % escape(self.absolute_url(base_path, filename))
+            else:
+                yield '<sitemap><loc>%s</loc><lastmod>%s</lastmod></sitemap>\n' % (
+                    escape(self.absolute_url(base_path, filename)),
+                    format_w3c_datetime(lastmod)
+                )
+        yield '</sitemapindex>\n'
+
+    def build(self, output_index, base_path='/'):
+        """Generates the sitemap(s) in memory.
+
+        Returns:
+            A dictionary mapping the sitemaps' filenames to their contents.
+        """
+        result = dict()
+        for filename, lines in self.generate_shards(output_index, base_path=base_path):
+            buf = StringIO()
+            buf.writelines(lines)
+            result[filename] = buf.getvalue()
+        return result
+
+    def get_written_shards(self, output_path):
+        """Returns the filenames of the sitemap shards listed in the sitemap index previously
+        written to the given output path (if any). The sitemap index serves as the manifest of
+        the shards written by a build, so that only those shards (and never other files whose
+        names happen to look like shards) are removed once they're no longer needed."""
+        try:
+            root = ET.parse(os.path.join(output_path, self.filename)).getroot()
+        except (OSError, ET.ParseError):
+            return set()
+        if root.tag != '{%s}sitemapindex' % SITEMAP_XMLNS:
+            return set()
+        return set([
+            os.path.basename(urlparse(loc.text.strip()).path)
+            for loc in root.iterfind('{%s}sitemap/{%s}loc' % (SITEMAP_XMLNS, SITEMAP_XMLNS))
+            if loc.text
+        ])
+
+    def write(self, output_index, output_path, base_path='/'):
+        """Streams the sitemap(s) directly to (UTF-8 encoded) files in the given output path,
+        removing any sitemap shards written by previous builds that are no longer needed.
+
+        Returns:
+            The number of sitemap files written.
+        """
+        ensure_path_exists(output_path)
+        written_shards = self.get_written_shards(output_path)
+        filenames = set()
+        for filename, lines in self.generate_shards(output_index, base_path=base_path):
+            with open(os.path.join(output_path, filename), 'wt', encoding='utf-8') as f:
+                f.writelines(lines)
+            filenames.add(filename)
+
+        for shard_filename in written_shards - filenames:
+            shard_path = os.path.join(output_path, shard_filename)
+            if os.path.isfile(shard_path):
+                logger.debug("Removing stale sitemap: %s", shard_path)
+                os.remove(shard_path)
+
+        logger.info("Wrote %d sitemap file(s) to: %s", len(filenames), output_path)
+        return len(filenames)
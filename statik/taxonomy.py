@@ -0,0 +1,127 @@
+# -*- coding:utf-8 -*-
+
+from collections import OrderedDict
+
+from sqlalchemy import inspect
+from sqlalchemy.orm.interfaces import MANYTOONE
+
+import logging
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'StatikTaxonomyTerm',
+    'build_taxonomy',
+    'get_term_columns',
+    'parse_order_by',
+]
+
+
+class StatikTaxonomyTerm(object):
+    """A single term of a taxonomy (e.g. a tag or a category), along with all of the items
+    classified under it. Attributes not found on the term object itself are looked up on the
+    term's model instance, so {{ tag.name }} works as it would for the instance."""
+
+    def __init__(self, term, items, page=None):
+        """Constructor.
+
+        Args:
+            term: The model instance representing this term.
+            items: A list of all of the items classified under this term.
+            page: If paginated, the page of this term's items to be rendered.
+        """
+        self.term = term
+        self.pk = term.pk
+        self.items = items
+        self.count = len(items)
+        self.page = page
+
+    def with_page(self, page):
+        return StatikTaxonomyTerm(self.term, self.items, page=page)
+
+    def __getattr__(self, name):
+        # guard against infinite recursion when copying/unpickling
+        if name == 'term':
+            raise AttributeError(name)
+        return getattr(self.term, name)
+
+    def __iter__(self):
+        return iter(self.page if self.page is not None else self.items)
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return "StatikTaxonomyTerm(pk=%s, count=%d, page=%s)" % (self.pk, self.count, self.page)
+
+    def __str__(self):
+        return "%s" % self.pk
+
+
+def parse_order_by(Model, order_by):
+    """Converts the given ordering (a field name or list of field names, each optionally
+    prefixed with "-" for descending order) into SQLAlchemy ordering clauses for the given
+    model."""
+    if not order_by:
+        return []
+    if isinstance(order_by, str):
+        order_by = [field_name.strip() for field_name in order_by.split(',')]
+    clauses = []
+    for field_name in order_by:
+        descending = field_name.startswith('-')
+        column = getattr(Model, field_name.lstrip('-').replace('-', '_'))
+        clauses.append(column.desc() if descending else column.asc())
+    return clauses
+
+
+def get_term_columns(Model, field_name):
+    """Finds the columns linking the given model's instances to the terms of the given
+    many-to-many (or foreign key) field.
+
+    Returns:
+        A tuple containing the table in which the links are stored (the association table for
+        many-to-many fields, otherwise the model's own table), the column containing the model
+        instances' primary keys and the column containing the terms' primary keys.
+    """
+    mapper = inspect(Model)
+    if field_name in mapper.relationships:
+        rel = mapper.relationships[field_name]
+        if rel.secondary is not None:
+            return rel.secondary, rel.synchronize_pairs[0][1], rel.secondary_synchronize_pairs[0][1]
+        if rel.direction is MANYTOONE:
+            return Model.__table__, Model.__table__.c.pk, list(rel.local_columns)[0]
+    raise ValueError("%s.%s is not a many-to-many or foreign key field" % (Model.__name__, field_name))
+
+
+def build_taxonomy(db, model_name, field_name, order_by=None):
+    """Groups all of the instances of the given model by the terms of the given many-to-many
+    (or foreign key) field, in a single pass over the relevant association table.
+
+    Args:
+        db: The StatikDatabase instance to query.
+        model_name: The name of the model whose instances are to be grouped (e.g. "Post").
+        field_name: The name of the field containing the model's terms (e.g. "tags").
+        order_by: The optional ordering of the items within each term.
+
+    Returns:
+        A list of StatikTaxonomyTerm objects, ordered by the terms' primary keys. Terms without
+        any items are omitted.
+    """
+    Model = db.tables[model_name]
+    selectable, item_column, term_column = get_term_columns(Model, field_name)
+    Term = inspect(Model).relationships[field_name].mapper.class_
+    query = db.session.query(term_column, Model).select_from(selectable)
+    if selectable is not Model.__table__:
+        query = query.join(Model, Model.pk == item_column)
+    query = query.filter(term_column.isnot(None))
+
+    grouped = OrderedDict()
+    for term_pk, item in query.order_by(term_column, *parse_order_by(Model, order_by)):
+        grouped.setdefault(term_pk, []).append(item)
+
+    terms = dict([(term.pk, term) for term in db.session.query(Term)])
+    logger.debug("Grouped %s instances into %d %s term(s)", model_name, len(grouped), Term.__name__)
+    return [
+        StatikTaxonomyTerm(terms[term_pk], items)
+        for term_pk, items in grouped.items()
+        if term_pk in terms
+    ]
@@ -1,13 +1,28 @@
 # -*- coding: utf-8 -*-
 
 from io import open
+import os
 import os.path
+import hashlib
+import sys
+import shutil
+from collections import ChainMap
+from glob import glob
 
 import jinja2
+from jinja2 import nodes
+from jinja2.loaders import split_template_path
+from jinja2.utils import concat
 import pystache
+from pystache.context import ContextStack
 
+from statik import __version__ as statik_version
 from statik.errors import *
 from statik.utils import *
+from statik.utils import ensure_path_exists
+from statik.mustache import StatikMustacheRenderer, compile_mustache_template, mustache_compiler_supported
+from statik.context import context_layers
+from statik.fragments import StatikFragmentCache
 from statik import templatetags
 
 import logging
@@ -19,8 +34,14 @@ __all__ = [
     'StatikTemplateProvider',
     'StatikJinjaTemplate',
     'StatikJinjaTemplateProvider',
+    'StatikJinjaFormatterTemplate',
     'StatikMustacheTemplateProvider',
     'StatikMustacheTemplate',
+    'StatikBytecodeCache',
+    'StatikCompiledTemplateLoader',
+    'StatikTemplateIndex',
+    'compile_template_string',
+    'compile_template_formatter',
     'DEFAULT_TEMPLATE_PROVIDERS',
     'SAFER_TEMPLATE_PROVIDERS'
 ]
@@ -38,6 +59,14 @@ TEMPLATE_PROVIDER_EXTS = {
     "jinja2": [".html.jinja2", ".jinja2", ".html"],
     "mustache": [".html.mustache", ".mustache", ".html"]
 }
+# the maximum total size (in bytes) of the Jinja2 bytecode cache
+DEFAULT_BYTECODE_CACHE_SIZE = 64 * 1024 * 1024
+# within the project's cache path
+COMPILED_TEMPLATES_DIR = 'compiled-templates'
+# identifies the Jinja2/Statik versions and extensions with which templates were precompiled
+COMPILED_TEMPLATES_SALT_FILE = 'salt.txt'
+# within the project's cache path
+FRAGMENTS_DIR = 'fragments'
 
 
 def get_template_provider_class(provider):
@@ -52,20 +81,280 @@ def template_exception_handler(fn, error_context, filename=None):
     """Calls the given function, attempting to catch any template-related errors, and
     converts the error to a Statik TemplateError instance. Returns the result returned
     by the function itself."""
-    error_message = None
     if filename:
         error_context.update(filename=filename)
     try:
         return fn()
-    except jinja2.TemplateSyntaxError as exc:
+    except Exception as exc:
+        raise get_template_error(exc, error_context)
+
+
+def get_template_error(exc, error_context, item=None):
+    """Converts the given exception, raised while rendering or compiling a template, to a Statik
+    TemplateError instance (optionally attributing it to the given item of a batch render)."""
+    if isinstance(exc, jinja2.TemplateSyntaxError):
         error_context.update(filename=exc.filename, line_no=exc.lineno)
         error_message = exc.message
-    except jinja2.TemplateError as exc:
+    elif isinstance(exc, jinja2.TemplateError):
         error_message = exc.message
-    except Exception as exc:
+    else:
         error_message = "%s" % exc
+    if item is not None:
+        error_message = "%s (while rendering \"%s\")" % (error_message, item)
+    return TemplateError(message=error_message, context=error_context)
+
 
-    raise TemplateError(message=error_message, context=error_context)        
+class StatikTemplateIndex(object):
+    """An index of all of the files in a set of template paths, built by scanning each path once,
+    so that finding templates doesn't require probing the filesystem for every combination of
+    template path and extension."""
+
+    def __init__(self, template_paths):
+        """Constructor.
+
+        Args:
+            template_paths: The paths in which to look for templates, in order of precedence.
+        """
+        self.template_paths = list(template_paths)
+        # (template path, relative filename) tuples, with "/" as the path separator
+        self.files = set()
+        for template_path in self.template_paths:
+            for dirpath, _, filenames in os.walk(template_path, followlinks=True):
+                rel_path = os.path.relpath(dirpath, template_path)
+                for filename in filenames:
+                    rel_filename = filename if rel_path == os.curdir else os.path.join(rel_path, filename)
+                    self.files.add((template_path, rel_filename.replace(os.sep, '/')))
+        logger.debug("Indexed %d file(s) in %d template path(s)", len(self.files), len(self.template_paths))
+
+    def __repr__(self):
+        return "StatikTemplateIndex(template_paths=%s, files=%d)" % (self.template_paths, len(self.files))
+
+    def __str__(self):
+        return repr(self)
+
+    def __len__(self):
+        return len(self.files)
+
+    def find(self, prefix, exts):
+        """Equivalent to find_first_file_with_ext(), but using this index.
+
+        Returns:
+            On success, a 2-tuple containing the template path in which the file was found, and the
+            extension of the file. On failure, returns (None, None).
+        """
+        prefix = prefix.replace(os.sep, '/').lstrip('/')
+        for template_path in self.template_paths:
+            for ext in exts:
+                if (template_path, "%s%s" % (prefix, ext)) in self.files:
+                    return template_path, ext
+        return None, None
+
+
+def get_compilation_salt(extensions=None):
+    """Computes a hash of everything (other than the templates' source) affecting compiled
+    template code: the Jinja2 and Statik versions and the enabled Jinja2 extensions."""
+    return hashlib.sha1(
+        ("%s|%s|%s" % (jinja2.__version__, statik_version, ",".join(sorted(extensions or [])))).encode('utf-8')
+    ).hexdigest()
+
+
+class StatikBytecodeCache(jinja2.FileSystemBytecodeCache):
+    """A persistent, size-bounded Jinja2 bytecode cache. Cache keys include the versions of
+    Jinja2 and Statik and the enabled extensions (all of which affect the compiled code), and
+    Jinja2 itself checks each cached template's source checksum before using it."""
+
+    def __init__(self, directory, max_size=DEFAULT_BYTECODE_CACHE_SIZE, extensions=None):
+        ensure_path_exists(directory)
+        super(StatikBytecodeCache, self).__init__(directory)
+        self.max_size = max_size
+        self.salt = get_compilation_salt(extensions)
+        self.hits = 0
+        self.misses = 0
+        # the approximate total size of the cache's entries (calculated on eviction)
+        self.size = None
+
+    def get_cache_key(self, name, filename=None):
+        return super(StatikBytecodeCache, self).get_cache_key("%s|%s" % (self.salt, name), filename)
+
+    def load_bytecode(self, bucket):
+        super(StatikBytecodeCache, self).load_bytecode(bucket)
+        if bucket.code is None:
+            self.misses += 1
+            return
+        self.hits += 1
+        # keep track of when each entry was last used, for eviction purposes
+        try:
+            os.utime(self._get_cache_filename(bucket), None)
+        except OSError:
+            pass
+
+    def dump_bytecode(self, bucket):
+        super(StatikBytecodeCache, self).dump_bytecode(bucket)
+        # keep the cache within its maximum size during builds, not only between them
+        if self.size is None:
+            self.evict()
+            return
+        try:
+            self.size += os.path.getsize(self._get_cache_filename(bucket))
+        except OSError:
+            return
+        if self.size > self.max_size:
+            self.evict()
+
+    def evict(self):
+        """Removes the least recently used entries from the cache until its total size is within
+        its maximum size.
+
+        Returns:
+            The number of entries removed.
+        """
+        entries = []
+        for filename in glob(os.path.join(self.directory, self.pattern % '*')):
+            try:
+                st = os.stat(filename)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, filename))
+
+        total_size = sum([size for _, size, _ in entries])
+        evicted = 0
+        for _, size, filename in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(filename)
+            except OSError:
+                continue
+            total_size -= size
+            evicted += 1
+
+        self.size = total_size
+        if evicted:
+            logger.debug("Evicted %d entries from the Jinja2 bytecode cache", evicted)
+        return evicted
+
+
+class StatikCompiledTemplateLoader(jinja2.ModuleLoader):
+    """Loads templates precompiled into Python modules, falling back to the given source loader
+    for templates that haven't been compiled, or whose source is newer than their compiled
+    module. Source files are located through the given StatikTemplateIndex, rather than by probing
+    each of the source loader's search paths."""
+
+    has_source_access = True
+
+    def __init__(self, path, source_loader, template_index):
+        super(StatikCompiledTemplateLoader, self).__init__(path)
+        self.path = path
+        self.source_loader = source_loader
+        self.template_index = template_index
+
+    def get_source(self, environment, template):
+        return self.source_loader.get_source(environment, template)
+
+    def list_templates(self):
+        return self.source_loader.list_templates()
+
+    def find_source_filename(self, name):
+        pieces = split_template_path(name)
+        base_path, _ = self.template_index.find("/".join(pieces), [''])
+        if base_path is None:
+            return None
+        return os.path.join(base_path, *pieces)
+
+    def load(self, environment, name, globals=None):
+        module_filename = os.path.join(self.path, self.get_module_filename(name))
+        source_filename = self.find_source_filename(name)
+        if not os.path.isfile(module_filename) or (
+                source_filename is not None and
+                os.path.getmtime(source_filename) > os.path.getmtime(module_filename)):
+            logger.debug("Loading template from source (not compiled, or compiled module is stale): %s", name)
+            return self.source_loader.load(environment, name, globals)
+        logger.debug("Loading precompiled template: %s", name)
+        return super(StatikCompiledTemplateLoader, self).load(environment, name, globals)
+
+
+def compile_template_string(env, s):
+    """Equivalent to env.from_string(s), but also makes use of the environment's bytecode cache
+    (Jinja2 only uses it for templates loaded through its loaders)."""
+    bcc = env.bytecode_cache
+    if bcc is None:
+        return env.from_string(s)
+
+    checksum = bcc.get_source_checksum(s)
+    bucket = bcc.get_bucket(env, "<string:%s>" % checksum, None, s)
+    code = bucket.code
+    if code is None:
+        code = env.compile(s)
+        bucket.code = code
+        bcc.set_bucket(bucket)
+    return env.template_class.from_code(env, code, env.make_globals(None), None)
+
+
+def compile_expression_lookup(env, node):
+    """Compiles the given (Jinja2) constant, variable or attribute/item lookup expression into a
+    function that evaluates it against a context dictionary. Returns None for any other kind of
+    expression."""
+    if isinstance(node, nodes.Const):
+        value = node.value
+        return lambda ctx: value
+
+    if isinstance(node, nodes.Name) and node.ctx == 'load':
+        name = node.name
+
+        def lookup_name(ctx):
+            if name in ctx:
+                return ctx[name]
+            if name in env.globals:
+                return env.globals[name]
+            return env.undefined(name=name)
+
+        return lookup_name
+
+    if isinstance(node, nodes.Getattr):
+        lookup = compile_expression_lookup(env, node.node)
+        attr = node.attr
+        return (lambda ctx: env.getattr(lookup(ctx), attr)) if lookup is not None else None
+
+    if isinstance(node, nodes.Getitem) and isinstance(node.arg, nodes.Const):
+        lookup = compile_expression_lookup(env, node.node)
+        arg = node.arg.value
+        return (lambda ctx: env.getitem(lookup(ctx), arg)) if lookup is not None else None
+
+    return None
+
+
+def compile_template_formatter(env, s):
+    """Attempts to compile the given Jinja2 template string into a plain Python formatter function,
+    which renders the template from a context dictionary without the overhead of instantiating and
+    rendering a full Jinja2 template. Only templates made up of literal text and variable/attribute
+    lookups (e.g. "/posts/{{ post.pk }}/") can be compiled this way.
+
+    Returns:
+        The formatter function, or None if the template requires full Jinja2 rendering.
+    """
+    # autoescaping and finalizing change how values are output
+    if env.autoescape is not False or env.finalize is not None:
+        return None
+
+    parts = []
+    for node in env.parse(s).body:
+        if not isinstance(node, nodes.Output):
+            return None
+        for child in node.nodes:
+            if isinstance(child, nodes.TemplateData):
+                parts.append(child.data)
+                continue
+            lookup = compile_expression_lookup(env, child)
+            if lookup is None:
+                return None
+            parts.append(lookup)
+
+    parts = tuple(parts)
+
+    def formatter(ctx):
+        return ''.join([part if isinstance(part, str) else str(part(ctx)) for part in parts])
+
+    return formatter
 
 
 class StatikTemplateEngine(object):
@@ -126,6 +415,8 @@ class StatikTemplateEngine(object):
         for path in self.template_paths:
             if not os.path.exists(path) or not os.path.isdir(path):
                 raise MissingProjectFolderError(path)
+        # scan the template paths once, rather than probing for each template we need to find
+        self.template_index = StatikTemplateIndex(self.template_paths)
 
         logger.debug(
             "Configured the following template providers: %s",
@@ -150,10 +441,12 @@ class StatikTemplateEngine(object):
                 found_ext = ext
 
         if found_ext is None:
-            base_path, found_ext = find_first_file_with_ext(self.template_paths, name, self.exts)
+            base_path, found_ext = self.template_index.find(name, self.exts)
             if base_path is None or found_ext is None:
                 raise MissingTemplateError(name=name)
             name_with_ext = "%s%s" % (name, found_ext)
+        else:
+            base_path, _ = self.template_index.find(name, [''])
 
         return name_with_ext, self.providers_by_ext[found_ext], base_path
 
@@ -192,6 +485,23 @@ class StatikTemplateEngine(object):
         self.cached_templates[name] = template
         return template
 
+    def compile_templates(self):
+        """Precompiles all of the Jinja2 templates in our template paths.
+
+        Returns:
+            The number of templates compiled.
+        """
+        return template_exception_handler(
+            lambda: self.get_provider('jinja2').compile_templates(),
+            self.error_context
+        )
+
+    def close(self):
+        """Finalizes all of the providers instantiated during this build, once all of the build's
+        output has been rendered."""
+        for provider in self.providers.values():
+            provider.close()
+
     def create_template(self, s, provider_name=None):
         """Creates a template from the given string based on the specified provider or the provider with
         highest precedence.
@@ -222,6 +532,48 @@ class StatikTemplate(object):
             filename=self.filename
         )
 
+    def render_many(self, contexts):
+        """Renders this template once for each of the given items, only setting up rendering once
+        for the whole batch.
+
+        Args:
+            contexts: An iterable of (key, context) pairs, where the key identifies the item
+                being rendered (e.g. its output path) in case rendering it fails.
+
+        Returns:
+            A generator yielding a (key, rendered content) pair for each item, in order.
+        """
+        if self.filename:
+            self.error_context.update(filename=self.filename)
+        render = self.get_batch_renderer()
+        for key, context in contexts:
+            try:
+                rendered = render(context)
+            except Exception as exc:
+                raise get_template_error(exc, self.error_context, item=key)
+            yield key, rendered
+
+    def get_batch_renderer(self):
+        """Returns a function that renders this template from a single context, for use when
+        rendering batches of items."""
+        return self.do_render
+
+    def generate(self, context):
+        """Renders this template using the given context data, yielding the rendered content one
+        chunk at a time (rather than building it up as a single string)."""
+        if self.filename:
+            self.error_context.update(filename=self.filename)
+        try:
+            for chunk in self.do_generate(context):
+                yield chunk
+        except Exception as exc:
+            raise get_template_error(exc, self.error_context)
+
+    def do_generate(self, context):
+        """Renders this template in chunks. Templates that can't be rendered in chunks yield their
+        entire rendered content as a single chunk."""
+        yield self.do_render(context)
+
     def do_render(self, context):
         """Renders this template using the given context data."""
         raise NotImplementedError("Must be implemented in subclasses")
@@ -247,6 +599,10 @@ class StatikTemplateProvider(object):
         """Creates a template from the given string."""
         raise NotImplementedError("Must be implemented in subclasses")
 
+    def close(self):
+        """Called once all of a build's output has been rendered."""
+        pass
+
 
 class StatikJinjaTemplateProvider(StatikTemplateProvider):
     """Template provider specifically for Jinja2."""
@@ -275,6 +631,7 @@ class StatikJinjaTemplateProvider(StatikTemplateProvider):
             'statik.jinja2ext.StatikAssetExtension',
             'statik.jinja2ext.StatikLoremIpsumExtension',
             'statik.jinja2ext.StatikTemplateTagsExtension',
+            'statik.jinja2ext.StatikFragmentCacheExtension',
             'jinja2.ext.do',
             'jinja2.ext.loopcontrols',
             'jinja2.ext.with_',
@@ -284,14 +641,50 @@ class StatikJinjaTemplateProvider(StatikTemplateProvider):
         jinja2_config = project.config.vars.get('jinja2', dict())
         extensions.extend(jinja2_config.get('extensions', list()))
 
+        # templates precompiled with the same Jinja2/Statik versions and extensions take
+        # precedence over their source (unless the source is newer)
+        loader = jinja2.FileSystemLoader(
+            engine.template_paths,
+            encoding=project.config.encoding
+        )
+        self.compiled_templates_path = os.path.join(project.get_cache_path(), COMPILED_TEMPLATES_DIR)
+        self.compilation_salt = get_compilation_salt(extensions)
+        if self.get_compiled_templates_salt() == self.compilation_salt:
+            logger.debug("Using precompiled templates from: %s", self.compiled_templates_path)
+            loader = StatikCompiledTemplateLoader(self.compiled_templates_path, loader, engine.template_index)
+        elif os.path.isdir(self.compiled_templates_path):
+            logger.warning(
+                "Ignoring precompiled templates, as they were compiled with a different version of Statik, " +
+                "Jinja2 or different extensions (run Statik with --compile-templates to recompile them)"
+            )
+
+        # compiled templates are cached across builds, unless explicitly disabled (or unless
+        # generating in memory, which must not write anything to disk)
+        self.bytecode_cache = None
+        if not project.in_memory and jinja2_config.get('bytecode-cache', True) not in {False, "false", "0", 0}:
+            self.bytecode_cache = StatikBytecodeCache(
+                os.path.join(project.get_cache_path(), 'jinja2'),
+                max_size=jinja2_config.get('bytecode-cache-size', DEFAULT_BYTECODE_CACHE_SIZE),
+                extensions=extensions
+            )
+            self.bytecode_cache.evict()
+
         self.env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(
-                engine.template_paths,
-                encoding=project.config.encoding
-            ),
-            extensions=extensions
+            loader=loader,
+            extensions=extensions,
+            bytecode_cache=self.bytecode_cache
         )
 
+        # rendered {% cache %} fragments are kept for the build, and optionally across builds
+        self.fragment_cache = None
+        if jinja2_config.get('fragment-cache', True) not in {False, "false", "0", 0}:
+            persist = not project.in_memory and \
+                jinja2_config.get('fragment-cache-persist', False) not in {False, "false", "0", 0}
+            self.fragment_cache = StatikFragmentCache(
+                os.path.join(project.get_cache_path(), FRAGMENTS_DIR) if persist else None
+            )
+        self.env.statik_fragment_cache = self.fragment_cache
+
         if templatetags.store.filters:
             logger.debug(
                 "Loaded custom template tag filters: %s",
@@ -311,12 +704,82 @@ class StatikJinjaTemplateProvider(StatikTemplateProvider):
         if len(self.env.statik_views) == 0:
             self.env.statik_views = self.engine.project.views
 
+    def close(self):
+        if self.fragment_cache is not None:
+            self.fragment_cache.close()
+
+    def get_compiled_templates_salt(self):
+        salt_filename = os.path.join(self.compiled_templates_path, COMPILED_TEMPLATES_SALT_FILE)
+        if not os.path.isfile(salt_filename):
+            return None
+        with open(salt_filename, 'rt') as f:
+            return f.read().strip()
+
+    def compile_templates(self):
+        """Precompiles all of the project's (and its theme's) Jinja2 templates into Python
+        modules, replacing any previously compiled templates.
+
+        Returns:
+            The number of templates compiled.
+        """
+        jinja2_exts = tuple([
+            ext for ext, provider in self.engine.providers_by_ext.items() if provider == 'jinja2'
+        ])
+        names = [name for name in self.env.list_templates() if name.endswith(jinja2_exts)]
+        shutil.rmtree(self.compiled_templates_path, ignore_errors=True)
+        self.env.compile_templates(
+            self.compiled_templates_path,
+            filter_func=lambda name: name.endswith(jinja2_exts),
+            zip=None,
+            log_function=logger.debug,
+            ignore_errors=False
+        )
+        with open(os.path.join(self.compiled_templates_path, COMPILED_TEMPLATES_SALT_FILE), 'wt') as f:
+            f.write(self.compilation_salt)
+        logger.info("Compiled %d template(s) into: %s", len(names), self.compiled_templates_path)
+        return len(names)
+
     def load_template(self, name, full_path=None):
         logger.debug("Attempting to load Jinja2 template: %s", name)
         return StatikJinjaTemplate(self, self.env.get_template(name))
 
     def create_template(self, s):
-        return StatikJinjaTemplate(self, self.env.from_string(s))
+        # simple templates (e.g. most views' paths) don't need to be rendered by Jinja2 itself
+        formatter = compile_template_formatter(self.env, s)
+        if formatter is not None:
+            return StatikJinjaFormatterTemplate(formatter, s)
+        return StatikJinjaTemplate(self, compile_template_string(self.env, s))
+
+
+def new_jinja_context(template, context):
+    """Creates a Jinja2 rendering context for the given template, in which the given (optionally
+    layered) context is stacked over the template's globals without copying either of them
+    (unlike template.render(), which copies both into a new dictionary)."""
+    return template.new_context(
+        ChainMap(dict(), *(context_layers(context) + [template.globals])),
+        shared=True
+    )
+
+
+def render_jinja_template(template, context):
+    """Equivalent to template.render(**context), but without copying the context."""
+    try:
+        return concat(template.root_render_func(new_jinja_context(template, context)))
+    except Exception:
+        exc_info = sys.exc_info()
+    return template.environment.handle_exception(exc_info, True)
+
+
+def generate_jinja_template(template, context):
+    """Equivalent to template.generate(**context), but without copying the context."""
+    try:
+        for chunk in template.root_render_func(new_jinja_context(template, context)):
+            yield chunk
+    except Exception:
+        exc_info = sys.exc_info()
+    else:
+        return
+    yield template.environment.handle_exception(exc_info, True)
 
 
 class StatikJinjaTemplate(StatikTemplate):
@@ -342,7 +805,35 @@ class StatikJinjaTemplate(StatikTemplate):
     def do_render(self, context):
         # make sure we lazily reattach our provider's environment to the project's views
         self.provider.reattach_project_views()
-        return self.template.render(**context)
+        return render_jinja_template(self.template, context)
+
+    def do_generate(self, context):
+        self.provider.reattach_project_views()
+        return generate_jinja_template(self.template, context)
+
+    def get_batch_renderer(self):
+        self.provider.reattach_project_views()
+        template = self.template
+        return lambda context: render_jinja_template(template, context)
+
+
+class StatikJinjaFormatterTemplate(StatikTemplate):
+    """Wraps a simple Jinja2 template that has been compiled into a plain Python formatter
+    function (see compile_template_formatter)."""
+
+    def __init__(self, formatter, source, **kwargs):
+        super(StatikJinjaFormatterTemplate, self).__init__(None, **kwargs)
+        self.formatter = formatter
+        self.source = source
+
+    def __repr__(self):
+        return "StatikJinjaFormatterTemplate(source=%s)" % self.source
+
+    def __str__(self):
+        return repr(self)
+
+    def do_render(self, context):
+        return self.formatter(context)
 
 
 class StatikMustachePartialGetter(object):
@@ -369,16 +860,13 @@ class StatikMustacheTemplateProvider(StatikTemplateProvider):
     def __init__(self, engine, **kwargs):
         super(StatikMustacheTemplateProvider, self).__init__(engine, **kwargs)
         logger.debug("Instantiating Mustache template provider")
-        self.renderer = pystache.Renderer(partials=StatikMustachePartialGetter(self))
+        # a single renderer, so that partials are only parsed and compiled once per build
+        self.renderer = StatikMustacheRenderer(partials=StatikMustachePartialGetter(self))
 
     def load_template_content(self, name, full_path=None):
         logger.debug("Attempting to load Mustache template: %s", name)
         if full_path is None:
-            base_path, ext = find_first_file_with_ext(
-                self.engine.template_paths,
-                name,
-                self.expected_template_exts
-            )
+            base_path, ext = self.engine.template_index.find(name, self.expected_template_exts)
             if base_path is None or ext is None:
                 raise MissingTemplateError(
                     name=name,
@@ -387,17 +875,17 @@ class StatikMustacheTemplateProvider(StatikTemplateProvider):
                 )
             full_path = os.path.join(base_path, "%s%s" % (name, ext))
 
-        if not os.path.exists(full_path) or not os.path.isfile(full_path):
+        # read the template's content from the file
+        try:
+            with open(full_path, encoding=self.engine.project.config.encoding) as f:
+                template_content = f.read()
+        except (IOError, OSError):
             raise MissingTemplateError(
                 path=full_path,
                 kind="Mustache",
                 context=self.error_context
             )
 
-        # read the template's content from the file
-        with open(full_path, encoding=self.engine.project.config.encoding) as f:
-            template_content = f.read()
-
         return template_content
 
     def load_template(self, name, full_path=None):
@@ -424,6 +912,9 @@ class StatikMustacheTemplate(StatikTemplate):
         )
         self.parsed_template = parsed_template
         self.renderer = renderer
+        # compiled once, and reused for every instance rendered with this template (unless the
+        # installed version of pystache doesn't support compilation)
+        self.render_fn = compile_mustache_template(parsed_template) if mustache_compiler_supported() else None
 
     def __repr__(self):
         return "StatikMustacheTemplate(parsed_template=%s)" % self.parsed_template
@@ -432,4 +923,15 @@ class StatikMustacheTemplate(StatikTemplate):
         return repr(self)
 
     def do_render(self, context):
-        return self.renderer.render(self.parsed_template, context)
+        # pystache only looks up variables in dictionaries, so each of a layered context's
+        # layers are pushed onto its context stack (in reverse order of precedence)
+        if self.render_fn is None:
+            return self.renderer.render(self.parsed_template, *reversed(context_layers(context)))
+        return self.renderer.render_compiled(self.render_fn, *reversed(context_layers(context)))
+
+    def get_batch_renderer(self):
+        if self.render_fn is None:
+            return super(StatikMustacheTemplate, self).get_batch_renderer()
+        engine = self.renderer.make_compiled_render_engine()
+        render_fn = self.render_fn
+        return lambda context: render_fn(engine, ContextStack.create(*reversed(context_layers(context))))
@@ -8,6 +8,8 @@ import stat
 from copy import deepcopy, copy
 import shutil
 import re
+import html
+from datetime import datetime
 
 import importlib.util
 
@@ -37,8 +39,14 @@ __all__ = [
     'uncapitalize',
     'find_duplicates_in_array',
     'camel_to_snake',
+    'strip_html',
+    'write_file_if_changed',
+    'format_w3c_datetime',
 ]
 
+HTML_TAG_REGEX = re.compile(r"<[^>]*>")
+WHITESPACE_REGEX = re.compile(r"\s+")
+
 DEFAULT_CONFIG_CONTENT = """project-name: Your project name
 base-path: /
 """
@@ -80,12 +88,14 @@ def extract_filename(path):
 
 def dict_from_path(path, final_value=dict()):
     components = path.split('/')
-    last_dict = deepcopy(final_value)
+    # only the final value (if it's a dictionary) needs to be copied: every dictionary wrapping it
+    # is freshly created, so there's no need to copy each level (and everything beneath it) again
+    last_dict = deepcopy(final_value) if isinstance(final_value, dict) else final_value
     cur_dict = {}
     for i in range(-1, -len(components)-1, -1):
         if len(components[i]) > 0:
             cur_dict = {components[i]: last_dict}
-            last_dict = deepcopy(cur_dict)
+            last_dict = cur_dict
 
     return cur_dict
 
@@ -154,6 +164,26 @@ def copy_file_if_modified(src_path, dest_path):
         shutil.copy2(src_path, dest_path)
 
 
+def write_file_if_changed(path, content, encoding='utf-8'):
+    """Writes the given content to the file at the given path, but only if the file doesn't exist
+    yet or its content differs from the given content (so that unchanged files keep their
+    modification times).
+
+    Returns:
+        True if the file was written, or False if it was left unchanged.
+    """
+    if os.path.isfile(path):
+        with open(path, 'rt', encoding=encoding) as f:
+            if f.read() == content:
+                return False
+    else:
+        ensure_path_exists(os.path.dirname(path))
+
+    with open(path, 'wt', encoding=encoding) as f:
+        f.write(content)
+    return True
+
+
 def copy_tree(src_path, dest_path):
     """Copies the entire folder tree, recursively, from the given source path
     to the given destination path. If the destination path does not exist, it
@@ -367,3 +397,21 @@ def find_duplicates_in_array(array):
 
 def camel_to_snake(camel):
     return '_'.join(re.findall(r'[A-Z][a-z]*', camel))
+
+
+def strip_html(s):
+    """Strips all HTML tags from the given string, unescaping any HTML entities and collapsing
+    whitespace."""
+    if not s:
+        return ""
+    return WHITESPACE_REGEX.sub(' ', html.unescape(HTML_TAG_REGEX.sub(' ', s))).strip()
+
+
+def format_w3c_datetime(value):
+    """Formats the given date or date/time as a W3C (RFC 3339) date/time string. Naive
+    date/times are assumed to be in UTC."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return value.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+        return value.isoformat(timespec='seconds')
+    return value.isoformat()
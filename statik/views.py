@@ -1,11 +1,17 @@
 # -*- coding:utf-8 -*-
 
-from copy import deepcopy, copy
+from collections import ChainMap
 
 from statik.common import YamlLoadable
 from statik.errors import *
 from statik.utils import *
-from statik.context import StatikContext
+from statik.context import StatikContext, layer_context
+from statik.pagination import paginate, Page
+from statik.taxonomy import build_taxonomy, StatikTaxonomyTerm
+from statik.archive import build_archive, StatikArchiveBucket, ARCHIVE_PERIODS
+from statik.sequence import parse_sequence_order, build_sequence
+from statik.feeds import StatikFeed, FEED_FORMATS
+from statik.outputs import StreamedOutput
 
 import logging
 
@@ -18,9 +24,32 @@ __all__ = [
     'StatikViewComplexPath',
     'StatikViewRenderer',
     'StatikSimpleViewRenderer',
-    'StatikComplexViewRenderer'
+    'StatikComplexViewRenderer',
+    'StatikFeedViewRenderer',
 ]
 
+# the supported sources of complex paths' instances
+COMPLEX_PATH_SOURCES = ['for-each', 'taxonomy', 'archive']
+# the default name of the context variable holding each instance's position in a sequence
+DEFAULT_SEQUENCE_VARIABLE = 'sequence'
+# marks instances whose reverse URLs can't be looked up from a view's URL table
+UNCACHEABLE_URL = object()
+
+
+def get_url_table_key(inst):
+    """Returns the key under which the given instance's reverse URL is stored in a view's URL
+    table. Instances without primary keys, and individual pages of paginated items (including
+    those of taxonomy terms and archive buckets), aren't stored."""
+    if inst is None:
+        return None
+    if isinstance(inst, Page) or \
+            (isinstance(inst, (StatikTaxonomyTerm, StatikArchiveBucket)) and inst.page is not None):
+        return UNCACHEABLE_URL
+    pk = getattr(inst, 'pk', None)
+    if pk is None:
+        return UNCACHEABLE_URL
+    return pk
+
 
 class StatikViewPath(object):
     """Base class for encapsulation of the functionality relating to Statik views' paths."""
@@ -56,7 +85,11 @@ class StatikViewPath(object):
 
     def render_reverse(self, inst=None, context=None):
         """Renders the reverse URL for this path."""
-        rendered = self.render(inst=inst, context=context)
+        return self.reverse(self.render(inst=inst, context=context))
+
+    @staticmethod
+    def reverse(rendered):
+        """Converts the given rendered path into its (prettified) URL."""
         parts = rendered.split('/')
         # we only prettify URLs for these files
         if parts[-1] in ['index.html', 'index.htm']:
@@ -142,22 +175,157 @@ class StatikViewComplexPath(StatikViewPath):
                 view_name=self.view_name,
                 context=error_context
             )
-        if 'for-each' not in path:
+        # where this path's instances come from
+        sources = [key for key in COMPLEX_PATH_SOURCES if key in path]
+        if not sources:
             raise MissingViewFieldError(
                 "for-each",
-                view_name=self.view_name,
+                view_name=kwargs.get('view_name', None),
                 context=error_context
             )
-        if not isinstance(path['for-each'], dict) or len(path['for-each']) != 1:
+        if len(sources) > 1:
             raise InvalidViewFieldTypeError(
-                "for-each",
+                "path",
+                "only one of %s" % ", ".join(["\"%s\"" % key for key in COMPLEX_PATH_SOURCES]),
+                view_name=kwargs.get('view_name', None),
+                context=error_context
+            )
+        self.source = sources[0]
+        if not isinstance(path[self.source], dict) or len(path[self.source]) != 1:
+            raise InvalidViewFieldTypeError(
+                self.source,
                 "a single key/value pair",
-                view_name=self.view_name,
-                context=self.error_context
+                view_name=kwargs.get('view_name', None),
+                context=error_context
             )
         self.raw_template = path['template']
         self.template = template_engine.create_template(self.raw_template)
-        self.variable, self.query = list(path['for-each'].items())[0]
+        self.variable, self.query = list(path[self.source].items())[0]
+
+        # taxonomies group a model's instances by the terms of one of its fields, e.g. "Post.tags"
+        self.taxonomy_model = self.taxonomy_field = self.taxonomy_order_by = None
+        if self.source == 'taxonomy':
+            taxonomy_config = self.query if isinstance(self.query, dict) else {'field': self.query}
+            field_parts = taxonomy_config.get('field', None)
+            field_parts = field_parts.split('.') if isinstance(field_parts, str) else []
+            if len(field_parts) != 2:
+                raise InvalidViewFieldTypeError(
+                    "taxonomy",
+                    "a model field reference of the form \"Model.field\"",
+                    view_name=kwargs.get('view_name', None),
+                    context=error_context
+                )
+            self.taxonomy_model = field_parts[0]
+            self.taxonomy_field = field_parts[1].replace('-', '_')
+            self.taxonomy_order_by = taxonomy_config.get('order-by', None)
+
+        # archives bucket the results of a query by year, month and/or day of a date field
+        self.archive_date_field = self.archive_period = self.archive_order = None
+        if self.source == 'archive':
+            archive_config = self.query
+            if not isinstance(archive_config, dict) or 'query' not in archive_config or \
+                    not isinstance(archive_config.get('date-field', None), str):
+                raise InvalidViewFieldTypeError(
+                    "archive",
+                    "a map containing at least a \"query\" and a \"date-field\"",
+                    view_name=kwargs.get('view_name', None),
+                    context=error_context
+                )
+            self.query = archive_config['query']
+            self.archive_date_field = archive_config['date-field']
+            self.archive_period = archive_config.get('period', 'month')
+            self.archive_order = archive_config.get('order', 'desc')
+            periods = [self.archive_period] if isinstance(self.archive_period, str) else self.archive_period
+            if not isinstance(periods, list) or not periods or \
+                    any([period not in ARCHIVE_PERIODS for period in periods]):
+                raise InvalidViewFieldTypeError(
+                    "archive.period",
+                    "one or more of %s" % ", ".join(ARCHIVE_PERIODS),
+                    view_name=kwargs.get('view_name', None),
+                    context=error_context
+                )
+            if self.archive_order not in {'asc', 'desc'}:
+                raise InvalidViewFieldTypeError(
+                    "archive.order",
+                    "either \"asc\" or \"desc\"",
+                    view_name=kwargs.get('view_name', None),
+                    context=error_context
+                )
+
+        # optionally stream the for-each query's results in batches of this size
+        self.yield_per = path.get('yield-per', None)
+        if self.yield_per is not None and (
+                not isinstance(self.yield_per, int) or isinstance(self.yield_per, bool) or self.yield_per < 1):
+            raise InvalidViewFieldTypeError(
+                "yield-per",
+                "a positive integer",
+                view_name=kwargs.get('view_name', None),
+                context=error_context
+            )
+        # taxonomies and archives are built from all of their query's results at once, so there's
+        # nothing to stream (and their terms and buckets aren't model instances to be released)
+        if self.yield_per is not None and self.source != 'for-each':
+            raise InvalidViewFieldTypeError(
+                "yield-per",
+                "omitted for %s paths (only for-each queries can be streamed)" % self.source,
+                view_name=kwargs.get('view_name', None),
+                context=error_context
+            )
+        # optionally paginate the for-each query's results, rendering one output per page
+        self.items_per_page, self.page_offset, self.start_page = None, 0, 1
+        paginate_config = path.get('paginate', None)
+        if paginate_config is not None:
+            if isinstance(paginate_config, int) and not isinstance(paginate_config, bool):
+                paginate_config = {'items-per-page': paginate_config}
+            if not isinstance(paginate_config, dict):
+                raise InvalidViewFieldTypeError(
+                    "paginate",
+                    "a number of items per page, or a key/value pair map",
+                    view_name=kwargs.get('view_name', None),
+                    context=error_context
+                )
+            self.items_per_page = paginate_config.get('items-per-page', None)
+            self.page_offset = paginate_config.get('offset', 0)
+            self.start_page = paginate_config.get('start-page', 1)
+            for field_name, value, min_value in [
+                    ('items-per-page', self.items_per_page, 1),
+                    ('offset', self.page_offset, 0),
+                    ('start-page', self.start_page, 0)]:
+                if not isinstance(value, int) or isinstance(value, bool) or value < min_value:
+                    raise InvalidViewFieldTypeError(
+                        "paginate.%s" % field_name,
+                        "an integer of at least %d" % min_value,
+                        view_name=kwargs.get('view_name', None),
+                        context=error_context
+                    )
+
+        # optionally provide previous/next navigation through the instances in this order, via
+        # a context variable (named "sequence" unless configured otherwise, e.g.
+        # "sequence: {order-by: -published, variable: nav}") that is only present when enabled
+        self.sequence = None
+        self.sequence_variable = DEFAULT_SEQUENCE_VARIABLE
+        sequence_config = path.get('sequence', None)
+        if sequence_config is not None:
+            if isinstance(sequence_config, dict):
+                self.sequence_variable = sequence_config.get('variable', DEFAULT_SEQUENCE_VARIABLE)
+                sequence_config = sequence_config.get('order-by', None)
+            if not isinstance(self.sequence_variable, str) or not self.sequence_variable.isidentifier():
+                raise InvalidViewFieldTypeError(
+                    "sequence.variable",
+                    "a valid variable name",
+                    view_name=kwargs.get('view_name', None),
+                    context=error_context
+                )
+            try:
+                self.sequence = parse_sequence_order(sequence_config)
+            except ValueError as exc:
+                raise InvalidViewFieldTypeError(
+                    "sequence",
+                    "a field name or a list of field names",
+                    view_name=kwargs.get('view_name', None),
+                    orig_exc=exc,
+                    context=error_context
+                )
 
         super(StatikViewComplexPath, self).__init__(
             path,
@@ -166,22 +334,102 @@ class StatikViewComplexPath(StatikViewPath):
         )
 
     def __repr__(self):
-        return "StatikViewComplexPath(template=%s, variable=%s, query=%s)" % (
-            self.template, self.variable, self.query
+        return "StatikViewComplexPath(template=%s, variable=%s, query=%s, items_per_page=%s)" % (
+            self.template, self.variable, self.query, self.items_per_page
         )
 
     def __str__(self):
         return repr(self)
 
+    def instances(self, db, safe_mode=False):
+        """Returns an iterable of all of the instances (or pages of instances) for which this
+        path must be rendered, from the given database."""
+        if self.source == 'taxonomy':
+            try:
+                instances = build_taxonomy(
+                    db,
+                    self.taxonomy_model,
+                    self.taxonomy_field,
+                    order_by=self.taxonomy_order_by
+                )
+            except (KeyError, ValueError, AttributeError) as exc:
+                raise ViewError(
+                    view_name=self.view_name,
+                    message="Invalid taxonomy configuration: %s.%s" % (self.taxonomy_model, self.taxonomy_field),
+                    orig_exc=exc,
+                    context=self.error_context
+                )
+            if self.items_per_page:
+                return self.paginate_groups(instances)
+            return instances
+
+        if self.source == 'archive':
+            items = db.query(self.query, safe_mode=safe_mode)
+            try:
+                instances = build_archive(
+                    items,
+                    self.archive_date_field,
+                    period=self.archive_period,
+                    order=self.archive_order
+                )
+            except (ValueError, AttributeError) as exc:
+                raise ViewError(
+                    view_name=self.view_name,
+                    message="Invalid archive date field: %s" % self.archive_date_field,
+                    orig_exc=exc,
+                    context=self.error_context
+                )
+            if self.items_per_page:
+                return self.paginate_groups(instances)
+            return instances
+
+        instances = db.query(self.query, safe_mode=safe_mode, yield_per=self.yield_per)
+        if self.items_per_page:
+            # the query's only executed once, after which each output file gets a page of results
+            return paginate(
+                instances,
+                self.items_per_page,
+                offset=self.page_offset,
+                start_page=self.start_page,
+                stream=bool(self.yield_per)
+            )
+        return instances
+
+    def sequenced_instances(self, db, safe_mode=False):
+        """Returns an iterable of (instance, position) tuples for all of the instances for which
+        this path must be rendered. If this path has a sequence ordering, all of the instances'
+        positions in the sequence are computed up front (in a single pass), otherwise the
+        positions will be None."""
+        instances = self.instances(db, safe_mode=safe_mode)
+        if self.sequence is None:
+            return ((inst, None) for inst in instances)
+        try:
+            return build_sequence(instances, self.sequence)
+        except (AttributeError, TypeError) as exc:
+            raise ViewError(
+                view_name=self.view_name,
+                message="Cannot order instances in sequence by: %s" % (
+                    ", ".join([("-" if descending else "") + field_name for field_name, descending in self.sequence])
+                ),
+                orig_exc=exc,
+                context=self.error_context
+            )
+
+    def paginate_groups(self, groups):
+        """Paginates the items of each of the given groups (taxonomy terms or archive buckets),
+        yielding a copy of the group for each of its pages."""
+        for group in groups:
+            for page in paginate(group.items, self.items_per_page, offset=self.page_offset,
+                                 start_page=self.start_page):
+                yield group.with_page(page)
+
     def render(self, inst=None, context=None):
-        if context is not None and not isinstance(context, dict):
+        if context is not None and not isinstance(context, (dict, ChainMap)):
             raise TypeError(
                 "Path renderer requires a dict as context, but got %s" %
                 context.__class__.__name__
             )
-        ctx = copy(context) if context else dict()
-        ctx[self.variable] = inst
-        result = self.template.render(ctx)
+        result = self.template.render(layer_context({self.variable: inst}, context))
         result_ext = get_url_file_ext(result)
         if not result_ext:
             result = add_url_path_component(
@@ -194,10 +442,12 @@ class StatikViewComplexPath(StatikViewPath):
 class StatikViewRenderer(object):
     """Base class for the different kinds of Statik view renderers."""
 
-    def __init__(self, path, template, view_name=None, error_context=None):
+    def __init__(self, path, template, view_name=None, error_context=None, stream=False):
         self.path = path
         self.template = template
         self.view_name = view_name
+        # whether pages are rendered in chunks, directly into their output files
+        self.stream = stream
         self.error_context = error_context or StatikErrorContext()
         logger.debug(
             "Configured Statik view renderer for view \"%s\": %s",
@@ -205,18 +455,32 @@ class StatikViewRenderer(object):
             self
         )
 
-    def render(self, context, db=None, safe_mode=False, extra_context=None):
+    def render(self, context, db=None, safe_mode=False, extra_context=None, output_index=None):
+        """Must render this view using the given context.
+
+        Args:
+            context: The view's StatikContext.
+            db: The StatikDatabase instance from which to build the context.
+            safe_mode: Whether or not to run queries in safe mode.
+            extra_context: Additional context variables.
+            output_index: An optional StatikOutputIndex in which to record the URLs of all of
+                the rendered pages.
+        """
         raise NotImplementedError()
 
+    def render_streamed(self, ctx):
+        """Returns the given page's output, to be rendered in chunks only once it's written."""
+        return StreamedOutput(self.template.generate, ctx)
+
     @classmethod
-    def create(cls, path, template, view_name=None):
+    def create(cls, path, template, view_name=None, stream=False):
         if isinstance(path, StatikViewSimplePath):
             return StatikSimpleViewRenderer(
-                path, template, view_name=view_name
+                path, template, view_name=view_name, stream=stream
             )
         elif isinstance(path, StatikViewComplexPath):
             return StatikComplexViewRenderer(
-                path, template, view_name=view_name
+                path, template, view_name=view_name, stream=stream
             )
         raise TypeError(
             "Unsupported path type %s for view %s" % (path.__class__.__name__, view_name)
@@ -226,7 +490,7 @@ class StatikViewRenderer(object):
 class StatikSimpleViewRenderer(StatikViewRenderer):
     """Renderer for simple Statik views (only a single output file)."""
 
-    def __init__(self, path, template, view_name=None, error_context=None):
+    def __init__(self, path, template, view_name=None, error_context=None, stream=False):
         if not isinstance(path, StatikViewSimplePath):
             raise TypeError(
                 "Simple Statik view renderers only accept simple paths (in view %s)" % view_name
@@ -235,7 +499,8 @@ class StatikSimpleViewRenderer(StatikViewRenderer):
             path,
             template,
             view_name=view_name,
-            error_context=error_context
+            error_context=error_context,
+            stream=stream
         )
 
     def __repr__(self):
@@ -244,12 +509,17 @@ class StatikSimpleViewRenderer(StatikViewRenderer):
     def __str__(self):
         return repr(self)
 
-    def render(self, context, db=None, safe_mode=False, extra_context=None):
+    def render(self, context, db=None, safe_mode=False, extra_context=None, output_index=None):
         ctx = context.build(db=db, safe_mode=safe_mode, extra=extra_context)
+        if db is not None and db.records is not None:
+            ctx = db.records.convert_context(ctx)
         logger.debug("Rendering view %s with context: %s", self.view_name, ctx)
+        path = self.path.render()
+        if output_index is not None:
+            output_index.add(self.view_name, self.path.reverse(path))
         return dict_from_path(
-            self.path.render(),
-            final_value=self.template.render(ctx)
+            path,
+            final_value=self.render_streamed(ctx) if self.stream else self.template.render(ctx)
         )
 
 
@@ -257,7 +527,7 @@ class StatikComplexViewRenderer(StatikViewRenderer):
     """Renderer for complex Statik views (multiple output files from a single view, dependent on
     the results of a database query)."""
 
-    def __init__(self, path, template, view_name=None, error_context=None):
+    def __init__(self, path, template, view_name=None, error_context=None, stream=False):
         if not isinstance(path, StatikViewComplexPath):
             raise TypeError(
                 "Complex Statik view renderers only accept complex paths (in view %s)" % view_name
@@ -266,7 +536,8 @@ class StatikComplexViewRenderer(StatikViewRenderer):
             path,
             template,
             view_name=view_name,
-            error_context=error_context
+            error_context=error_context,
+            stream=stream
         )
 
     def __repr__(self):
@@ -275,7 +546,7 @@ class StatikComplexViewRenderer(StatikViewRenderer):
     def __str__(self):
         return repr(self)
 
-    def render(self, context, db=None, safe_mode=False, extra_context=None):
+    def render(self, context, db=None, safe_mode=False, extra_context=None, output_index=None):
         """Renders the given context using the specified database, returning a dictionary
         containing path segments and rendered view contents."""
         if not db:
@@ -284,27 +555,135 @@ class StatikComplexViewRenderer(StatikViewRenderer):
                 context=self.error_context
             )
         rendered_views = dict()
-        path_instances = db.query(self.path.query, safe_mode=safe_mode)
-        extra_ctx = copy(extra_context) if extra_context else dict()
+        page_contexts = self.page_contexts(
+            context,
+            db,
+            safe_mode=safe_mode,
+            extra_context=extra_context,
+            output_index=output_index
+        )
+        if self.stream:
+            rendered_pages = (
+                (inst_path, self.render_streamed(ctx)) for inst_path, ctx in page_contexts
+            )
+        else:
+            # all of the view's pages are rendered as a single batch
+            rendered_pages = self.template.render_many(page_contexts)
+
+        for inst_path, rendered_view in rendered_pages:
+            rendered_views = deep_merge_dict(
+                rendered_views,
+                dict_from_path(inst_path, final_value=rendered_view)
+            )
+        return rendered_views
 
-        for inst in path_instances:
-            extra_ctx.update({
-                self.path.variable: inst
-            })
+    def page_contexts(self, context, db, safe_mode=False, extra_context=None, output_index=None):
+        """Yields an (output path, context) pair for each of the pages to be rendered. Pages are
+        rendered as they're yielded."""
+        for inst, position in self.path.sequenced_instances(db, safe_mode=safe_mode):
+            # only the instance's own variables are layered over the (shared) extra context
+            inst_ctx = {self.path.variable: inst}
+            if position is not None:
+                inst_ctx[self.path.sequence_variable] = position
+            extra_ctx = layer_context(inst_ctx, extra_context)
             ctx = context.build(
                 db=db,
                 safe_mode=safe_mode,
                 for_each_inst=inst,
                 extra=extra_ctx
             )
-            inst_path = self.path.render(inst=inst, context=ctx)
-            rendered_view = self.template.render(ctx)
+            if db.records is not None:
+                ctx = db.records.convert_context(ctx)
+            inst_path = self.path.render(inst=ctx[self.path.variable], context=ctx)
+            if output_index is not None:
+                output_index.add(self.view_name, self.path.reverse(inst_path), inst)
+            yield inst_path, ctx
+            # when streaming, don't keep instances around once their pages have been rendered
+            # (unless they're still needed as other instances' neighbours in a sequence)
+            if self.path.yield_per and self.path.sequence is None:
+                for item in (inst.items if isinstance(inst, Page) else [inst]):
+                    db.release(item)
+
+
+class StatikFeedViewRenderer(StatikViewRenderer):
+    """Renderer for feed views, which natively generate Atom, RSS or JSON feeds instead of
+    rendering a template. Simple paths generate a single feed from the feed's query, whereas
+    taxonomy and archive paths generate one feed per term/bucket (from a single grouped pass)."""
+
+    def __init__(self, path, feed, view_name=None, error_context=None):
+        error_context = error_context or StatikErrorContext()
+        if isinstance(path, StatikViewComplexPath) and \
+                (path.source == 'for-each' or path.items_per_page or path.sequence is not None):
+            raise InvalidViewFieldTypeError(
+                "path",
+                "a simple path, or a taxonomy or archive path without pagination or sequencing",
+                view_name=view_name,
+                context=error_context
+            )
+        if isinstance(path, StatikViewSimplePath) and feed.query is None:
+            raise MissingViewFieldError(
+                "feed.query",
+                view_name=view_name,
+                context=error_context
+            )
+        super(StatikFeedViewRenderer, self).__init__(
+            path,
+            None,
+            view_name=view_name,
+            error_context=error_context
+        )
+        self.feed = feed
+
+    def __repr__(self):
+        return "StatikFeedViewRenderer(path=%s, feed=%s)" % (self.path, self.feed)
+
+    def __str__(self):
+        return repr(self)
+
+    def render(self, context, db=None, safe_mode=False, extra_context=None, output_index=None):
+        if not db:
+            raise MissingParameterError(
+                "db",
+                context=self.error_context
+            )
+        rendered_views = dict()
+        # serialized entries, shared amongst all of this view's feeds (there's no need to cache
+        # the entries of a single feed, which are each only serialized once)
+        entry_cache = None
+
+        if isinstance(self.path, StatikViewSimplePath):
+            ctx = context.build(db=db, safe_mode=safe_mode, extra=extra_context)
+            feeds = [(None, self.path.render(), db.query(self.feed.query, safe_mode=safe_mode), ctx)]
+        else:
+            entry_cache = dict()
+            feeds = self.complex_feeds(context, db, safe_mode=safe_mode, extra_context=extra_context)
+
+        for group, feed_path, items, ctx in feeds:
+            if output_index is not None:
+                output_index.add(self.view_name, self.path.reverse(feed_path), group)
             rendered_views = deep_merge_dict(
                 rendered_views,
-                dict_from_path(inst_path, final_value=rendered_view)
+                dict_from_path(
+                    feed_path,
+                    final_value=StreamedOutput(
+                        self.feed.generate,
+                        self.feed.select_entries(items),
+                        self.path.reverse(feed_path),
+                        ctx,
+                        entry_cache
+                    )
+                )
             )
         return rendered_views
 
+    def complex_feeds(self, context, db, safe_mode=False, extra_context=None):
+        """Yields a (group, feed path, items, context) tuple for each of the taxonomy terms or
+        archive buckets of this view's path."""
+        for group in self.path.instances(db, safe_mode=safe_mode):
+            extra_ctx = layer_context({self.path.variable: group}, extra_context)
+            ctx = context.build(db=db, safe_mode=safe_mode, for_each_inst=group, extra=extra_ctx)
+            yield group, self.path.render(inst=group, context=ctx), group.items, ctx
+
 
 class StatikView(YamlLoadable):
     """Our primary view interface, which renders data using templates."""
@@ -329,6 +708,16 @@ class StatikView(YamlLoadable):
             raise MissingParameterError("name", context=self.error_context)
         if 'path' not in self.vars or not self.vars['path']:
             raise MissingParameterError("path", context=self.error_context)
+        # feed views natively generate feeds, and therefore don't need templates
+        self.feed = None
+        if 'feed' in self.vars:
+            self.feed = StatikFeed(
+                self.vars['feed'],
+                template_engine,
+                view_name=self.name,
+                error_context=self.error_context
+            )
+            default_output_ext = FEED_FORMATS[self.feed.format]
         self.path = StatikViewPath.create(
             self.vars['path'],
             template_engine=template_engine,
@@ -344,15 +733,32 @@ class StatikView(YamlLoadable):
             for_each=pre_context.get('for-each', None)
         )
 
+        # the sequence variable would otherwise silently override the view's own context variable
+        if isinstance(self.path, StatikViewComplexPath) and self.path.sequence is not None and \
+                self.path.sequence_variable in self.get_context_variables():
+            raise InvalidViewFieldTypeError(
+                "sequence.variable",
+                "a variable name not already used by the view's context (\"%s\" is)" % (
+                    self.path.sequence_variable
+                ),
+                view_name=self.name,
+                context=self.error_context
+            )
+
         if models is None:
             raise MissingParameterError("models", context=self.error_context)
         # keep a reference to the models
         self.models = models
+        # reverse URLs, indexed by instance primary key, so each instance's path is only rendered
+        # once per build, no matter how many pages link to it
+        self.url_table = dict()
 
         # if no template was explicitly supplied, we need a template engine with which to
         # load templates
         self.template_engine = template_engine
-        if not template:
+        if self.feed is not None:
+            self.template = None
+        elif not template:
             if not template_engine:
                 raise MissingParameterError(
                     "template_engine", "template",
@@ -367,11 +773,39 @@ class StatikView(YamlLoadable):
                 self.vars['template']
             )
 
-        self.renderer = StatikViewRenderer.create(
-            self.path,
-            self.template,
-            view_name=self.name
-        )
+        # very large pages can be rendered in chunks, directly into their output files
+        self.stream = self.vars.get('stream', False)
+        if not isinstance(self.stream, bool):
+            raise InvalidViewFieldTypeError(
+                "stream",
+                "true or false",
+                view_name=self.name,
+                context=self.error_context
+            )
+        # streamed pages are only rendered once they're written, by which time the instances
+        # of views with streamed queries would have been released
+        if self.stream and isinstance(self.path, StatikViewComplexPath) and self.path.yield_per:
+            raise InvalidViewFieldTypeError(
+                "stream",
+                "false for views whose paths use yield-per",
+                view_name=self.name,
+                context=self.error_context
+            )
+
+        if self.feed is not None:
+            self.renderer = StatikFeedViewRenderer(
+                self.path,
+                self.feed,
+                view_name=self.name,
+                error_context=self.error_context
+            )
+        else:
+            self.renderer = StatikViewRenderer.create(
+                self.path,
+                self.template,
+                view_name=self.name,
+                stream=self.stream
+            )
 
         logger.debug('%s', self)
 
@@ -383,24 +817,39 @@ class StatikView(YamlLoadable):
     def __str__(self):
         return repr(self)
 
-    def process(self, db, safe_mode=False, extra_context=None):
+    def get_context_variables(self):
+        """Returns the names of the variables defined by this view's context (and path)."""
+        names = set(self.context.initial) | set(self.context.static) | set(self.context.dynamic) | \
+            set(self.context.for_each)
+        if isinstance(self.path, StatikViewComplexPath):
+            names.add(self.path.variable)
+        return names
+
+    def process(self, db, safe_mode=False, extra_context=None, output_index=None):
         """Deprecated. Rather use StatikView.render()."""
         return self.renderer.render(
             self.context,
             db,
             safe_mode=safe_mode,
-            extra_context=extra_context
+            extra_context=extra_context,
+            output_index=output_index
         )
 
-    def render(self, db, safe_mode=False, extra_context=None):
+    def render(self, db, safe_mode=False, extra_context=None, output_index=None):
         """Renders this view, given the specified StatikDatabase instance."""
         return self.renderer.render(
             self.context,
             db,
             safe_mode=safe_mode,
-            extra_context=extra_context
+            extra_context=extra_context,
+            output_index=output_index
         )
 
     def reverse_url(self, inst=None):
         """Returns the reverse lookup URL for this view."""
-        return self.path.render_reverse(inst=inst)
+        key = get_url_table_key(inst)
+        if key is UNCACHEABLE_URL:
+            return self.path.render_reverse(inst=inst)
+        if key not in self.url_table:
+            self.url_table[key] = self.path.render_reverse(inst=inst)
+        return self.url_table[key]
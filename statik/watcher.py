@@ -56,6 +56,11 @@ def watch(project_path, output_path, host='0.0.0.0', port=8000, min_reload_time=
     if os.path.exists(template_tags_folder) and os.path.isdir(template_tags_folder):
         watch_folders.append(StatikProject.TEMPLATETAGS_DIR)
 
+    # as well as the derived field functions folder
+    derived_folder = os.path.join(project.path, StatikProject.DERIVED_DIR)
+    if os.path.exists(derived_folder) and os.path.isdir(derived_folder):
+        watch_folders.append(StatikProject.DERIVED_DIR)
+
     # if theming is enabled, watch the specific theme's folder for changes
     if project.config.theme is not None:
         watch_folders.append(os.path.join(StatikProject.THEMES_DIR, project.config.theme))
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import os
+import os.path
+import shutil
+import tempfile
+import unittest
+
+from statik.project import StatikProject
+from statik.templating import StatikCompiledTemplateLoader
+
+
+class TestCompiledTemplates(unittest.TestCase):
+
+    def setUp(self):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.temp_path = tempfile.mkdtemp()
+        self.project_path = os.path.join(self.temp_path, 'data-themed')
+        shutil.copytree(os.path.join(test_path, 'data-themed'), self.project_path)
+        self.config_path = os.path.join(self.project_path, 'config-theme1.yml')
+        self.cache_path = os.path.join(self.temp_path, 'cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_path)
+
+    def test_compiled_templates(self):
+        expected = StatikProject(self.config_path, cache_path=self.cache_path).generate(in_memory=True)
+        # in-memory builds must not write anything to disk
+        self.assertFalse(os.path.exists(self.cache_path))
+        self.assertFalse(os.path.exists(os.path.join(self.project_path, '.statik-cache')))
+
+        # the theme's three templates (one of which is overridden by the project's own template)
+        self.assertEqual(3, StatikProject(self.config_path, cache_path=self.cache_path).compile_templates())
+        compiled_path = os.path.join(self.cache_path, 'compiled-templates')
+        # along with the file identifying the versions/extensions they were compiled with
+        self.assertEqual(4, len(os.listdir(compiled_path)))
+
+        project = StatikProject(self.config_path, cache_path=self.cache_path)
+        self.assertEqual(expected, project.generate(in_memory=True))
+        loader = project.template_engine.get_provider('jinja2').env.loader
+        self.assertIsInstance(loader, StatikCompiledTemplateLoader)
+        # source files are resolved through the engine's template index, in order of precedence
+        self.assertEqual(
+            os.path.join(self.project_path, 'templates', 'override-me.html'),
+            loader.find_source_filename('override-me.html')
+        )
+        self.assertIsNone(loader.find_source_filename('nonexistent.html'))
+
+    def test_stale_compiled_templates(self):
+        StatikProject(self.config_path, cache_path=self.cache_path).compile_templates()
+        template_path = os.path.join(self.project_path, 'templates', 'override-me.html')
+        with open(template_path, 'rt') as f:
+            source = f.read()
+        with open(template_path, 'wt') as f:
+            f.write(source.replace('I win all the things!', 'Changed after compiling'))
+        # make sure the source is newer than its compiled module
+        mtime = os.path.getmtime(template_path) + 10
+        os.utime(template_path, (mtime, mtime))
+
+        output_data = StatikProject(self.config_path, cache_path=self.cache_path).generate(in_memory=True)
+        self.assertIn('Changed after compiling', output_data['override-me']['index.html'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+import os.path
+import unittest
+
+from statik.generator import generate
+
+# these pages contain randomly generated Lorem Ipsum text
+NON_DETERMINISTIC_PAGES = {
+    'index.html',
+    'mlalchemy/posts/index.html',
+}
+
+
+def flatten_output(output, prefix=''):
+    result = dict()
+    for k, v in output.items():
+        if isinstance(v, dict):
+            result.update(flatten_output(v, prefix='%s%s/' % (prefix, k)))
+        else:
+            result['%s%s' % (prefix, k)] = v
+    return result
+
+
+class TestRenderRecords(unittest.TestCase):
+
+    def test_records_render_identically(self):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        expected = flatten_output(generate(
+            os.path.join(test_path, 'data-simple'),
+            in_memory=True
+        ))
+        actual = flatten_output(generate(
+            os.path.join(test_path, 'data-simple', 'config-records.yml'),
+            in_memory=True
+        ))
+
+        self.assertEqual(sorted(expected.keys()), sorted(actual.keys()))
+        for path, content in expected.items():
+            if path not in NON_DETERMINISTIC_PAGES:
+                self.assertEqual(content, actual[path], "Mismatched content for %s" % path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+# -*- coding:utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from jinja2 import Environment, DictLoader
+
+from statik.templating import StatikBytecodeCache, compile_template_string
+
+
+class TestStatikBytecodeCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_path)
+
+    def create_env(self, templates=None, extensions=None, max_size=None):
+        bcc = StatikBytecodeCache(self.cache_path, extensions=extensions)
+        if max_size is not None:
+            bcc.max_size = max_size
+        return bcc, Environment(
+            loader=DictLoader(templates or dict()),
+            bytecode_cache=bcc,
+            extensions=extensions or []
+        )
+
+    def test_string_templates(self):
+        bcc, env = self.create_env()
+        self.assertEqual("Hello world", compile_template_string(env, "Hello {{ name }}").render(name="world"))
+        self.assertEqual((0, 1), (bcc.hits, bcc.misses))
+
+        # a fresh environment (i.e. a subsequent build) must use the cached bytecode
+        bcc, env = self.create_env()
+        self.assertEqual("Hello again", compile_template_string(env, "Hello {{ name }}").render(name="again"))
+        compile_template_string(env, "Goodbye {{ name }}")
+        self.assertEqual((1, 1), (bcc.hits, bcc.misses))
+
+        # different extensions must not share compiled templates
+        bcc, env = self.create_env(extensions=['jinja2.ext.do'])
+        compile_template_string(env, "Hello {{ name }}")
+        self.assertEqual((0, 1), (bcc.hits, bcc.misses))
+
+    def test_loaded_templates(self):
+        bcc, env = self.create_env({'page.html': "<p>{{ content }}</p>"})
+        env.get_template('page.html')
+        bcc, env = self.create_env({'page.html': "<p>{{ content }}</p>"})
+        self.assertEqual("<p>hi</p>", env.get_template('page.html').render(content="hi"))
+        self.assertEqual((1, 0), (bcc.hits, bcc.misses))
+
+        # changed templates must be recompiled
+        bcc, env = self.create_env({'page.html': "<div>{{ content }}</div>"})
+        self.assertEqual("<div>hi</div>", env.get_template('page.html').render(content="hi"))
+        self.assertEqual((0, 1), (bcc.hits, bcc.misses))
+
+    def test_eviction(self):
+        bcc, env = self.create_env()
+        for i in range(5):
+            compile_template_string(env, "Template %d: {{ value }}" % i)
+            # make sure that the entries' last usage times differ
+            for filename in os.listdir(self.cache_path):
+                path = os.path.join(self.cache_path, filename)
+                os.utime(path, (os.path.getmtime(path) - 10, os.path.getmtime(path) - 10))
+        self.assertEqual(5, len(os.listdir(self.cache_path)))
+
+        entry_size = os.path.getsize(os.path.join(self.cache_path, os.listdir(self.cache_path)[0]))
+        bcc.max_size = entry_size * 2
+        self.assertEqual(3, bcc.evict())
+        self.assertEqual(2, len(os.listdir(self.cache_path)))
+
+        # the most recently used entries must have been kept
+        bcc, env = self.create_env()
+        compile_template_string(env, "Template 4: {{ value }}")
+        self.assertEqual(1, bcc.hits)
+
+    def test_eviction_during_build(self):
+        bcc, env = self.create_env()
+        compile_template_string(env, "Template 0: {{ value }}")
+        entry_size = os.path.getsize(os.path.join(self.cache_path, os.listdir(self.cache_path)[0]))
+
+        # the cache must never grow beyond its maximum size, even within a single build
+        bcc, env = self.create_env(max_size=entry_size * 3)
+        for i in range(1, 10):
+            compile_template_string(env, "Template %d: {{ value }}" % i)
+            self.assertLessEqual(len(os.listdir(self.cache_path)), 3)
+        self.assertLessEqual(bcc.size, bcc.max_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 # -*- coding:utf-8 -*-
 import unittest
 
-from statik.context import StatikContext
+from statik.context import StatikContext, StatikContextLayer, layer_context, context_layers
 from statik.database import StatikDatabase
 
 
@@ -14,3 +14,22 @@ class TestStatikContext(unittest.TestCase):
 
         result = context.build(db=StatikDatabase(models={}, data_path=''), extra={'my_var': 5})
         assert result.get('render_elm') is False
+
+    def test_layered_context(self):
+        context = StatikContext(initial={'title': 'Initial', 'a': 1}, static={'title': 'Static', 'b-var': 2})
+        project_context = StatikContextLayer({'title': 'Project', 'c': 3})
+        result = context.build(extra=layer_context({'title': 'Instance'}, project_context))
+        self.assertEqual(
+            {'title': 'Instance', 'a': 1, 'b_var': 2, 'c': 3},
+            dict(result)
+        )
+        # the shared layers must be stacked as-is, rather than being copied
+        layers = context_layers(result)
+        self.assertIs(project_context, layers[2])
+        self.assertIs(context.static, layers[3])
+        self.assertIs(context.initial, layers[4])
+
+        # setting variables on a built context must leave its layers untouched
+        result['c'] = 4
+        self.assertEqual(4, result['c'])
+        self.assertEqual(3, project_context['c'])
@@ -6,6 +6,7 @@ import logging
 
 from statik.models import *
 from statik.database import *
+from statik.errors import ReadOnlyDatabaseError
 
 ADDRESS_MODEL = """street: String
 postal_code: String
@@ -145,6 +146,39 @@ class TestStatikDatabase(unittest.TestCase):
         self.assertEqual(
             ['fireplace', 'single-bed', 'shower'], redroom_tags)
 
+    def test_read_only_render_session(self):
+        data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data_test_database')
+        db = StatikDatabase(data_path, MOCK_MODELS)
+        try:
+            Address = db.tables['Address']
+            self.assertFalse(db.session.autoflush)
+
+            with self.assertRaises(ReadOnlyDatabaseError):
+                db.session.add(Address(pk='somewhere', street='Some Street'))
+
+            address = db.session.query(Address).filter(Address.pk == 'washington').one()
+            with self.assertRaises(ReadOnlyDatabaseError):
+                address.street = 'Another Street'
+            self.assertNotIn(address, db.session.dirty)
+
+            Guesthouse = db.tables['Guesthouse']
+            guesthouse = db.session.query(Guesthouse).filter(Guesthouse.pk == 'redcottage').one()
+            with self.assertRaises(ReadOnlyDatabaseError):
+                guesthouse.rooms.remove(guesthouse.rooms[0])
+
+            # repeated queries must reuse their compiled forms
+            query = {'from': 'Address', 'order-by': ['street']}
+            self.assertEqual(
+                [a.pk for a in db.query(query)],
+                [a.pk for a in db.query(query)]
+            )
+            self.assertEqual(1, len(db.mlalchemy_queries))
+            self.assertEqual(2, len(db.query("session.query(Address).all()")))
+            self.assertEqual(2, len(db.query("session.query(Address).all()")))
+            self.assertEqual(1, len(db.compiled_queries))
+        finally:
+            db.shutdown()
+
     def assertInstanceEqual(self, expected, inst):
         for field_name, field_value in expected.items():
             self.assertEqual(field_value, getattr(inst, field_name))
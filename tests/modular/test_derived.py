@@ -0,0 +1,111 @@
+# -*- coding:utf-8 -*-
+
+import os.path
+import unittest
+
+from statik.derived import *
+from statik.models import StatikModel
+from statik.database import StatikDatabase
+from statik.errors import ModelError, InvalidFieldTypeError
+
+from tests.modular.test_database import MOCK_MODELS, MOCK_MODEL_NAMES
+
+GUESTHOUSE_MODEL_WITH_DERIVED_FIELDS = """guesthouse-name: String
+address: Text
+slug: String <- slug(guesthouse-name)
+address-words: Integer <- word_count(address)
+summary: String <- excerpt(address, 3, '...')
+"""
+
+
+@register.function
+def shout(text):
+    return text.upper()
+
+
+class TestStatikDerivedFields(unittest.TestCase):
+
+    def test_derivation_parsing(self):
+        derivation = StatikFieldDerivation("excerpt(content, 30, ' [more]')")
+        self.assertEqual('excerpt', derivation.function_name)
+        self.assertEqual([(True, 'content'), (False, 30), (False, ' [more]')], derivation.args)
+        self.assertEqual(['content'], derivation.field_names)
+        self.assertEqual(['published_on'], StatikFieldDerivation("year(published-on)").field_names)
+        # quoted arguments may contain commas, and quoted identifiers aren't field names
+        derivation = StatikFieldDerivation("excerpt(content, 30, \", and more\", 'title', true)")
+        self.assertEqual(
+            [(True, 'content'), (False, 30), (False, ', and more'), (False, 'title'), (False, True)],
+            derivation.args
+        )
+        self.assertEqual([], StatikFieldDerivation("now()").args)
+
+        with self.assertRaises(ValueError):
+            StatikFieldDerivation("excerpt")
+        with self.assertRaises(ValueError):
+            StatikFieldDerivation("excerpt(content,)")
+
+    def test_builtin_functions(self):
+        html = "<p>Some <b>bold</b> text</p>\n<p>and %s</p>" % " ".join(["word"] * 400)
+        self.assertEqual(404, StatikFieldDerivation("word_count(content)").compute({'content': html}))
+        self.assertEqual(3, StatikFieldDerivation("reading_time(content)").compute({'content': html}))
+        self.assertEqual(0, StatikFieldDerivation("reading_time(content)").compute({}))
+        self.assertEqual(
+            "Some bold text...",
+            StatikFieldDerivation("excerpt(content, 3)").compute({'content': html})
+        )
+        self.assertEqual(
+            "hello-world",
+            StatikFieldDerivation("slug(title)").compute({'title': "Hello, World!"})
+        )
+
+    def test_parallel_computation(self):
+        derivation = StatikFieldDerivation("shout(title)")
+        rows = [{'title': 'title %d' % i} for i in range(1000)]
+        expected = ['TITLE %d' % i for i in range(1000)]
+        self.assertEqual(expected, compute_derived_values(derivation, rows))
+        self.assertEqual(expected, compute_derived_values(derivation, rows, workers=2))
+
+        with self.assertRaises(ValueError):
+            compute_derived_values(StatikFieldDerivation("whisper(title)"), rows)
+
+    def test_invalid_derived_fields(self):
+        with self.assertRaises(InvalidFieldTypeError):
+            StatikModel(
+                name='Guesthouse',
+                from_string="rooms: GuesthouseRoom[] <- shout(pk)\n",
+                model_names=MOCK_MODEL_NAMES
+            )
+        with self.assertRaises(ModelError):
+            StatikModel(
+                name='Guesthouse',
+                from_string="slug: String <- slug(name)\n",
+                model_names=MOCK_MODEL_NAMES
+            )
+
+    def test_derived_fields_in_database(self):
+        models = dict(MOCK_MODELS)
+        models['Guesthouse'] = StatikModel(
+            name='Guesthouse',
+            from_string=GUESTHOUSE_MODEL_WITH_DERIVED_FIELDS,
+            model_names=MOCK_MODEL_NAMES
+        )
+        self.assertEqual({'slug', 'address_words', 'summary'}, set(models['Guesthouse'].derived_fields.keys()))
+
+        data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data_test_database')
+        db = StatikDatabase(data_path, models)
+        try:
+            Guesthouse = db.tables['Guesthouse']
+            guesthouses = db.session.query(Guesthouse).order_by(Guesthouse.slug).all()
+            self.assertEqual(
+                [
+                    ('firefly', 'firefly', 7, 'Some long address...'),
+                    ('redcottage', 'red-cottage', 8, 'This is where...'),
+                ],
+                [(g.pk, g.slug, g.address_words, g.summary) for g in guesthouses]
+            )
+        finally:
+            db.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
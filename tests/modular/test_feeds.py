@@ -0,0 +1,215 @@
+# -*- coding:utf-8 -*-
+
+import os.path
+import json
+import unittest
+import xml.etree.ElementTree as ET
+
+from sqlalchemy import event
+
+from statik.views import StatikView
+from statik.database import StatikDatabase
+from statik.outputs import StatikOutputIndex, StreamedOutput
+from statik.errors import InvalidViewFieldTypeError, MissingViewFieldError
+
+from tests.modular.test_database import MOCK_MODELS
+from tests.modular.test_jinja2_views import MockStatikTemplateEngine
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+
+TEST_ATOM_FEED_VIEW = """path: /bookings/feed.xml
+feed:
+  format: atom
+  title: All bookings
+  site-url: https://example.com/
+  query: session.query(Booking)
+  order-by: -from-date
+  entry:
+    link: /bookings/{{ entry.pk }}/
+    title: guest.first-name
+    date: from-date
+    summary: room.room-name
+"""
+
+TEST_RSS_FEED_VIEW = """path: /bookings/rss.xml
+feed:
+  format: rss
+  title: Latest booking
+  site-url: https://example.com
+  query: session.query(Booking)
+  order-by: -from-date
+  limit: 1
+  entry:
+    link: /bookings/{{ entry.pk }}/
+    title: guest.first-name
+    date: from-date
+    content: room.room-name
+    author: guest.first-name
+"""
+
+TEST_UNDATED_FEED_VIEW = """path: /rooms/feed.xml
+feed:
+  title: All rooms
+  site-url: https://example.com
+  query: session.query(GuesthouseRoom)
+  entry:
+    link: /rooms/{{ entry.pk }}/
+    title: room-name
+"""
+
+TEST_TAG_FEEDS_VIEW = """path:
+  template: /tags/{{ tag.pk }}/
+  taxonomy:
+    tag:
+      field: GuesthouseRoom.tags
+      order-by: room-name
+feed:
+  format: json
+  title: "Rooms with: {{ tag.tag }}"
+  site-url: https://example.com
+  entry:
+    link: https://rooms.example.com/{{ entry.pk }}/
+    title: room-name
+"""
+
+TEST_INVALID_FEED_VIEW = """path: /feed.xml
+feed:
+  title: Missing query
+  site-url: https://example.com
+  entry:
+    link: /{{ entry.pk }}/
+"""
+
+TEST_FOR_EACH_FEED_VIEW = """path:
+  template: /guests/{{ guest.pk }}/
+  for-each:
+    guest: session.query(Guest)
+feed:
+  title: Invalid
+  site-url: https://example.com
+  entry:
+    link: /{{ entry.pk }}/
+"""
+
+
+class TestStatikFeeds(unittest.TestCase):
+
+    def setUp(self):
+        data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data_test_database')
+        self.db = StatikDatabase(data_path, MOCK_MODELS)
+        self.engine = MockStatikTemplateEngine(templates_dict={})
+
+    def tearDown(self):
+        self.db.shutdown()
+
+    def create_view(self, s, name='feed'):
+        return StatikView(from_string=s, name=name, models=MOCK_MODELS, template_engine=self.engine)
+
+    def test_atom_feed(self):
+        output_index = StatikOutputIndex()
+        rendered = self.create_view(TEST_ATOM_FEED_VIEW).render(
+            self.db,
+            extra_context={'base_path': '/blog/'},
+            output_index=output_index
+        )
+        self.assertIsInstance(rendered['bookings']['feed.xml'], StreamedOutput)
+        self.assertEqual(['/bookings/feed.xml'], list(dict(output_index.urls()).keys()))
+
+        feed = ET.fromstring(str(rendered['bookings']['feed.xml']))
+        self.assertEqual('All bookings', feed.find(ATOM + 'title').text)
+        self.assertEqual('https://example.com/blog/bookings/feed.xml', feed.find(ATOM + 'id').text)
+        self.assertEqual('2016-08-02T00:00:00+00:00', feed.find(ATOM + 'updated').text)
+        entries = feed.findall(ATOM + 'entry')
+        self.assertEqual(
+            ['https://example.com/bookings/2/', 'https://example.com/bookings/1/'],
+            [entry.find(ATOM + 'id').text for entry in entries]
+        )
+        self.assertEqual('Michael', entries[0].find(ATOM + 'title').text)
+        self.assertEqual('Blue Room', entries[0].find(ATOM + 'summary').text)
+
+    def test_streamed_entries(self):
+        view = self.create_view(TEST_ATOM_FEED_VIEW)
+        output = view.render(self.db)['bookings']['feed.xml']
+        serialized = []
+        serialize = view.feed.serialize_atom_entry
+        view.feed.serialize_atom_entry = lambda entry: serialized.append(entry.url) or serialize(entry)
+
+        # entries must only be serialized as they're generated, rather than all up front
+        entry_chunks = 0
+        for chunk in view.feed.generate(*output.args):
+            if chunk.startswith('<entry>'):
+                entry_chunks += 1
+            self.assertEqual(entry_chunks, len(serialized))
+        self.assertEqual(2, entry_chunks)
+
+    def test_rss_feed(self):
+        rendered = self.create_view(TEST_RSS_FEED_VIEW).render(self.db)
+        channel = ET.fromstring(str(rendered['bookings']['rss.xml'])).find('channel')
+        items = channel.findall('item')
+        self.assertEqual(1, len(items))
+        self.assertEqual('https://example.com/bookings/2/', items[0].find('link').text)
+        self.assertEqual('Tue, 02 Aug 2016 00:00:00 +0000', items[0].find('pubDate').text)
+        self.assertEqual(
+            'Blue Room',
+            items[0].find('{http://purl.org/rss/1.0/modules/content/}encoded').text
+        )
+        # author names aren't e-mail addresses, and therefore aren't RSS <author> elements
+        self.assertIsNone(items[0].find('author'))
+        self.assertEqual('Michael', items[0].find('{http://purl.org/dc/elements/1.1/}creator').text)
+
+    def test_query_entries(self):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(self.db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            rendered = self.create_view(TEST_RSS_FEED_VIEW).render(self.db)
+        finally:
+            event.remove(self.db.engine, 'before_cursor_execute', before_cursor_execute)
+        # the feed's entries must be ordered and limited by the database
+        self.assertEqual(1, len([statement for statement in statements if 'LIMIT' in statement]))
+        self.assertIn('ORDER BY', statements[0])
+        channel = ET.fromstring(str(rendered['bookings']['rss.xml'])).find('channel')
+        self.assertEqual(
+            ['https://example.com/bookings/2/'],
+            [item.find('link').text for item in channel.findall('item')]
+        )
+
+    def test_undated_feed(self):
+        rendered = self.create_view(TEST_UNDATED_FEED_VIEW).render(self.db)
+        output = str(rendered['rooms']['feed.xml'])
+        # feeds must be the same every time they're generated
+        rendered = self.create_view(TEST_UNDATED_FEED_VIEW).render(self.db)
+        self.assertEqual(output, str(rendered['rooms']['feed.xml']))
+        feed = ET.fromstring(output)
+        self.assertIsNone(feed.find(ATOM + 'updated'))
+        self.assertEqual(2, len(feed.findall(ATOM + 'entry')))
+
+    def test_per_term_feeds(self):
+        rendered = self.create_view(TEST_TAG_FEEDS_VIEW).render(self.db)['tags']
+        self.assertEqual(
+            {'balcony', 'double-bed', 'fireplace', 'shower', 'single-bed'},
+            set(rendered.keys())
+        )
+        feed = json.loads(str(rendered['fireplace']['index.json']))
+        self.assertEqual('Rooms with: Fireplace', feed['title'])
+        self.assertEqual('https://example.com/tags/fireplace/index.json', feed['feed_url'])
+        self.assertEqual(['Blue Room', 'Red Room'], [item['title'] for item in feed['items']])
+        self.assertEqual('https://rooms.example.com/redcottage-blueroom/', feed['items'][0]['url'])
+
+        # each room's entry must only be serialized once, across all of the tags' feeds
+        entry_cache = rendered['shower']['index.json'].args[3]
+        self.assertIs(entry_cache, rendered['balcony']['index.json'].args[3])
+        self.assertEqual(2, len(entry_cache))
+
+    def test_invalid_feeds(self):
+        with self.assertRaises(MissingViewFieldError):
+            self.create_view(TEST_INVALID_FEED_VIEW)
+        with self.assertRaises(InvalidViewFieldTypeError):
+            self.create_view(TEST_FOR_EACH_FEED_VIEW)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+# -*- coding:utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from jinja2 import Environment, DictLoader
+
+from statik.fragments import StatikFragmentCache, get_fingerprint
+
+TEST_TEMPLATES = {
+    'page.html': "{% cache 'nav', categories %}<nav>{{ categories|join(',') }} {{ title }}</nav>" +
+                 "{% endcache %}<h1>{{ title }}</h1>",
+    'changed.html': "{% cache 'nav', categories %}<ul>{{ categories|join(',') }}</ul>{% endcache %}",
+    'included.html': "{% cache 'nav' %}{% include 'nav.html' %}{% endcache %}",
+    'nav.html': "{% include 'nav-items.html' %}",
+    'nav-items.html': "OLD NAV",
+    'unsupported.html': "{% cache 'nav', thing %}{{ title }}{% endcache %}",
+}
+
+
+class TestStatikFragmentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_path)
+
+    def create_env(self, persist=True, templates=None):
+        env = Environment(
+            loader=DictLoader(templates or TEST_TEMPLATES),
+            extensions=['statik.jinja2ext.StatikFragmentCacheExtension']
+        )
+        env.statik_fragment_cache = StatikFragmentCache(self.cache_path if persist else None)
+        return env, env.statik_fragment_cache
+
+    def test_fragment_cache(self):
+        env, cache = self.create_env()
+        template = env.get_template('page.html')
+        self.assertEqual(
+            "<nav>a,b First</nav><h1>First</h1>",
+            template.render(title="First", categories=['a', 'b'])
+        )
+        # the fragment is only rendered again when the data on which it depends changes
+        self.assertEqual(
+            "<nav>a,b First</nav><h1>Second</h1>",
+            template.render(title="Second", categories=['a', 'b'])
+        )
+        self.assertEqual(
+            "<nav>a,c Third</nav><h1>Third</h1>",
+            template.render(title="Third", categories=['a', 'c'])
+        )
+        self.assertEqual((1, 2), (cache.hits, cache.misses))
+        self.assertAlmostEqual(1.0 / 3.0, cache.hit_rate)
+
+        # a different template with the same key and dependencies must not share the fragment
+        self.assertEqual("<ul>a,b</ul>", env.get_template('changed.html').render(categories=['a', 'b']))
+
+        # persisted fragments must be reused by subsequent builds
+        env, cache = self.create_env()
+        self.assertEqual(
+            "<nav>a,b First</nav><h1>Fourth</h1>",
+            env.get_template('page.html').render(title="Fourth", categories=['a', 'b'])
+        )
+        self.assertEqual((1, 0), (cache.hits, cache.misses))
+        # ...and those not used by a build must be removed
+        self.assertEqual(3, len(os.listdir(self.cache_path)))
+        self.assertEqual(2, cache.close())
+        self.assertEqual(1, len(os.listdir(self.cache_path)))
+
+    def test_in_memory_fragment_cache(self):
+        env, cache = self.create_env(persist=False)
+        env.get_template('page.html').render(title="First", categories=['a'])
+        env.get_template('page.html').render(title="Second", categories=['a'])
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+        self.assertEqual([], os.listdir(self.cache_path))
+
+    def test_edited_include(self):
+        env, cache = self.create_env()
+        self.assertEqual("OLD NAV", env.get_template('included.html').render())
+
+        # changes to (indirectly) included templates must invalidate persisted fragments
+        templates = dict(TEST_TEMPLATES)
+        templates['nav-items.html'] = "NEW NAV"
+        env, cache = self.create_env(templates=templates)
+        self.assertEqual("NEW NAV", env.get_template('included.html').render())
+        self.assertEqual((0, 1), (cache.hits, cache.misses))
+
+    def test_unsupported_dependencies(self):
+        env, cache = self.create_env()
+        template = env.get_template('unsupported.html')
+        # fragments whose dependencies can't be fingerprinted must never be cached
+        with self.assertLogs('statik.jinja2ext', level='WARNING') as logs:
+            self.assertEqual("First", template.render(title="First", thing=object()))
+            self.assertEqual("Second", template.render(title="Second", thing=object()))
+        self.assertEqual(1, len(logs.output))
+        self.assertEqual((0, 0), (cache.hits, cache.misses))
+        self.assertEqual([], os.listdir(self.cache_path))
+
+        # ...unlike those with undefined dependencies
+        self.assertEqual("Third", template.render(title="Third"))
+        self.assertEqual("Third", template.render(title="Fourth"))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_fingerprints(self):
+        self.assertEqual(get_fingerprint(['a', {'b': 1, 'c': 2}]), get_fingerprint(['a', {'c': 2, 'b': 1}]))
+        self.assertNotEqual(get_fingerprint(['a', 1]), get_fingerprint(['a', '1']))
+        with self.assertRaises(TypeError):
+            get_fingerprint(['a', object()])
+
+        # generators (and other lazy iterables, like queries) must not be consumed
+        items = (item for item in ['a', 'b'])
+        with self.assertRaises(TypeError):
+            get_fingerprint(items)
+        self.assertEqual(['a', 'b'], list(items))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,13 +3,16 @@
 import os.path
 import unittest
 import xml.etree.ElementTree as ET
+from collections import ChainMap
 
 from statik.views import *
 from statik.utils import add_url_path_component
 from statik.filters import filter_datetime
 from statik.templating import *
+from statik.errors import TemplateError
+from statik.context import StatikContextLayer, layer_context
 
-from jinja2 import Environment, DictLoader
+from jinja2 import Environment, DictLoader, contextfunction
 
 TEST_SIMPLE_VIEW = """path: /
 template: home
@@ -168,6 +171,36 @@ class TestStatikJinja2Views(unittest.TestCase):
         self.assertEqual('rss', parsed.findall('.')[0].tag)
         self.assertEqual('My RSS Feed', parsed.findall('./channel/title')[0].text.strip())
 
+    def test_render_many(self):
+        engine = MockStatikTemplateEngine()
+        template = engine.create_template("{{ title }}: {{ 10 // value }}")
+        contexts = [
+            ('/a/', {'title': 'A', 'value': 2}),
+            ('/b/', ChainMap({'value': 5}, {'title': 'B', 'value': 0})),
+        ]
+        self.assertEqual([('/a/', 'A: 5'), ('/b/', 'B: 2')], list(template.render_many(contexts)))
+
+        # errors must be attributed to the item that failed to render
+        with self.assertRaises(TemplateError) as cm:
+            list(template.render_many(contexts + [('/c/', {'title': 'C', 'value': 0})]))
+        self.assertIn('/c/', str(cm.exception))
+
+    def test_context_not_copied(self):
+        engine = MockStatikTemplateEngine()
+        captured = []
+        engine.provider.env.globals['capture'] = contextfunction(lambda ctx: captured.append(ctx.parent) or '')
+        template = engine.create_template("{{ capture() }}{{ title }} {{ project_name }}")
+        project_context = StatikContextLayer({'project_name': 'Project', 'title': 'Untitled'})
+        context = layer_context({'title': 'Page'}, project_context)
+
+        self.assertEqual('Page Project', template.render(context))
+        self.assertEqual([('/a/', 'Page Project')], list(template.render_many([('/a/', context)])))
+        self.assertEqual('Page Project', ''.join(template.generate(context)))
+        # the shared layers must be passed through to Jinja2 as-is, rather than being copied
+        self.assertEqual(3, len(captured))
+        for parent in captured:
+            self.assertTrue(any(layer is project_context for layer in parent.maps))
+
 
 if __name__ == "__main__":
     unittest.main()
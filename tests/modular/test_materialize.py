@@ -0,0 +1,69 @@
+# -*- coding:utf-8 -*-
+
+import os.path
+import unittest
+
+from statik.database import StatikDatabase
+from statik.errors import ModelError, SafetyViolationError
+
+from tests.modular.test_database import MOCK_MODELS
+
+
+class TestStatikMaterializedTables(unittest.TestCase):
+
+    def setUp(self):
+        self.data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data_test_database')
+
+    def test_materialized_tables(self):
+        db = StatikDatabase(self.data_path, MOCK_MODELS, materialize={
+            'TagCount': "session.query(RoomTag.pk.label('tag'), func.count(GuesthouseRoom.pk).label('room_count'))"
+                        ".join(RoomTag.rooms).group_by(RoomTag.pk).order_by(func.count(GuesthouseRoom.pk).desc(), RoomTag.pk)",
+            'LatestBooking': "session.query(func.max(Booking.from_date).label('from_date')).all()",
+            'EmptyTable': "session.query(Guest.pk.label('guest')).filter(Guest.pk == 'nobody')",
+        })
+        try:
+            TagCount = db.tables['TagCount']
+            counts = db.session.query(TagCount).order_by(TagCount.pk).all()
+            self.assertEqual(
+                [('fireplace', 2), ('shower', 2), ('balcony', 1), ('double-bed', 1), ('single-bed', 1)],
+                [(count.tag, count.room_count) for count in counts]
+            )
+            self.assertEqual([1, 2, 3, 4, 5], [count.pk for count in counts])
+
+            # materialized tables must be queryable from exec() and MLAlchemy queries alike
+            self.assertEqual(
+                ['fireplace', 'shower'],
+                [count.tag for count in db.query("session.query(TagCount).filter(TagCount.room_count > 1).all()")]
+            )
+            self.assertEqual(
+                ['balcony', 'double-bed', 'single-bed'],
+                [count.tag for count in db.query({
+                    'from': 'TagCount',
+                    'where': {'room_count': 1},
+                    'orderBy': 'tag',
+                })]
+            )
+
+            latest = db.session.query(db.tables['LatestBooking']).one()
+            self.assertEqual((2016, 8, 2), (latest.from_date.year, latest.from_date.month, latest.from_date.day))
+            self.assertEqual([], db.session.query(db.tables['EmptyTable']).all())
+        finally:
+            db.shutdown()
+
+    def test_invalid_materialized_tables(self):
+        db = StatikDatabase(self.data_path, MOCK_MODELS)
+        try:
+            with self.assertRaises(ModelError):
+                db.create_materialized_tables({
+                    'Guest': "session.query(Guest.pk.label('guest')).all()",
+                })
+            with self.assertRaises(SafetyViolationError):
+                db.create_materialized_tables({
+                    'GuestNames': "session.query(Guest.first_name).all()",
+                }, safe_mode=True)
+        finally:
+            db.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+# -*- coding:utf-8 -*-
+
+import unittest
+from unittest import mock
+
+import pystache
+
+from statik import mustache
+from statik.mustache import StatikMustacheRenderer, compile_mustache_template
+from statik.templating import StatikMustacheTemplate
+
+PARTIALS = {
+    'item': "<li>{{name}}</li>\n",
+    'list': "<ul>\n  {{#items}}\n  {{>item}}\n  {{/items}}\n</ul>\n",
+}
+
+TEMPLATES = [
+    "Hello {{name}}! {{! a comment }}{{{html}}} {{&html}} {{html}}",
+    "{{#items}}{{name}}, {{/items}}{{^items}}No items{{/items}}",
+    "{{^missing}}Nothing here{{/missing}}{{#person}}{{name}} ({{age}}){{/person}}",
+    "{{#lambda}}Hi {{name}}{{/lambda}} {{person.name}}",
+    "{{=<% %>=}}<% name %> <%#items%><% name %><%/items%>",
+    "<div>\n  {{>list}}\n</div>\n{{>missing}}",
+]
+
+CONTEXT = {
+    'name': "World",
+    'html': "<b>bold</b>",
+    'items': [{'name': "one"}, {'name': "two"}],
+    'person': {'name': "Jane", 'age': 42},
+    'lambda': lambda s: s.upper(),
+}
+
+
+class TestStatikMustacheCompiler(unittest.TestCase):
+
+    def test_compiled_templates(self):
+        renderer = StatikMustacheRenderer(partials=PARTIALS)
+        for template in TEMPLATES:
+            parsed = pystache.parse(template)
+            # compiled templates must render exactly as pystache renders them
+            expected = pystache.Renderer(partials=PARTIALS).render(parsed, CONTEXT)
+            render_fn = compile_mustache_template(parsed)
+            self.assertEqual(expected, renderer.render_compiled(render_fn, CONTEXT), template)
+            self.assertEqual(expected, renderer.render_compiled(render_fn, CONTEXT), template)
+
+        # partials must only be compiled once per indentation, no matter how often they're rendered
+        engine = renderer._make_render_engine()
+        self.assertIs(engine, renderer._make_render_engine())
+        self.assertEqual({('list', '  '), ('item', '    '), ('missing', '')}, set(engine.partials.keys()))
+
+    def test_unsupported_compiler(self):
+        self.assertTrue(mustache.mustache_compiler_supported())
+        # templates must still render through pystache's public API if they can't be compiled
+        with mock.patch.object(mustache, '_compiler_supported', False):
+            renderer = StatikMustacheRenderer(partials=PARTIALS)
+            for template in TEMPLATES:
+                parsed = pystache.parse(template)
+                statik_template = StatikMustacheTemplate(parsed, renderer)
+                self.assertIsNone(statik_template.render_fn)
+                self.assertEqual(
+                    pystache.Renderer(partials=PARTIALS).render(parsed, CONTEXT),
+                    statik_template.do_render(CONTEXT),
+                    template
+                )
+            self.assertIsNone(renderer._engine)
+
+
+if __name__ == "__main__":
+    unittest.main()
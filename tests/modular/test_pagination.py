@@ -11,6 +11,7 @@ class MockDBQuery(object):
         self._items = items
         self._offset = 0
         self._limit = None
+        self.executions = 0
 
     def count(self):
         return len(self._items)
@@ -23,7 +24,12 @@ class MockDBQuery(object):
         self._limit = limit
         return self
 
+    def __iter__(self):
+        self.executions += 1
+        return iter(self._items[self._offset:])
+
     def all(self):
+        self.executions += 1
         limit = (len(self._items) - self._offset) if self._limit is None else self._limit
         return self._items[self._offset:(self._offset + limit)]
 
@@ -116,6 +122,35 @@ class TestStatikPagination(unittest.TestCase):
         self.assertEqual(5, len(page))
         self.assertEqual([i for i in range(95, 100)], page.items)
 
+    def test_lazy_pagination(self):
+        db_query = MockDBQuery([i for i in range(100)])
+        paginator = paginate(db_query, 10, offset=5)
+        # the query's only counted, not executed, up front
+        self.assertEqual(95, paginator.total_items)
+        self.assertEqual(0, db_query.executions)
+        # and individual pages only fetch their own items
+        self.assertEqual([i for i in range(25, 35)], paginator[3].items)
+        self.assertEqual(1, db_query.executions)
+
+    def test_query_executed_once(self):
+        db_query = MockDBQuery([i for i in range(100)])
+        paginator = paginate(db_query, 10, offset=5)
+        self.assertEqual(0, db_query.executions)
+        self.assertEqual([[i for i in range(n, min(n + 10, 100))] for n in range(5, 100, 10)],
+                         [page.items for page in paginator])
+        self.assertEqual(1, db_query.executions)
+
+    def test_streamed_pagination(self):
+        db_query = MockDBQuery([i for i in range(100)])
+        paginator = paginate(db_query, 10, offset=5, stream=True)
+        self.assertEqual(95, paginator.total_items)
+        self.assertEqual(0, db_query.executions)
+        self.assertEqual([[i for i in range(n, min(n + 10, 100))] for n in range(5, 100, 10)],
+                         [page.items for page in paginator])
+        self.assertEqual(1, db_query.executions)
+        with self.assertRaises(TypeError):
+            paginator[1]
+
     def test_non_standard_starting_page_number(self):
         db_query = MockDBQuery([i for i in range(100)])
         paginator = paginate(db_query, 10, start_page=2)
@@ -0,0 +1,142 @@
+# -*- coding:utf-8 -*-
+
+import os.path
+import unittest
+from unittest import mock
+from datetime import datetime, timedelta
+
+import yaml
+
+from statik.predicates import *
+from statik.common import ContentLoadable
+from statik.markdown_config import MarkdownConfig
+from statik.models import StatikModel
+from statik.database import StatikDatabase
+from statik.errors import ModelError
+
+from tests.modular.test_database import MOCK_MODELS, MOCK_MODEL_NAMES
+
+
+TEST_DRAFT_POST = """---
+title: A draft post
+draft: true
+---
+This is **draft** content.
+"""
+
+TEST_PUBLISHED_POST = """---
+title: A published post
+draft: false
+---
+This is **published** content.
+"""
+
+GUEST_MODEL_WITH_FILTER = """first-name: String
+last-name: String
+email: String
+home_address: Address
+business_address: Address
+exclude-if: last-name == Anderson
+"""
+
+
+class TestStatikPredicates(unittest.TestCase):
+
+    def test_simple_predicates(self):
+        self.assertTrue(StatikPredicate("draft == true").matches({'draft': True}))
+        self.assertFalse(StatikPredicate("draft == true").matches({'draft': False}))
+        self.assertTrue(StatikPredicate("draft != true").matches({}))
+        self.assertTrue(StatikPredicate("priority >= 3").matches({'priority': 5}))
+        self.assertFalse(StatikPredicate("priority < 3").matches({}))
+        self.assertTrue(StatikPredicate("author == 'michael'").matches({'author': 'michael'}))
+
+    def test_compound_predicates(self):
+        predicate = StatikPredicate("draft == false and priority > 1")
+        self.assertTrue(predicate.matches({'draft': False, 'priority': 2}))
+        self.assertFalse(predicate.matches({'draft': False, 'priority': 1}))
+        self.assertFalse(predicate.matches({'draft': True, 'priority': 2}))
+
+    def test_date_predicates(self):
+        predicate = StatikPredicate("published > now")
+        self.assertTrue(predicate.matches({'published': datetime.now() + timedelta(days=1)}))
+        self.assertFalse(predicate.matches({'published': datetime.now() - timedelta(days=1)}))
+        self.assertTrue(predicate.matches({'published': '2999-01-01T10:00:00+02:00'}))
+        self.assertTrue(StatikPredicate("published < 2017-01-01").matches({
+            'published': datetime(2016, 6, 15, 16, 13)
+        }))
+
+    def test_invalid_predicates(self):
+        with self.assertRaises(ValueError):
+            StatikPredicate("draft")
+        with self.assertRaises(ValueError):
+            StatikPredicate("")
+
+    def test_load_filter(self):
+        load_filter = StatikLoadFilter(["draft == true", "published > now"])
+        self.assertTrue(load_filter.excludes({'draft': True}))
+        self.assertTrue(load_filter.excludes({'draft': False, 'published': datetime.now() + timedelta(days=1)}))
+        self.assertFalse(load_filter.excludes({'draft': False}))
+        self.assertFalse(StatikLoadFilter().excludes({'draft': True}))
+
+    def test_markdown_not_converted_for_excluded_content(self):
+        load_filter = StatikLoadFilter("draft == true")
+        draft = ContentLoadable(
+            from_string=TEST_DRAFT_POST,
+            file_type='markdown',
+            name='draft',
+            markdown_config=MarkdownConfig(),
+            load_filter=load_filter
+        )
+        self.assertTrue(draft.excluded)
+        self.assertIsNone(draft.content)
+
+        # the front matter must only be parsed once, for filtering and for conversion
+        with mock.patch('yaml.safe_load', wraps=yaml.safe_load) as safe_load:
+            published = ContentLoadable(
+                from_string=TEST_PUBLISHED_POST,
+                file_type='markdown',
+                name='published',
+                markdown_config=MarkdownConfig(),
+                load_filter=load_filter
+            )
+        self.assertEqual(1, safe_load.call_count)
+        self.assertFalse(published.excluded)
+        self.assertIn('<strong>published</strong>', published.content)
+        self.assertEqual(
+            ContentLoadable(
+                from_string=TEST_PUBLISHED_POST,
+                file_type='markdown',
+                name='published',
+                markdown_config=MarkdownConfig()
+            ).vars,
+            published.vars
+        )
+
+    def test_model_load_filter(self):
+        with self.assertRaises(ModelError):
+            StatikModel(
+                name='Guest',
+                from_string="name: String\nexclude-if: name ~ x\n",
+                model_names=['Guest']
+            )
+
+        models = dict(MOCK_MODELS)
+        models['Guest'] = StatikModel(
+            name='Guest',
+            from_string=GUEST_MODEL_WITH_FILTER,
+            model_names=MOCK_MODEL_NAMES
+        )
+        self.assertNotIn('exclude_if', models['Guest'].fields)
+
+        data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data_test_database')
+        db = StatikDatabase(data_path, models)
+        try:
+            Guest = db.tables['Guest']
+            guests = db.session.query(Guest).all()
+            self.assertEqual(['gmerriweather'], [guest.pk for guest in guests])
+        finally:
+            db.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+# -*- coding:utf-8 -*-
+
+import os.path
+import unittest
+
+from statik.database import StatikDatabase
+from statik.records import StatikRecord
+from statik.pagination import paginate, Page
+
+from tests.modular.test_database import MOCK_MODELS
+
+
+class TestStatikRecords(unittest.TestCase):
+
+    def setUp(self):
+        data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data_test_database')
+        self.db = StatikDatabase(data_path, MOCK_MODELS, records=True)
+
+    def tearDown(self):
+        self.db.shutdown()
+
+    def test_record_conversion(self):
+        GuesthouseRoom = self.db.tables['GuesthouseRoom']
+        room = self.db.session.query(GuesthouseRoom).filter(GuesthouseRoom.pk == 'redcottage-blueroom').one()
+        record = self.db.records.convert(room)
+
+        self.assertIsInstance(record, StatikRecord)
+        self.assertFalse(hasattr(record, '__dict__'))
+        self.assertEqual('Blue Room', record.room_name)
+        self.assertEqual('redcottage', record.guesthouse_id)
+        # relationships must be resolved to other records
+        self.assertIsInstance(record.guesthouse, StatikRecord)
+        self.assertEqual('Red Cottage', record.guesthouse.guesthouse_name)
+        self.assertEqual(['fireplace', 'double-bed', 'balcony', 'shower'], [tag.pk for tag in record.tags])
+        self.assertEqual(1, len(record.bookings))
+        self.assertIs(record, record.bookings[0].room)
+
+        # each instance must only be converted once
+        self.assertIs(record, self.db.records.convert(room))
+        self.assertIs(record.tags[0], self.db.records.convert(room.tags[0]))
+
+        with self.assertRaises(AttributeError):
+            record.room_name = 'Green Room'
+
+    def test_context_conversion(self):
+        Guest = self.db.tables['Guest']
+        guests = self.db.session.query(Guest).order_by(Guest.last_name).all()
+        ctx = self.db.records.convert_context({'guests': guests, 'title': 'Guests', 'empty': []})
+        self.assertEqual('Guests', ctx['title'])
+        self.assertEqual([], ctx['empty'])
+        self.assertEqual(['manderson', 'gmerriweather'], [guest.pk for guest in ctx['guests']])
+        self.assertTrue(all(isinstance(guest, StatikRecord) for guest in ctx['guests']))
+
+    def test_page_conversion(self):
+        Guest = self.db.tables['Guest']
+        page = list(paginate(self.db.session.query(Guest).order_by(Guest.pk), 1))[1]
+        converted = self.db.records.convert(page)
+        self.assertIsInstance(converted, Page)
+        self.assertEqual((2, 2), (converted.number, converted.total_pages))
+        self.assertEqual(['manderson'], [guest.pk for guest in converted])
+        self.assertIsInstance(converted.items[0], StatikRecord)
+        # the original page must be left as-is, for anything else that holds on to it
+        self.assertIsNot(page, converted)
+        self.assertIsInstance(page.items[0], Guest)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+# -*- coding:utf-8 -*-
+
+import os.path
+import unittest
+
+from statik.related import compute_related
+from statik.models import StatikModel
+from statik.database import StatikDatabase
+from statik.errors import InvalidFieldTypeError
+
+from tests.modular.test_database import MOCK_MODELS, MOCK_MODEL_NAMES
+
+GUESTHOUSE_ROOM_MODEL_WITH_RELATED = """guesthouse: Guesthouse -> rooms
+room_name: String
+tags: RoomTag[] -> rooms
+related:
+  via: [tags, guesthouse]
+  field: similar-rooms
+  limit: 3
+"""
+
+
+class TestStatikRelatedContent(unittest.TestCase):
+
+    def test_compute_related(self):
+        related = compute_related({
+            'a': {'python', 'sqlite', 'web'},
+            'b': {'python', 'sqlite'},
+            'c': {'python'},
+            'd': {'cooking'},
+            'e': {'python', 'web'},
+        }, 2)
+        self.assertEqual(['b', 'e'], [pk for pk, _ in related['a']])
+        self.assertAlmostEqual(2 / 6 ** 0.5, related['a'][0][1])
+        self.assertEqual(['a', 'c'], [pk for pk, _ in related['b']])
+        self.assertEqual([], related['d'])
+
+    def test_high_frequency_terms(self):
+        item_terms = dict([('item%05d' % i, {'common', 'group%d' % (i % 10)}) for i in range(20000)])
+        item_terms['rare1'] = {'common', 'rare'}
+        item_terms['rare2'] = {'common', 'rare'}
+        # terms shared by too many items must not be compared, or this would take minutes
+        related = compute_related(item_terms, 2, max_term_frequency=10)
+        self.assertEqual([], related['item00000'])
+        # although they still count towards the similarity scores
+        self.assertEqual([('rare2', 0.5)], related['rare1'])
+
+        item_terms = {'a': {'x', 'y'}, 'b': {'x', 'y'}, 'c': {'x'}}
+        with self.assertLogs('statik.related', level='INFO') as logs:
+            self.assertEqual([('b', 0.5)], compute_related(item_terms, 2, max_term_frequency=2)['a'])
+        self.assertIn('x', logs.output[0])
+        # no terms are pruned by default
+        related = compute_related(item_terms, 2)
+        self.assertEqual(['b', 'c'], [pk for pk, _ in related['a']])
+
+    def test_related_instances(self):
+        models = dict(MOCK_MODELS)
+        models['GuesthouseRoom'] = StatikModel(
+            name='GuesthouseRoom',
+            from_string=GUESTHOUSE_ROOM_MODEL_WITH_RELATED,
+            model_names=MOCK_MODEL_NAMES
+        )
+        self.assertEqual(['tags', 'guesthouse'], models['GuesthouseRoom'].related_via)
+        self.assertIsNone(models['GuesthouseRoom'].related_max_term_frequency)
+
+        data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data_test_database')
+        db = StatikDatabase(data_path, models)
+        try:
+            GuesthouseRoom = db.tables['GuesthouseRoom']
+            rooms = db.session.query(GuesthouseRoom).order_by(GuesthouseRoom.pk).all()
+            self.assertEqual(['redcottage-redroom'], [room.pk for room in rooms[0].similar_rooms])
+            self.assertEqual(['redcottage-blueroom'], [room.pk for room in rooms[1].similar_rooms])
+            # related instances must be usable in queries too
+            self.assertEqual(
+                ['redcottage-blueroom'],
+                [room.pk for room in db.query(
+                    "session.query(GuesthouseRoom).filter(GuesthouseRoom.similar_rooms.any(" +
+                    "GuesthouseRoom.pk == 'redcottage-redroom')).all()"
+                )]
+            )
+        finally:
+            db.shutdown()
+
+    def test_invalid_related_fields(self):
+        with self.assertRaises(InvalidFieldTypeError):
+            StatikModel(
+                name='GuesthouseRoom',
+                from_string="room_name: String\nrelated: room-name\n",
+                model_names=MOCK_MODEL_NAMES
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+# -*- coding:utf-8 -*-
+
+import os.path
+import unittest
+
+from statik.models import StatikModel
+from statik.database import StatikDatabase
+from statik.errors import ModelError, InvalidFieldTypeError
+from statik.utils import strip_html
+
+from tests.modular.test_database import MOCK_MODELS, MOCK_MODEL_NAMES
+
+SEARCHABLE_GUESTHOUSE_MODEL = """guesthouse-name: String
+address: Text
+search-index:
+  - guesthouse-name
+  - address
+"""
+
+
+class TestStatikFullTextSearch(unittest.TestCase):
+
+    def setUp(self):
+        models = dict(MOCK_MODELS)
+        models['Guesthouse'] = StatikModel(
+            name='Guesthouse',
+            from_string=SEARCHABLE_GUESTHOUSE_MODEL,
+            model_names=MOCK_MODEL_NAMES
+        )
+        data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data_test_database')
+        self.db = StatikDatabase(data_path, models)
+
+    def tearDown(self):
+        self.db.shutdown()
+
+    def test_search(self):
+        Guesthouse = self.db.tables['Guesthouse']
+        self.assertEqual(['redcottage'], [g.pk for g in self.db.search(Guesthouse, 'cottage')])
+        self.assertEqual(['firefly'], [g.pk for g in self.db.search(Guesthouse, 'rainbow')])
+        self.assertEqual([], self.db.search(Guesthouse, 'nowhere'))
+        # the Red Cottage mentions "red" twice, so it must be ranked first
+        self.assertEqual(
+            ['redcottage', 'firefly'],
+            [g.pk for g in self.db.search(Guesthouse, 'red OR somewhere')]
+        )
+        self.assertEqual(1, len(self.db.search(Guesthouse, 'red OR somewhere', limit=1)))
+
+    def test_search_from_queries(self):
+        self.assertEqual(
+            ['firefly'],
+            [g.pk for g in self.db.query("search(Guesthouse, 'over the rainbow')")]
+        )
+        self.assertEqual(
+            ['redcottage'],
+            [g.pk for g in self.db.query(
+                "session.query(Guesthouse).filter(match(Guesthouse, 'find')).all()"
+            )]
+        )
+
+    def test_unindexed_model(self):
+        with self.assertRaises(ModelError):
+            self.db.search(self.db.tables['Guest'], 'anderson')
+
+    def test_invalid_search_index_fields(self):
+        with self.assertRaises(InvalidFieldTypeError):
+            StatikModel(
+                name='Guesthouse',
+                from_string="guesthouse-name: String\nopened: DateTime\nsearch-index: [opened]\n",
+                model_names=MOCK_MODEL_NAMES
+            )
+
+    def test_strip_html(self):
+        self.assertEqual(
+            "Some bold & italic text",
+            strip_html("<p>Some <b>bold</b> &amp;\n<i>italic</i> text</p>")
+        )
+        self.assertEqual("", strip_html(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+# -*- coding:utf-8 -*-
+
+import os.path
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+from statik.database import StatikDatabase
+from statik.errors import ProjectConfigurationError
+from statik.search_index import StatikStaticSearchIndex, tokenize
+
+from tests.modular.test_database import MOCK_MODELS
+
+SEARCH_INDEX_CONFIG = {
+    'path': 'search',
+    'models': {
+        'Guesthouse': {
+            'view': 'guesthouse',
+            'fields': ['guesthouse-name', 'address'],
+            'store': ['guesthouse-name'],
+        },
+    },
+}
+
+
+class MockView(object):
+
+    def reverse_url(self, inst=None):
+        return '/guesthouses/%s/' % inst.pk
+
+
+class TestStatikStaticSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data_test_database')
+        self.db = StatikDatabase(data_path, MOCK_MODELS)
+        self.views = {'guesthouse': MockView()}
+
+    def tearDown(self):
+        self.db.shutdown()
+
+    def test_tokenize(self):
+        self.assertEqual(['the', 'red', 'cottage'], tokenize("<p>The <b>Red</b> Cottage!</p> a"))
+        self.assertEqual(['cottage'], tokenize("The Red Cottage", min_term_length=4))
+        self.assertEqual([], tokenize(None))
+        # non-text fields are indexed by their string representations
+        self.assertEqual(['2016'], tokenize(2016))
+        self.assertEqual(['2016', '08', '01'], tokenize(date(2016, 8, 1)))
+
+    def test_build(self):
+        index = StatikStaticSearchIndex(SEARCH_INDEX_CONFIG)
+        files = index.build(self.db, self.views, base_path='/blog/')
+        self.assertEqual({'index.json', 'documents.json', 'terms.json'}, set(files.keys()))
+
+        manifest = json.loads(files['index.json'])
+        self.assertEqual({'': 'terms.json'}, manifest['shards'])
+
+        documents = json.loads(files['documents.json'])
+        docs_by_url = dict([(doc['url'], (doc_id, doc)) for doc_id, doc in documents.items()])
+        self.assertEqual({'/blog/guesthouses/firefly/', '/blog/guesthouses/redcottage/'}, set(docs_by_url.keys()))
+        redcottage_id, redcottage = docs_by_url['/blog/guesthouses/redcottage/']
+        self.assertEqual('Red Cottage', redcottage['guesthouse_name'])
+        self.assertEqual('Guesthouse', redcottage['model'])
+
+        terms = json.loads(files['terms.json'])
+        # "red" appears in both the Red Cottage's name and address
+        self.assertEqual([[redcottage_id, 2]], terms['red'])
+        self.assertEqual(2, len(terms['some']) + len(terms['somewhere']))
+
+        # document IDs and output must be stable across builds
+        self.assertEqual(files, index.build(self.db, self.views, base_path='/blog/'))
+
+    def test_non_text_fields(self):
+        config = {
+            'models': {
+                'Booking': {'view': 'booking', 'fields': ['from-date'], 'store': ['from-date']},
+            },
+        }
+        files = StatikStaticSearchIndex(config).build(self.db, {'booking': MockView()})
+        terms = json.loads(files['terms.json'])
+        self.assertEqual(2, len(terms['2016']))
+
+    def test_sharding(self):
+        config = dict(SEARCH_INDEX_CONFIG)
+        config['shard-size'] = 64
+        index = StatikStaticSearchIndex(config)
+        files = index.build(self.db, self.views)
+        manifest = json.loads(files['index.json'])
+        self.assertGreater(len(manifest['shards']), 1)
+
+        all_terms = dict()
+        for prefix, filename in manifest['shards'].items():
+            shard = json.loads(files[filename])
+            for term in shard.keys():
+                self.assertTrue(term.startswith(prefix))
+                # each term must be in the shard of its longest matching prefix
+                self.assertEqual(
+                    prefix,
+                    max([p for p in manifest['shards'].keys() if term.startswith(p)], key=len)
+                )
+            all_terms.update(shard)
+
+        unsharded = StatikStaticSearchIndex(SEARCH_INDEX_CONFIG).build(self.db, self.views)
+        self.assertEqual(json.loads(unsharded['terms.json']), all_terms)
+
+    def test_write_if_changed(self):
+        output_path = tempfile.mkdtemp()
+        try:
+            config = dict(SEARCH_INDEX_CONFIG)
+            config['shard-size'] = 64
+            sharded = StatikStaticSearchIndex(config)
+            files = sharded.build(self.db, self.views)
+            self.assertEqual(len(files), sharded.write(files, output_path))
+            self.assertEqual(0, sharded.write(files, output_path))
+
+            # switching to a single shard must remove the stale shards...
+            with open(os.path.join(output_path, 'search', 'terms-of-use.json'), 'wt') as f:
+                f.write('{}')
+            unsharded = StatikStaticSearchIndex(SEARCH_INDEX_CONFIG)
+            files = unsharded.build(self.db, self.views)
+            unsharded.write(files, output_path)
+            # ...but other files whose names look like shards must be kept
+            self.assertEqual(
+                ['documents.json', 'index.json', 'terms-of-use.json', 'terms.json'],
+                sorted(os.listdir(os.path.join(output_path, 'search')))
+            )
+        finally:
+            shutil.rmtree(output_path)
+
+    def test_invalid_config(self):
+        with self.assertRaises(ProjectConfigurationError):
+            StatikStaticSearchIndex({'models': {}})
+        with self.assertRaises(ProjectConfigurationError):
+            StatikStaticSearchIndex({'models': {'Guesthouse': {'fields': ['address']}}})
+        with self.assertRaises(ProjectConfigurationError):
+            StatikStaticSearchIndex({'shard-size': 0, 'models': SEARCH_INDEX_CONFIG['models']})
+        with self.assertRaises(ProjectConfigurationError):
+            StatikStaticSearchIndex({'models': {'Nonexistent': {'view': 'guesthouse', 'fields': ['a']}}}) \
+                .build(self.db, self.views)
+
+
+if __name__ == "__main__":
+    unittest.main()
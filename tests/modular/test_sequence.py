@@ -0,0 +1,43 @@
+# -*- coding:utf-8 -*-
+
+import unittest
+from collections import namedtuple
+
+from statik.sequence import *
+
+Post = namedtuple('Post', ['pk', 'published', 'title'])
+
+
+class TestStatikSequence(unittest.TestCase):
+
+    def test_sequence_ordering(self):
+        self.assertEqual([('published', True), ('title', False)], parse_sequence_order("-published, title"))
+        self.assertEqual([('published_on', False)], parse_sequence_order(["published-on"]))
+        with self.assertRaises(ValueError):
+            parse_sequence_order("-")
+
+        posts = [
+            Post('a', 2, 'Zebra'),
+            Post('b', None, 'Draft'),
+            Post('c', 3, 'Latest'),
+            Post('d', 2, 'Aardvark'),
+        ]
+        sequence = build_sequence(posts, parse_sequence_order("-published, title"))
+        self.assertEqual(['c', 'd', 'a', 'b'], [post.pk for post, _ in sequence])
+
+        post, position = sequence[1]
+        self.assertEqual(2, position.position)
+        self.assertEqual(4, position.total)
+        self.assertEqual('c', position.previous.pk)
+        self.assertEqual('a', position.next.pk)
+        self.assertFalse(position.first)
+        self.assertFalse(position.last)
+        self.assertIsNone(sequence[0][1].previous)
+        self.assertIsNone(sequence[-1][1].next)
+        self.assertTrue(sequence[-1][1].last)
+
+        self.assertEqual([], build_sequence([], [('published', False)]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+# -*- coding:utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+from statik.outputs import StatikOutputIndex
+from statik.sitemap import StatikSitemap, SITEMAP_XMLNS
+from statik.errors import ProjectConfigurationError
+
+NS = {'sm': SITEMAP_XMLNS}
+
+
+class Post(object):
+
+    def __init__(self, pk, updated=None):
+        self.pk = pk
+        self.updated = updated
+
+
+class PostRecord(object):
+    model_name = 'Post'
+
+    def __init__(self, pk, updated=None):
+        self.pk = pk
+        self.updated = updated
+
+
+class TestStatikSitemap(unittest.TestCase):
+
+    def setUp(self):
+        self.index = StatikOutputIndex({'Post': 'updated'})
+        self.index.add('home', '/')
+        self.index.add('posts', '/posts/first/', Post('first', datetime(2017, 1, 2, 3, 4, 5)))
+        self.index.add('posts', '/posts/second/', Post('second'))
+        self.index.add('posts', '/posts/third/', Post('third', datetime(2018, 6, 7)))
+        self.index.add('feed', '/feed.xml')
+        self.index.add('drafts', '/drafts/')
+
+    def test_output_index(self):
+        self.assertEqual(6, len(self.index))
+        # the latest modification date/time wins for URLs rendered more than once
+        self.index.add('overlap', '/posts/first/', Post('first', datetime(2016, 1, 1)))
+        self.assertEqual(datetime(2017, 1, 2, 3, 4, 5), dict(self.index.urls())['/posts/first/'])
+        self.assertNotIn('/drafts/', dict(self.index.urls(exclude_views=['drafts'])))
+
+        # records' modification dates/times are looked up by their models' names
+        self.index.add('records', '/records/first/', PostRecord('first', datetime(2019, 1, 1)))
+        self.assertEqual(datetime(2019, 1, 1), dict(self.index.urls())['/records/first/'])
+
+    def test_single_sitemap(self):
+        sitemap = StatikSitemap({'site-url': 'https://example.com/', 'exclude-views': ['drafts']})
+        files = sitemap.build(self.index, base_path='/blog/')
+        self.assertEqual(['sitemap.xml'], list(files.keys()))
+
+        root = ET.fromstring(files['sitemap.xml'])
+        urls = root.findall('sm:url', NS)
+        self.assertEqual(
+            [
+                'https://example.com/blog/',
+                'https://example.com/blog/posts/first/',
+                'https://example.com/blog/posts/second/',
+                'https://example.com/blog/posts/third/',
+            ],
+            [url.find('sm:loc', NS).text for url in urls]
+        )
+        self.assertEqual('2017-01-02T03:04:05+00:00', urls[1].find('sm:lastmod', NS).text)
+        self.assertIsNone(urls[2].find('sm:lastmod', NS))
+
+    def test_sharded_sitemaps(self):
+        sitemap = StatikSitemap({'site-url': 'https://example.com', 'max-urls': 2})
+        files = sitemap.build(self.index)
+        self.assertEqual({'sitemap.xml', 'sitemap-1.xml', 'sitemap-2.xml', 'sitemap-3.xml'}, set(files.keys()))
+
+        root = ET.fromstring(files['sitemap.xml'])
+        self.assertEqual('{%s}sitemapindex' % SITEMAP_XMLNS, root.tag)
+        sitemaps = root.findall('sm:sitemap', NS)
+        self.assertEqual(
+            ['https://example.com/sitemap-%d.xml' % i for i in range(1, 4)],
+            [s.find('sm:loc', NS).text for s in sitemaps]
+        )
+        self.assertEqual('2018-06-07T00:00:00+00:00', sitemaps[1].find('sm:lastmod', NS).text)
+        self.assertEqual(1, len(ET.fromstring(files['sitemap-3.xml']).findall('sm:url', NS)))
+
+    def test_write(self):
+        output_path = tempfile.mkdtemp()
+        try:
+            sharded = StatikSitemap({'site-url': 'https://example.com', 'max-urls': 2})
+            self.assertEqual(4, sharded.write(self.index, output_path))
+            with open(os.path.join(output_path, 'sitemap-2.xml'), 'rt', encoding='utf-8') as f:
+                self.assertEqual(sharded.build(self.index)['sitemap-2.xml'], f.read())
+
+            # stale shards must be removed once they're no longer needed...
+            with open(os.path.join(output_path, 'sitemap-news.xml'), 'wt', encoding='utf-8') as f:
+                f.write('<rss/>')
+            StatikSitemap({'site-url': 'https://example.com'}).write(self.index, output_path)
+            # ...but other files whose names look like shards (e.g. views' output) must be kept
+            self.assertEqual(['sitemap-news.xml', 'sitemap.xml'], sorted(os.listdir(output_path)))
+        finally:
+            shutil.rmtree(output_path)
+
+    def test_invalid_config(self):
+        with self.assertRaises(ProjectConfigurationError):
+            StatikSitemap({})
+        with self.assertRaises(ProjectConfigurationError):
+            StatikSitemap({'site-url': 'example.com'})
+        with self.assertRaises(ProjectConfigurationError):
+            StatikSitemap({'site-url': 'https://example.com', 'max-urls': 50001})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+# -*- coding:utf-8 -*-
+
+import unittest
+
+from jinja2 import Environment
+
+from statik.templating import compile_template_formatter
+
+
+class MockPost(object):
+
+    def __init__(self, pk, author):
+        self.pk = pk
+        self.author = author
+
+
+SIMPLE_TEMPLATES = [
+    "/posts/{{ post.pk }}/",
+    "/{{ post.author['name'] }}/{{ post.pk }}.html",
+    "/archive/{{ year }}/{{ missing }}{{ 2 }}/",
+    "/static/",
+    "",
+]
+
+COMPLEX_TEMPLATES = [
+    "/posts/{{ post.pk|lower }}/",
+    "/{% if post %}{{ post.pk }}{% endif %}/",
+    "/posts/{{ post.pk + 1 }}/",
+    "{% url 'posts', post %}",
+]
+
+
+class TestTemplateFormatter(unittest.TestCase):
+
+    def setUp(self):
+        self.env = Environment(extensions=['statik.jinja2ext.StatikUrlExtension'])
+        self.context = {
+            'post': MockPost('hello-world', {'name': 'michael'}),
+            'year': 2018,
+        }
+
+    def test_simple_templates(self):
+        for template in SIMPLE_TEMPLATES:
+            formatter = compile_template_formatter(self.env, template)
+            self.assertIsNotNone(formatter, template)
+            # formatters must render exactly what Jinja2 renders
+            self.assertEqual(
+                self.env.from_string(template).render(**self.context),
+                formatter(self.context),
+                template
+            )
+
+    def test_complex_templates(self):
+        for template in COMPLEX_TEMPLATES:
+            self.assertIsNone(compile_template_formatter(self.env, template), template)
+
+        # autoescaping changes the output of simple templates too
+        self.assertIsNone(compile_template_formatter(Environment(autoescape=True), "/{{ post.pk }}/"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+# -*- coding:utf-8 -*-
+
+import os
+import os.path
+import shutil
+import tempfile
+import unittest
+
+from statik.templating import StatikTemplateIndex
+from statik.utils import find_first_file_with_ext
+
+TEMPLATE_EXTS = ['.html.jinja2', '.jinja2', '.html']
+
+
+class TestStatikTemplateIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_path = tempfile.mkdtemp()
+        self.project_path = os.path.join(self.temp_path, 'templates')
+        self.theme_path = os.path.join(self.temp_path, 'theme')
+        for filename in [
+                os.path.join(self.project_path, 'home.html'),
+                os.path.join(self.project_path, 'partials', 'header.jinja2'),
+                os.path.join(self.theme_path, 'home.html.jinja2'),
+                os.path.join(self.theme_path, 'post.html'),
+                os.path.join(self.theme_path, 'partials', 'footer.html')]:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            with open(filename, 'wt') as f:
+                f.write("")
+        self.template_paths = [self.project_path, self.theme_path]
+        self.index = StatikTemplateIndex(self.template_paths)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_path)
+
+    def test_find(self):
+        self.assertEqual(5, len(self.index))
+        # the project's templates take precedence over the theme's
+        self.assertEqual((self.project_path, '.html'), self.index.find('home', TEMPLATE_EXTS))
+        self.assertEqual((self.theme_path, '.html'), self.index.find('post', TEMPLATE_EXTS))
+        self.assertEqual((self.project_path, '.jinja2'), self.index.find('partials/header', TEMPLATE_EXTS))
+        self.assertEqual((self.theme_path, ''), self.index.find('partials/footer.html', ['']))
+        self.assertEqual((None, None), self.index.find('missing', TEMPLATE_EXTS))
+
+        # the index must give the same results as probing the filesystem
+        for name in ['home', 'post', 'partials/header', 'partials/footer', 'missing']:
+            self.assertEqual(
+                find_first_file_with_ext(self.template_paths, name, TEMPLATE_EXTS),
+                self.index.find(name, TEMPLATE_EXTS)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
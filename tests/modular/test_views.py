@@ -1,9 +1,428 @@
 # -*- coding: utf-8 -*-
 
+import os.path
+import gc
 import unittest
 
+from statik.views import *
+from statik.database import StatikDatabase
+from statik.outputs import StreamedOutput
+from statik.errors import InvalidViewFieldTypeError, ViewError
+
+from tests.modular.test_database import MOCK_MODELS
+from tests.modular.test_jinja2_views import MockStatikTemplateEngine
+
+TEST_TEMPLATES = {
+    'guest.html': "{{ guest.first_name }} {{ guest.last_name }}",
+    'tag-rooms.html': "{{ tag.tag }} ({{ tag.count }}):{% for room in tag %} {{ room.pk }}{% endfor %}",
+    'room-bookings.html': "{{ room.room_name }}:{% for booking in room.items %} {{ booking.guest_id }}{% endfor %}",
+    'booking-archive.html': "{{ bucket.period }} {{ bucket.date }}:{% for booking in bucket %} {{ booking.pk }}{% endfor %}",
+    'booking-sequence.html': "{{ sequence.position }}/{{ sequence.total }} " +
+        "prev={{ sequence.previous.pk if sequence.previous else '-' }} " +
+        "next={{ sequence.next.pk if sequence.next else '-' }} first={{ sequence.first }} last={{ sequence.last }}",
+    'tag-page.html': "{{ page.number }}/{{ page.total_pages }}:{% for tag in page %} {{ tag.pk }}{% endfor %}",
+    'room.html': "{{ room.room_name }} ({{ room.guesthouse.guesthouse_name }}, {{ room.bookings|length }})",
+}
+
+TEST_STREAMED_VIEW = """path:
+  template: /guests/{{ guest.pk }}/
+  for-each:
+    guest: session.query(Guest).order_by(Guest.pk)
+  yield-per: 1
+template: guest
+"""
+
+TEST_STREAMED_ROOMS_VIEW = """path:
+  template: /rooms/{{ room.pk }}/
+  for-each:
+    room: session.query(GuesthouseRoom).order_by(GuesthouseRoom.pk)
+  yield-per: 1
+template: room
+"""
+
+TEST_INVALID_STREAMED_VIEW = """path:
+  template: /guests/{{ guest.pk }}/
+  for-each:
+    guest: session.query(Guest).order_by(Guest.pk)
+  yield-per: lots
+template: guest
+"""
+
+TEST_PAGINATED_VIEW = """path:
+  template: /tags/{{ page }}/
+  for-each:
+    page: session.query(RoomTag).order_by(RoomTag.pk)
+  paginate: 2
+template: tag-page
+"""
+
+TEST_STREAMED_PAGINATED_VIEW = """path:
+  template: /tags/{{ page }}/
+  for-each:
+    page: session.query(RoomTag).order_by(RoomTag.pk)
+  paginate:
+    items-per-page: 2
+    offset: 1
+    start-page: 0
+  yield-per: 2
+template: tag-page
+"""
+
+TEST_TAXONOMY_VIEW = """path:
+  template: /tags/{{ tag }}/{% if tag.page.number > 1 %}{{ tag.page }}/{% endif %}
+  taxonomy:
+    tag:
+      field: GuesthouseRoom.tags
+      order-by: -room-name
+  paginate: 1
+template: tag-rooms
+"""
+
+TEST_FOREIGN_KEY_TAXONOMY_VIEW = """path:
+  template: /rooms/{{ room.pk }}/
+  taxonomy:
+    room: Booking.room
+template: room-bookings
+"""
+
+TEST_ARCHIVE_VIEW = """path:
+  template: /bookings/{{ bucket }}/
+  archive:
+    bucket:
+      query: session.query(Booking)
+      date-field: from-date
+      period: [year, month, day]
+      order: asc
+template: booking-archive
+"""
+
+TEST_SEQUENCE_VIEW = """path:
+  template: /bookings/{{ booking.pk }}/
+  for-each:
+    booking: session.query(Booking).order_by(Booking.pk)
+  sequence: -from-date
+template: booking-sequence
+"""
+
 
 class TestStatikViews(unittest.TestCase):
 
+    def setUp(self):
+        data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data_test_database')
+        self.db = StatikDatabase(data_path, MOCK_MODELS)
+        self.engine = MockStatikTemplateEngine(templates_dict=TEST_TEMPLATES)
+
+    def tearDown(self):
+        self.db.shutdown()
+
     def test_basic_simple_view(self):
         pass
+
+    def test_streamed_complex_view(self):
+        view = StatikView(
+            from_string=TEST_STREAMED_VIEW,
+            name='guests',
+            models=MOCK_MODELS,
+            template_engine=self.engine
+        )
+        self.assertEqual(1, view.path.yield_per)
+        rendered = view.render(self.db)
+        self.assertEqual('Gary Merriweather', rendered['guests']['gmerriweather']['index.html'])
+        self.assertEqual('Michael Anderson', rendered['guests']['manderson']['index.html'])
+
+    def test_streamed_records_view(self):
+        data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data_test_database')
+        db = StatikDatabase(data_path, MOCK_MODELS, records=True)
+        try:
+            view = StatikView(
+                from_string=TEST_STREAMED_ROOMS_VIEW,
+                name='rooms',
+                models=MOCK_MODELS,
+                template_engine=self.engine
+            )
+            rendered = view.render(db)
+            self.assertEqual(2, len(rendered['rooms']))
+            gc.collect()
+            # neither the rendered instances nor those related to them may be kept around
+            self.assertEqual(0, len(db.session.identity_map))
+            self.assertEqual(dict(), db.records.records)
+            self.assertEqual(dict(), db.records.graphs)
+        finally:
+            db.shutdown()
+
+    def test_streamed_query(self):
+        Guest = self.db.tables['Guest']
+        results = self.db.query("session.query(Guest).order_by(Guest.pk)", yield_per=1)
+        self.assertNotIsInstance(results, list)
+        guests = [guest for guest in results]
+        self.assertEqual(['gmerriweather', 'manderson'], [guest.pk for guest in guests])
+
+        # released instances must no longer be tracked by the session
+        self.assertIn(guests[0], self.db.session)
+        self.db.release(guests[0])
+        self.assertNotIn(guests[0], self.db.session)
+        self.assertIsInstance(self.db.query("session.query(Guest).all()", yield_per=1), list)
+
+    def test_paginated_complex_view(self):
+        view = StatikView(
+            from_string=TEST_PAGINATED_VIEW,
+            name='tags',
+            models=MOCK_MODELS,
+            template_engine=self.engine
+        )
+        self.assertEqual(2, view.path.items_per_page)
+        rendered = view.render(self.db)
+        self.assertEqual({
+            '1': {'index.html': '1/3: balcony double-bed'},
+            '2': {'index.html': '2/3: fireplace shower'},
+            '3': {'index.html': '3/3: single-bed'},
+        }, rendered['tags'])
+
+    def test_streamed_paginated_complex_view(self):
+        view = StatikView(
+            from_string=TEST_STREAMED_PAGINATED_VIEW,
+            name='tags',
+            models=MOCK_MODELS,
+            template_engine=self.engine
+        )
+        rendered = view.render(self.db)
+        self.assertEqual({
+            '0': {'index.html': '0/2: double-bed fireplace'},
+            '1': {'index.html': '1/2: shower single-bed'},
+        }, rendered['tags'])
+        self.assertEqual([], list(self.db.session))
+
+    def test_taxonomy_view(self):
+        view = StatikView(
+            from_string=TEST_TAXONOMY_VIEW,
+            name='tags',
+            models=MOCK_MODELS,
+            template_engine=self.engine
+        )
+        rendered = view.render(self.db)
+        self.assertEqual({
+            'balcony': {'index.html': 'Balcony (1): redcottage-blueroom'},
+            'double-bed': {'index.html': 'Double Bed (1): redcottage-blueroom'},
+            'fireplace': {
+                'index.html': 'Fireplace (2): redcottage-redroom',
+                '2': {'index.html': 'Fireplace (2): redcottage-blueroom'},
+            },
+            'shower': {
+                'index.html': 'Shower (2): redcottage-redroom',
+                '2': {'index.html': 'Shower (2): redcottage-blueroom'},
+            },
+            'single-bed': {'index.html': 'Single Bed (1): redcottage-redroom'},
+        }, rendered['tags'])
+
+        # taxonomies are built in memory, and therefore can't be streamed (releasing the terms
+        # would only expunge the terms themselves, and not the instances they group)
+        with self.assertRaises(InvalidViewFieldTypeError):
+            StatikView(
+                from_string=TEST_TAXONOMY_VIEW.replace("  paginate: 1\n", "  paginate: 1\n  yield-per: 1\n"),
+                name='tags',
+                models=MOCK_MODELS,
+                template_engine=self.engine
+            )
+
+    def test_foreign_key_taxonomy_view(self):
+        view = StatikView(
+            from_string=TEST_FOREIGN_KEY_TAXONOMY_VIEW,
+            name='rooms',
+            models=MOCK_MODELS,
+            template_engine=self.engine
+        )
+        rendered = view.render(self.db)
+        self.assertEqual({
+            'redcottage-blueroom': {'index.html': 'Blue Room: manderson'},
+            'redcottage-redroom': {'index.html': 'Red Room: gmerriweather'},
+        }, rendered['rooms'])
+
+    def test_invalid_taxonomy(self):
+        with self.assertRaises(InvalidViewFieldTypeError):
+            StatikView(
+                from_string=TEST_FOREIGN_KEY_TAXONOMY_VIEW.replace("Booking.room", "room"),
+                name='rooms',
+                models=MOCK_MODELS,
+                template_engine=self.engine
+            )
+        view = StatikView(
+            from_string=TEST_FOREIGN_KEY_TAXONOMY_VIEW.replace("Booking.room", "Booking.from-date"),
+            name='rooms',
+            models=MOCK_MODELS,
+            template_engine=self.engine
+        )
+        with self.assertRaises(ViewError):
+            view.render(self.db)
+
+    def test_archive_view(self):
+        view = StatikView(
+            from_string=TEST_ARCHIVE_VIEW,
+            name='bookings',
+            models=MOCK_MODELS,
+            template_engine=self.engine
+        )
+        rendered = view.render(self.db)
+        self.assertEqual({
+            '2016': {
+                'index.html': 'year 2016-01-01: 1 2',
+                '08': {
+                    'index.html': 'month 2016-08-01: 1 2',
+                    '01': {'index.html': 'day 2016-08-01: 1'},
+                    '02': {'index.html': 'day 2016-08-02: 2'},
+                },
+            },
+        }, rendered['bookings'])
+
+        with self.assertRaises(InvalidViewFieldTypeError):
+            StatikView(
+                from_string=TEST_ARCHIVE_VIEW.replace("[year, month, day]", "week"),
+                name='bookings',
+                models=MOCK_MODELS,
+                template_engine=self.engine
+            )
+        # archive buckets are built in memory, and therefore can't be streamed
+        with self.assertRaises(InvalidViewFieldTypeError):
+            StatikView(
+                from_string=TEST_ARCHIVE_VIEW.replace("      order: asc\n", "      order: asc\n  yield-per: 1\n"),
+                name='bookings',
+                models=MOCK_MODELS,
+                template_engine=self.engine
+            )
+
+    def test_archive_query(self):
+        buckets = self.db.query("archive(session.query(Booking), 'from-date', 'day')")
+        self.assertEqual(['2016/08/02', '2016/08/01'], [str(bucket) for bucket in buckets])
+        self.assertEqual([['2'], ['1']], [[booking.pk for booking in bucket] for bucket in buckets])
+
+    def test_sequence_view(self):
+        view = StatikView(
+            from_string=TEST_SEQUENCE_VIEW,
+            name='bookings',
+            models=MOCK_MODELS,
+            template_engine=self.engine
+        )
+        rendered = view.render(self.db)
+        self.assertEqual({
+            '1': {'index.html': '2/2 prev=2 next=- first=False last=True'},
+            '2': {'index.html': '1/2 prev=- next=1 first=True last=False'},
+        }, rendered['bookings'])
+
+        with self.assertRaises(InvalidViewFieldTypeError):
+            StatikView(
+                from_string=TEST_SEQUENCE_VIEW.replace("-from-date", "[]"),
+                name='bookings',
+                models=MOCK_MODELS,
+                template_engine=self.engine
+            )
+
+    def test_sequence_variable(self):
+        engine = MockStatikTemplateEngine(templates_dict={
+            'booking-sequence.html': "{{ nav.position }}/{{ nav.total }} {{ sequence }}",
+        })
+        view = StatikView(
+            from_string=TEST_SEQUENCE_VIEW.replace(
+                "sequence: -from-date",
+                "sequence:\n    order-by: -from-date\n    variable: nav"
+            ) + "context:\n  static:\n    sequence: Bookings\n",
+            name='bookings',
+            models=MOCK_MODELS,
+            template_engine=engine
+        )
+        self.assertEqual('nav', view.path.sequence_variable)
+        rendered = view.render(self.db)['bookings']
+        self.assertEqual('2/2 Bookings', rendered['1']['index.html'])
+
+        # the sequence variable must not silently override the view's own context variables
+        with self.assertRaises(InvalidViewFieldTypeError):
+            StatikView(
+                from_string=TEST_SEQUENCE_VIEW + "context:\n  static:\n    sequence: Bookings\n",
+                name='bookings',
+                models=MOCK_MODELS,
+                template_engine=engine
+            )
+
+    def test_url_table(self):
+        view = StatikView(
+            from_string=TEST_SEQUENCE_VIEW,
+            name='bookings',
+            models=MOCK_MODELS,
+            template_engine=self.engine
+        )
+        bookings = self.db.query("session.query(Booking).order_by(Booking.pk)")
+        self.assertEqual(['/bookings/1/', '/bookings/2/'], [view.reverse_url(booking) for booking in bookings])
+        self.assertEqual({'1': '/bookings/1/', '2': '/bookings/2/'}, view.url_table)
+
+        # subsequent lookups must come from the URL table, rather than rendering the path again
+        view.url_table['1'] = '/cached/'
+        self.assertEqual('/cached/', view.reverse_url(bookings[0]))
+
+        # individual pages of paginated items have no single URL per primary key
+        tags_view = StatikView(
+            from_string=TEST_PAGINATED_VIEW,
+            name='tags',
+            models=MOCK_MODELS,
+            template_engine=self.engine
+        )
+        pages = list(tags_view.path.instances(self.db))
+        self.assertEqual('/tags/2/', tags_view.reverse_url(pages[1]))
+        self.assertEqual({}, tags_view.url_table)
+
+        # ...unlike model instances that happen to have a "page" field
+        class MockBooking(object):
+            pk = '3'
+            page = 2
+
+        self.assertEqual('/bookings/3/', view.reverse_url(MockBooking()))
+        self.assertEqual('/bookings/3/', view.url_table['3'])
+
+    def test_streamed_output_view(self):
+        view = StatikView(
+            from_string=TEST_SEQUENCE_VIEW + "stream: true\n",
+            name='bookings',
+            models=MOCK_MODELS,
+            template_engine=self.engine
+        )
+        rendered = view.render(self.db)['bookings']
+        # pages must only be rendered once they're written
+        self.assertIsInstance(rendered['1']['index.html'], StreamedOutput)
+        self.assertEqual('2/2 prev=2 next=- first=False last=True', str(rendered['1']['index.html']))
+        self.assertEqual('1/2 prev=- next=1 first=True last=False', str(rendered['2']['index.html']))
+
+        for invalid_view in [TEST_SEQUENCE_VIEW + "stream: yes please\n", TEST_STREAMED_VIEW + "stream: true\n"]:
+            with self.assertRaises(InvalidViewFieldTypeError):
+                StatikView(
+                    from_string=invalid_view,
+                    name='bookings',
+                    models=MOCK_MODELS,
+                    template_engine=self.engine
+                )
+
+    def test_invalid_paginate(self):
+        for paginate_config in ["0", "true", "{items-per-page: true}"]:
+            with self.assertRaises(InvalidViewFieldTypeError):
+                StatikView(
+                    from_string=TEST_PAGINATED_VIEW.replace("paginate: 2", "paginate: %s" % paginate_config),
+                    name='tags',
+                    models=MOCK_MODELS,
+                    template_engine=self.engine
+                )
+
+    def test_invalid_yield_per(self):
+        with self.assertRaises(InvalidViewFieldTypeError):
+            StatikView(
+                from_string=TEST_INVALID_STREAMED_VIEW,
+                name='guests',
+                models=MOCK_MODELS,
+                template_engine=self.engine
+            )
+        with self.assertRaises(InvalidViewFieldTypeError):
+            StatikView(
+                from_string=TEST_INVALID_STREAMED_VIEW.replace("yield-per: lots", "yield-per: true"),
+                name='guests',
+                models=MOCK_MODELS,
+                template_engine=self.engine
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()